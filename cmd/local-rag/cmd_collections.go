@@ -1,6 +1,7 @@
 package main
 
 import (
+	"bufio"
 	"database/sql"
 	"encoding/json"
 	"fmt"
@@ -12,6 +13,7 @@ import (
 
 	"github.com/sebastianhutter/local-rag-go/internal/config"
 	"github.com/sebastianhutter/local-rag-go/internal/db"
+	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 )
 
 var collectionsCmd = &cobra.Command{
@@ -21,45 +23,48 @@ var collectionsCmd = &cobra.Command{
 
 // --- collections list ---
 
+// collectionsListSQL lists every collection with its source and chunk counts.
+const collectionsListSQL = `
+	SELECT c.name, c.collection_type, c.created_at,
+	       (SELECT COUNT(*) FROM sources s WHERE s.collection_id = c.id),
+	       (SELECT COUNT(*) FROM documents d WHERE d.collection_id = c.id)
+	FROM collections c ORDER BY c.name
+`
+
 var collectionsListCmd = &cobra.Command{
 	Use:   "list",
 	Short: "List all collections with stats",
 	RunE: func(cmd *cobra.Command, args []string) error {
-		cfg, err := config.Load("")
-		if err != nil {
-			return err
-		}
-		conn, err := db.Open(cfg.ExpandedDBPath())
+		_, conn, err := loadConfigAndOpenDB()
 		if err != nil {
 			return err
 		}
 		defer conn.Close()
 
-		rows, err := conn.Query(`
-			SELECT c.name, c.collection_type, c.created_at,
-			       (SELECT COUNT(*) FROM sources s WHERE s.collection_id = c.id),
-			       (SELECT COUNT(*) FROM documents d WHERE d.collection_id = c.id)
-			FROM collections c ORDER BY c.name
-		`)
+		rows, err := conn.Query(collectionsListSQL)
 		if err != nil {
 			return err
 		}
 		defer rows.Close()
 
-		fmt.Printf("%-25s %-10s %8s %8s  %-20s\n", "Name", "Type", "Sources", "Chunks", "Created")
-		fmt.Println("----------------------------------------------------------------------")
+		// The table is written through one buffer and flushed once.
+		out := bufio.NewWriter(os.Stdout)
+		defer out.Flush()
+
+		fmt.Fprintf(out, "%-25s %-10s %8s %8s  %-20s\n", "Name", "Type", "Sources", "Chunks", "Created")
+		fmt.Fprintln(out, "----------------------------------------------------------------------")
 
 		count := 0
 		for rows.Next() {
 			var name, collType, created string
 			var sources, chunks int
 			rows.Scan(&name, &collType, &created, &sources, &chunks)
-			fmt.Printf("%-25s %-10s %8d %8d  %-20s\n", name, collType, sources, chunks, created)
+			fmt.Fprintf(out, "%-25s %-10s %8d %8d  %-20s\n", name, collType, sources, chunks, created)
 			count++
 		}
 
 		if count == 0 {
-			fmt.Println("No collections found.")
+			fmt.Fprintln(out, "No collections found.")
 		}
 		return nil
 	},
@@ -73,43 +78,27 @@ var collectionsInfoCmd = &cobra.Command{
 	Args:  cobra.ExactArgs(1),
 	RunE: func(cmd *cobra.Command, args []string) error {
 		name := args[0]
-		cfg, err := config.Load("")
-		if err != nil {
-			return err
-		}
-		conn, err := db.Open(cfg.ExpandedDBPath())
+		cfg, conn, err := loadConfigAndOpenDB()
 		if err != nil {
 			return err
 		}
 		defer conn.Close()
 
-		var id int64
-		var collType string
-		var created string
-		var description sql.NullString
-		err = conn.QueryRow("SELECT id, collection_type, created_at, description FROM collections WHERE name = ?", name).
-			Scan(&id, &collType, &created, &description)
+		info, err := db.CollectionInfo(conn, name)
 		if err != nil {
-			return fmt.Errorf("collection %q not found", name)
+			return err
 		}
 
-		var sourceCount, docCount int
-		conn.QueryRow("SELECT COUNT(*) FROM sources WHERE collection_id = ?", id).Scan(&sourceCount)
-		conn.QueryRow("SELECT COUNT(*) FROM documents WHERE collection_id = ?", id).Scan(&docCount)
-
-		var lastIndexed sql.NullString
-		conn.QueryRow("SELECT MAX(last_indexed_at) FROM sources WHERE collection_id = ?", id).Scan(&lastIndexed)
-
 		fmt.Printf("Collection:   %s\n", name)
-		fmt.Printf("Type:         %s\n", collType)
-		fmt.Printf("Created:      %s\n", created)
-		if description.Valid && description.String != "" {
-			fmt.Printf("Description:  %s\n", description.String)
+		fmt.Printf("Type:         %s\n", info.Type)
+		fmt.Printf("Created:      %s\n", info.CreatedAt)
+		if info.Description.Valid && info.Description.String != "" {
+			fmt.Printf("Description:  %s\n", info.Description.String)
 		}
-		fmt.Printf("Sources:      %d\n", sourceCount)
-		fmt.Printf("Chunks:       %d\n", docCount)
-		if lastIndexed.Valid {
-			fmt.Printf("Last indexed: %s\n", lastIndexed.String)
+		fmt.Printf("Sources:      %d\n", info.SourceCount)
+		fmt.Printf("Chunks:       %d\n", info.ChunkCount)
+		if info.LastIndexed.Valid {
+			fmt.Printf("Last indexed: %s\n", info.LastIndexed.String)
 		}
 
 		// Show configured paths
@@ -122,7 +111,7 @@ var collectionsInfoCmd = &cobra.Command{
 		}
 
 		// Source type breakdown
-		typeRows, err := conn.Query("SELECT source_type, COUNT(*) FROM sources WHERE collection_id = ? GROUP BY source_type ORDER BY source_type", id)
+		typeRows, err := conn.Query("SELECT source_type, COUNT(*) FROM sources WHERE collection_id = ? GROUP BY source_type ORDER BY source_type", info.ID)
 		if err == nil {
 			defer typeRows.Close()
 			fmt.Println("\nSource types:")
@@ -135,7 +124,7 @@ var collectionsInfoCmd = &cobra.Command{
 		}
 
 		// Sample titles
-		sampleRows, err := conn.Query("SELECT DISTINCT title FROM documents WHERE collection_id = ? AND title IS NOT NULL LIMIT 5", id)
+		sampleRows, err := conn.Query("SELECT DISTINCT title FROM documents WHERE collection_id = ? AND title IS NOT NULL LIMIT 5", info.ID)
 		if err == nil {
 			defer sampleRows.Close()
 			fmt.Println("\nSample titles:")
@@ -160,25 +149,21 @@ var collectionsDeleteCmd = &cobra.Command{
 	Args:  cobra.ExactArgs(1),
 	RunE: func(cmd *cobra.Command, args []string) error {
 		name := args[0]
-		cfg, err := config.Load("")
-		if err != nil {
-			return err
-		}
-		conn, err := db.Open(cfg.ExpandedDBPath())
+		// The schema must be current: the delete also clears embedding_cache.
+		cfg, conn, err := openConfigAndDB()
 		if err != nil {
 			return err
 		}
 		defer conn.Close()
 
-		var id int64
-		err = conn.QueryRow("SELECT id FROM collections WHERE name = ?", name).Scan(&id)
-		if err != nil {
-			return fmt.Errorf("collection %q not found", name)
-		}
-
 		if !deleteYes {
 			var docCount int
-			conn.QueryRow("SELECT COUNT(*) FROM documents WHERE collection_id = ?", id).Scan(&docCount)
+			err = conn.QueryRow(`
+				SELECT (SELECT COUNT(*) FROM documents WHERE collection_id = c.id)
+				FROM collections c WHERE c.name = ?`, name).Scan(&docCount)
+			if err != nil {
+				return fmt.Errorf("collection %q not found", name)
+			}
 			fmt.Printf("Delete collection '%s' and all %d documents? [y/N] ", name, docCount)
 			var answer string
 			fmt.Scanln(&answer)
@@ -188,11 +173,9 @@ var collectionsDeleteCmd = &cobra.Command{
 			}
 		}
 
-		// Delete vector entries first (both float and binary-quantized mirror).
-		conn.Exec(`DELETE FROM vec_documents_bin WHERE document_id IN (SELECT id FROM documents WHERE collection_id = ?)`, id)
-		conn.Exec(`DELETE FROM vec_documents WHERE document_id IN (SELECT id FROM documents WHERE collection_id = ?)`, id)
-		// CASCADE handles sources and documents
-		conn.Exec("DELETE FROM collections WHERE id = ?", id)
+		if err := db.DeleteCollection(conn, name, embeddings.CacheKeyFunc(cfg.EmbeddingModel)); err != nil {
+			return err
+		}
 
 		fmt.Printf("Collection '%s' deleted.\n", name)
 		return nil
@@ -207,11 +190,7 @@ var collectionsExportCmd = &cobra.Command{
 	Args:  cobra.ExactArgs(1),
 	RunE: func(cmd *cobra.Command, args []string) error {
 		name := args[0]
-		cfg, err := config.Load("")
-		if err != nil {
-			return err
-		}
-		conn, err := db.Open(cfg.ExpandedDBPath())
+		_, conn, err := loadConfigAndOpenDB()
 		if err != nil {
 			return err
 		}
@@ -304,7 +283,7 @@ var pathsAddCmd = &cobra.Command{
 		// Resolve paths to absolute
 		resolved := make([]string, 0, len(newPaths))
 		for _, p := range newPaths {
-			p = expandHome(p)
+			p = config.ExpandPath(p)
 			abs, err := filepath.Abs(p)
 			if err != nil {
 				return fmt.Errorf("resolve path %q: %w", p, err)
@@ -353,7 +332,7 @@ var pathsRemoveCmd = &cobra.Command{
 		// Resolve paths for comparison
 		removeSet := make(map[string]bool, len(removePaths))
 		for _, p := range removePaths {
-			p = expandHome(p)
+			p = config.ExpandPath(p)
 			abs, err := filepath.Abs(p)
 			if err != nil {
 				removeSet[p] = true
@@ -406,12 +385,12 @@ to a new location without needing to re-index.`,
 		}
 
 		// Resolve prefixes to absolute paths
-		oldPrefix = expandHome(oldPrefix)
+		oldPrefix = config.ExpandPath(oldPrefix)
 		absOld, err := filepath.Abs(oldPrefix)
 		if err == nil {
 			oldPrefix = absOld
 		}
-		newPrefix = expandHome(newPrefix)
+		newPrefix = config.ExpandPath(newPrefix)
 		absNew, err := filepath.Abs(newPrefix)
 		if err == nil {
 			newPrefix = absNew
@@ -518,18 +497,6 @@ func mergeUnique(existing, additions []string) []string {
 	return merged
 }
 
-// expandHome replaces a leading ~ with the user's home directory.
-func expandHome(path string) string {
-	if path == "~" || strings.HasPrefix(path, "~/") {
-		home, err := os.UserHomeDir()
-		if err != nil {
-			return path
-		}
-		return filepath.Join(home, path[1:])
-	}
-	return path
-}
-
 func init() {
 	collectionsDeleteCmd.Flags().BoolVarP(&deleteYes, "yes", "y", false, "Skip confirmation")
 
@@ -1,12 +1,16 @@
 package main
 
 import (
+	"bufio"
 	"database/sql"
 	"fmt"
+	"io"
 	"log/slog"
 	"os"
 	"path/filepath"
 	"sort"
+	"sync"
+	"time"
 
 	"github.com/spf13/cobra"
 
@@ -18,6 +22,7 @@ import (
 
 var forceIndex bool
 var noPrune bool
+var indexJobs int
 
 // sortedKeys returns the keys of a collection map in deterministic (sorted)
 // order, so `index code`/`index all` process collections predictably rather
@@ -31,14 +36,22 @@ func sortedKeys(m map[string][]string) []string {
 	return keys
 }
 
+// preloadedConfig is the config read by indexCmd's PersistentPreRun. The
+// subcommand that runs next reuses it instead of loading the file again.
+var preloadedConfig *config.Config
+
 var indexCmd = &cobra.Command{
 	Use:   "index",
 	Short: "Index content from various sources",
-	// Resolve the embedding host once before any index subcommand runs, so a
+	// Register the embedding hosts before any index subcommand runs, so a
 	// configured remote Ollama (embedding_hosts) is preferred when reachable.
+	// Probing is deferred to the first embedding call: runs where every
+	// source is unchanged finish without touching the network.
 	PersistentPreRun: func(cmd *cobra.Command, args []string) {
+		handleInterrupt()
 		if cfg, err := config.Load(""); err == nil {
-			embeddings.ResolveHost(cfg.EmbeddingHosts, cfg.EmbeddingModel)
+			preloadedConfig = cfg
+			embeddings.DeferResolveHost(cfg.EmbeddingHosts, cfg.EmbeddingModel)
 			embeddings.SetBatchSize(cfg.EmbeddingBatchSize)
 		}
 	},
@@ -56,7 +69,7 @@ var indexObsidianCmd = &cobra.Command{
 		if err != nil {
 			return err
 		}
-		defer conn.Close()
+		defer closeIndexDB(conn)
 
 		if !cfg.IsCollectionEnabled("obsidian") {
 			return fmt.Errorf("collection 'obsidian' is disabled in config")
@@ -77,7 +90,7 @@ var indexObsidianCmd = &cobra.Command{
 
 		autoPrune(conn, cfg, "obsidian")
 		result := indexer.IndexObsidian(conn, cfg, forceIndex, progressCallback("obsidian"))
-		printResult("Obsidian", result)
+		printResult(os.Stdout, "Obsidian", result)
 		return nil
 	},
 }
@@ -92,14 +105,14 @@ var indexEmailCmd = &cobra.Command{
 		if err != nil {
 			return err
 		}
-		defer conn.Close()
+		defer closeIndexDB(conn)
 
 		if !cfg.IsCollectionEnabled("email") {
 			return fmt.Errorf("collection 'email' is disabled in config")
 		}
 
 		result := indexer.IndexEmails(conn, cfg, forceIndex, progressCallback("email"))
-		printResult("Email", result)
+		printResult(os.Stdout, "Email", result)
 		return nil
 	},
 }
@@ -116,7 +129,7 @@ var indexCalibreCmd = &cobra.Command{
 		if err != nil {
 			return err
 		}
-		defer conn.Close()
+		defer closeIndexDB(conn)
 
 		if !cfg.IsCollectionEnabled("calibre") {
 			return fmt.Errorf("collection 'calibre' is disabled in config")
@@ -135,7 +148,7 @@ var indexCalibreCmd = &cobra.Command{
 		defer func() { cfg.CalibreLibraries = origLibs }()
 
 		result := indexer.IndexCalibre(conn, cfg, forceIndex, progressCallback("calibre"))
-		printResult("Calibre", result)
+		printResult(os.Stdout, "Calibre", result)
 		return nil
 	},
 }
@@ -150,14 +163,14 @@ var indexRSSCmd = &cobra.Command{
 		if err != nil {
 			return err
 		}
-		defer conn.Close()
+		defer closeIndexDB(conn)
 
 		if !cfg.IsCollectionEnabled("rss") {
 			return fmt.Errorf("collection 'rss' is disabled in config")
 		}
 
 		result := indexer.IndexRSS(conn, cfg, forceIndex, progressCallback("rss"))
-		printResult("RSS", result)
+		printResult(os.Stdout, "RSS", result)
 		return nil
 	},
 }
@@ -172,7 +185,7 @@ var indexProjectCmd = &cobra.Command{
 		if err != nil {
 			return err
 		}
-		defer conn.Close()
+		defer closeIndexDB(conn)
 
 		if len(cfg.Projects) == 0 {
 			return fmt.Errorf("no projects configured in config")
@@ -199,7 +212,7 @@ var indexProjectCmd = &cobra.Command{
 			paths := cfg.Projects[name]
 			fmt.Printf("project: %s\n", name)
 			result := indexer.IndexProject(conn, cfg, name, paths, forceIndex, progressCallback(name))
-			printResult(name, result)
+			printResult(os.Stdout, name, result)
 		}
 		return nil
 	},
@@ -217,7 +230,7 @@ var indexCodeCmd = &cobra.Command{
 		if err != nil {
 			return err
 		}
-		defer conn.Close()
+		defer closeIndexDB(conn)
 
 		if len(cfg.Repositories) == 0 {
 			return fmt.Errorf("no repositories configured in config")
@@ -234,6 +247,7 @@ var indexCodeCmd = &cobra.Command{
 			repoNames = sortedKeys(cfg.Repositories)
 		}
 
+		out := bufio.NewWriter(os.Stdout)
 		for _, repoName := range repoNames {
 			if !cfg.IsCollectionEnabled(repoName) {
 				slog.Warn("collection is disabled, skipping", "name", repoName)
@@ -243,12 +257,19 @@ var indexCodeCmd = &cobra.Command{
 			autoPrune(conn, cfg, repoName)
 			repos := indexer.ResolveRepoPaths(cfg.Repositories[repoName])
 			for _, repoPath := range repos {
-				fmt.Printf("%s: %s\n", repoName, repoPath)
+				// One write per repo: the previous repo's summary goes out
+				// with this repo's header, before indexing starts, so the
+				// warnings and errors logged to stderr during the run follow
+				// the header of the repo they belong to.
+				fmt.Fprintf(out, "%s: %s\n", repoName, repoPath)
+				if err := out.Flush(); err != nil {
+					return err
+				}
 				result := indexer.IndexGitRepo(conn, cfg, repoPath, repoName, forceIndex, indexHistory, progressCallback(repoName))
-				printResult(fmt.Sprintf("%s/%s", repoName, filepath.Base(repoPath)), result)
+				printResult(out, fmt.Sprintf("%s/%s", repoName, filepath.Base(repoPath)), result)
 			}
 		}
-		return nil
+		return out.Flush()
 	},
 }
 
@@ -262,93 +283,97 @@ var indexAllCmd = &cobra.Command{
 		if err != nil {
 			return err
 		}
-		defer conn.Close()
+		defer closeIndexDB(conn)
+
+		// Resolve enablement once; both the prune and index passes below
+		// walk the same groups.
+		repoNames := cfg.EnabledKeys(cfg.Repositories)
+		projectNames := cfg.EnabledKeys(cfg.Projects)
 
 		// Auto-prune obsidian, code, and project collections before indexing
 		if !noPrune {
 			autoPrune(conn, cfg, "obsidian")
-			for _, repoName := range sortedKeys(cfg.Repositories) {
-				if cfg.IsCollectionEnabled(repoName) {
-					autoPrune(conn, cfg, repoName)
-				}
+			for _, repoName := range repoNames {
+				autoPrune(conn, cfg, repoName)
 			}
-			for _, projectName := range sortedKeys(cfg.Projects) {
-				if cfg.IsCollectionEnabled(projectName) {
-					autoPrune(conn, cfg, projectName)
-				}
+			for _, projectName := range projectNames {
+				autoPrune(conn, cfg, projectName)
 			}
 		}
 
-		type indexSource struct {
-			label string
-			run   func() *indexer.IndexResult
+		// Progress lines redraw in place, so they are only shown when
+		// sources run one at a time.
+		progress := func(label string) indexer.ProgressCallback {
+			if indexJobs > 1 {
+				return nil
+			}
+			return progressCallback(label)
 		}
 
-		var sources []indexSource
-
-		if cfg.IsCollectionEnabled("obsidian") && len(cfg.ObsidianVaults) > 0 {
-			sources = append(sources, indexSource{
-				label: "Obsidian",
-				run: func() *indexer.IndexResult {
-					return indexer.IndexObsidian(conn, cfg, forceIndex, progressCallback("obsidian"))
-				},
-			})
+		// indexSource is one unit of work. Code groups use expand instead
+		// of run: their repositories are discovered when the group's turn
+		// comes and then indexed one after another, since they share the
+		// group's watermark record.
+		type indexSource struct {
+			label  string
+			run    func() *indexer.IndexResult
+			expand func() []indexSource
 		}
 
-		if cfg.IsCollectionEnabled("email") {
-			sources = append(sources, indexSource{
-				label: "Email",
-				run: func() *indexer.IndexResult {
-					return indexer.IndexEmails(conn, cfg, forceIndex, progressCallback("email"))
-				},
-			})
+		systemSources := []struct {
+			name       string
+			label      string
+			configured bool
+			index      func(*sql.DB, *config.Config, bool, indexer.ProgressCallback) *indexer.IndexResult
+		}{
+			{"obsidian", "Obsidian", len(cfg.ObsidianVaults) > 0, indexer.IndexObsidian},
+			{"email", "Email", true, indexer.IndexEmails},
+			{"calibre", "Calibre", len(cfg.CalibreLibraries) > 0, indexer.IndexCalibre},
+			{"rss", "RSS", true, indexer.IndexRSS},
 		}
 
-		if cfg.IsCollectionEnabled("calibre") && len(cfg.CalibreLibraries) > 0 {
+		var sources []indexSource
+
+		for _, ss := range systemSources {
+			if !ss.configured || !cfg.IsCollectionEnabled(ss.name) {
+				continue
+			}
+			ss := ss
 			sources = append(sources, indexSource{
-				label: "Calibre",
+				label: ss.label,
 				run: func() *indexer.IndexResult {
-					return indexer.IndexCalibre(conn, cfg, forceIndex, progressCallback("calibre"))
+					return ss.index(conn, cfg, forceIndex, progress(ss.name))
 				},
 			})
 		}
 
-		if cfg.IsCollectionEnabled("rss") {
+		for _, repoName := range repoNames {
+			rn := repoName
 			sources = append(sources, indexSource{
-				label: "RSS",
-				run: func() *indexer.IndexResult {
-					return indexer.IndexRSS(conn, cfg, forceIndex, progressCallback("rss"))
+				label: rn,
+				expand: func() []indexSource {
+					var repoSources []indexSource
+					for _, repoPath := range indexer.ResolveRepoPaths(cfg.Repositories[rn]) {
+						rp := repoPath
+						repoSources = append(repoSources, indexSource{
+							label: fmt.Sprintf("%s/%s", rn, filepath.Base(rp)),
+							run: func() *indexer.IndexResult {
+								return indexer.IndexGitRepo(conn, cfg, rp, rn, forceIndex, true, progress(rn))
+							},
+						})
+					}
+					return repoSources
 				},
 			})
 		}
 
-		for _, repoName := range sortedKeys(cfg.Repositories) {
-			if !cfg.IsCollectionEnabled(repoName) {
-				continue
-			}
-			repos := indexer.ResolveRepoPaths(cfg.Repositories[repoName])
-			for _, repoPath := range repos {
-				rn, rp := repoName, repoPath
-				label := fmt.Sprintf("%s/%s", rn, filepath.Base(rp))
-				sources = append(sources, indexSource{
-					label: label,
-					run: func() *indexer.IndexResult {
-						return indexer.IndexGitRepo(conn, cfg, rp, rn, forceIndex, true, progressCallback(rn))
-					},
-				})
-			}
-		}
-
 		// Project collections from config
-		for _, projectName := range sortedKeys(cfg.Projects) {
-			if !cfg.IsCollectionEnabled(projectName) {
-				continue
-			}
+		for _, projectName := range projectNames {
 			pn, pp := projectName, cfg.Projects[projectName]
 			sources = append(sources, indexSource{
 				label: pn,
 				run: func() *indexer.IndexResult {
-					return indexer.IndexProject(conn, cfg, pn, pp, forceIndex, progressCallback(pn))
+					return indexer.IndexProject(conn, cfg, pn, pp, forceIndex, progress(pn))
 				},
 			})
 		}
@@ -361,14 +386,63 @@ var indexAllCmd = &cobra.Command{
 		fmt.Printf("%-30s %8s %8s %8s %8s\n", "Collection", "Indexed", "Skipped", "Errors", "Total")
 		fmt.Println("-----------------------------------------------------------------------")
 
-		for _, s := range sources {
+		// outMu keeps start and summary lines whole when sources run in parallel.
+		var outMu sync.Mutex
+		runSource := func(s indexSource) {
+			outMu.Lock()
 			fmt.Printf("%s...\n", s.label)
+			outMu.Unlock()
+
 			result := s.run()
 			errStr := fmt.Sprintf("%d", result.Errors)
 			if result.Errors > 0 {
 				errStr = fmt.Sprintf("*%d*", result.Errors)
 			}
+
+			outMu.Lock()
 			fmt.Printf("  %-28s %8d %8d %8s %8d\n", s.label, result.Indexed, result.Skipped, errStr, result.TotalFound)
+			outMu.Unlock()
+		}
+		runUnit := func(s indexSource) {
+			if s.expand == nil {
+				runSource(s)
+				return
+			}
+			repoSources := s.expand()
+			if len(repoSources) == 0 {
+				outMu.Lock()
+				fmt.Printf("  %-28s no git repositories found\n", s.label)
+				outMu.Unlock()
+			}
+			for _, rs := range repoSources {
+				runSource(rs)
+			}
+		}
+
+		// Sources are independent collections, so they may overlap; SQLite
+		// serializes the actual writes. Transactions take the write lock at
+		// BEGIN (txlock=immediate), so a worker waits on the busy timeout
+		// for another's commit rather than failing mid-transaction.
+		jobs := min(max(indexJobs, 1), len(sources))
+		work := make(chan indexSource)
+		var wg sync.WaitGroup
+		for i := 0; i < jobs; i++ {
+			wg.Add(1)
+			go func() {
+				defer wg.Done()
+				for s := range work {
+					runUnit(s)
+				}
+			}()
+		}
+		for _, s := range sources {
+			work <- s
+		}
+		close(work)
+		wg.Wait()
+
+		if !noPrune {
+			indexer.PruneEmbeddingCache(conn, cfg)
 		}
 
 		fmt.Println()
@@ -383,6 +457,7 @@ func init() {
 	indexObsidianCmd.Flags().StringArrayVarP(&obsidianVaults, "vault", "V", nil, "Vault path(s)")
 	indexCalibreCmd.Flags().StringArrayVarP(&calibreLibraries, "library", "l", nil, "Library path(s)")
 	indexCodeCmd.Flags().BoolVar(&indexHistory, "history", false, "Also index commit history")
+	indexAllCmd.Flags().IntVarP(&indexJobs, "jobs", "j", 1, "Number of sources to index concurrently")
 
 	indexCmd.AddCommand(indexObsidianCmd)
 	indexCmd.AddCommand(indexEmailCmd)
@@ -395,8 +470,21 @@ func init() {
 	rootCmd.AddCommand(indexCmd)
 }
 
-func openConfigAndDB() (*config.Config, *sql.DB, error) {
-	cfg, err := config.Load("")
+// loadConfig returns the config preloaded by a parent command's PreRun, or
+// loads it from disk when there is none (or preloading failed, in which case
+// the error surfaces here).
+func loadConfig() (*config.Config, error) {
+	if preloadedConfig != nil {
+		return preloadedConfig, nil
+	}
+	return config.Load("")
+}
+
+// loadConfigAndOpenDB loads the config and opens its database without
+// touching the schema. It suits commands that only read or delete existing
+// data; callers must close the returned connection.
+func loadConfigAndOpenDB() (*config.Config, *sql.DB, error) {
+	cfg, err := loadConfig()
 	if err != nil {
 		return nil, nil, fmt.Errorf("load config: %w", err)
 	}
@@ -406,6 +494,17 @@ func openConfigAndDB() (*config.Config, *sql.DB, error) {
 		return nil, nil, fmt.Errorf("open database: %w", err)
 	}
 
+	return cfg, conn, nil
+}
+
+// openConfigAndDB is loadConfigAndOpenDB plus schema initialization, for
+// commands that write indexed content.
+func openConfigAndDB() (*config.Config, *sql.DB, error) {
+	cfg, conn, err := loadConfigAndOpenDB()
+	if err != nil {
+		return nil, nil, err
+	}
+
 	if err := db.InitSchema(conn, cfg.EmbeddingDimensions); err != nil {
 		conn.Close()
 		return nil, nil, fmt.Errorf("init schema: %w", err)
@@ -414,8 +513,44 @@ func openConfigAndDB() (*config.Config, *sql.DB, error) {
 	return cfg, conn, nil
 }
 
+// closeIndexDB refreshes planner statistics after an indexing run and closes
+// the connection.
+func closeIndexDB(conn *sql.DB) {
+	if err := db.Optimize(conn); err != nil {
+		slog.Warn("optimize database", "err", err)
+	}
+	conn.Close()
+}
+
+// progressInterval and progressEvery bound how often the progress line is
+// redrawn; on large runs most items are fast skips and redrawing the
+// terminal line for each of them costs more than the skip itself.
+const (
+	progressInterval = 100 * time.Millisecond
+	progressEvery    = 64
+)
+
+// stderrIsTerminal reports whether stderr is attached to a terminal.
+var stderrIsTerminal = sync.OnceValue(func() bool {
+	info, err := os.Stderr.Stat()
+	return err == nil && info.Mode()&os.ModeCharDevice != 0
+})
+
+// progressCallback returns an in-place progress printer for label, or nil
+// when stderr is not a terminal: carriage-return redraws are just noise in
+// a log file or pipe, and indexers skip a nil callback entirely.
 func progressCallback(label string) indexer.ProgressCallback {
+	if !stderrIsTerminal() {
+		return nil
+	}
+	var lastDraw time.Time
+	lastCurrent := 0
 	return func(current, total int, itemName string) {
+		if current != total && current-lastCurrent < progressEvery && time.Since(lastDraw) < progressInterval {
+			return
+		}
+		lastDraw = time.Now()
+		lastCurrent = current
 		fmt.Fprintf(os.Stderr, "\r\033[K[%s] %d/%d: %s", label, current, total, truncateStr(itemName, 60))
 		if current == total {
 			fmt.Fprintln(os.Stderr)
@@ -423,13 +558,20 @@ func progressCallback(label string) indexer.ProgressCallback {
 	}
 }
 
-func printResult(label string, result *indexer.IndexResult) {
-	errStr := fmt.Sprintf("%d errors", result.Errors)
+// Summary line templates for printResult; the error variant flags failures.
+const (
+	resultTemplate      = "%s indexing complete: %d indexed, %d skipped, %d errors (out of %d found)\n"
+	resultErrorTemplate = "%s indexing complete: %d indexed, %d skipped, %d errors! (out of %d found)\n"
+)
+
+// printResult writes the summary line to w and the run's error messages to
+// stderr.
+func printResult(w io.Writer, label string, result *indexer.IndexResult) {
+	tmpl := resultTemplate
 	if result.Errors > 0 {
-		errStr = fmt.Sprintf("%d errors!", result.Errors)
+		tmpl = resultErrorTemplate
 	}
-	fmt.Printf("%s indexing complete: %d indexed, %d skipped, %s (out of %d found)\n",
-		label, result.Indexed, result.Skipped, errStr, result.TotalFound)
+	fmt.Fprintf(w, tmpl, label, result.Indexed, result.Skipped, result.Errors, result.TotalFound)
 	for _, msg := range result.ErrorMessages {
 		fmt.Fprintf(os.Stderr, "  error: %s\n", msg)
 	}
@@ -1,11 +1,13 @@
 package main
 
 import (
+	"bufio"
 	"context"
 	"encoding/json"
 	"fmt"
 	"os"
 	"strings"
+	"unicode/utf8"
 
 	"github.com/spf13/cobra"
 
@@ -81,38 +83,65 @@ var searchCmd = &cobra.Command{
 			MetadataFilters: metadataFilters,
 		}
 
-		results, err := search.Search(conn, queryEmbedding, query, searchTop, filters, cfg)
+		// Results are written through one buffer and flushed once, instead
+		// of a write syscall per printed line, and printed as they are
+		// fetched rather than collected first.
+		out := bufio.NewWriter(os.Stdout)
+		defer out.Flush()
+
+		count := 0
+		err = search.SearchEach(conn, queryEmbedding, query, searchTop, filters, cfg, func(r search.SearchResult) error {
+			count++
+			fmt.Fprintf(out, resultHeaderTemplate, count, r.Title, r.Collection, r.SourceType, r.Score, r.SourcePath)
+			if len(r.Metadata) > 0 {
+				out.WriteString("  Metadata:   ")
+				json.NewEncoder(out).Encode(r.Metadata)
+			}
+			fmt.Fprintf(out, "  Content:    %s\n", contentSnippet(r.Content, 300))
+			return nil
+		})
 		if err != nil {
 			return fmt.Errorf("search failed: %w", err)
 		}
 
-		if len(results) == 0 {
-			fmt.Println("No results found.")
+		if count == 0 {
+			fmt.Fprintln(out, "No results found.")
 			return nil
 		}
 
-		for i, r := range results {
-			fmt.Printf("\n--- %d. %s ---\n", i+1, r.Title)
-			fmt.Printf("  Collection: %s\n", r.Collection)
-			fmt.Printf("  Type:       %s\n", r.SourceType)
-			fmt.Printf("  Score:      %.4f\n", r.Score)
-			fmt.Printf("  Source:     %s\n", r.SourcePath)
-			if len(r.Metadata) > 0 {
-				metaJSON, _ := json.Marshal(r.Metadata)
-				fmt.Printf("  Metadata:   %s\n", string(metaJSON))
-			}
-			snippet := strings.ReplaceAll(r.Content, "\n", " ")
-			if len(snippet) > 300 {
-				snippet = snippet[:300] + "..."
-			}
-			fmt.Printf("  Content:    %s\n", snippet)
-		}
-
-		fmt.Printf("\n%d result(s) found.\n", len(results))
+		fmt.Fprintf(out, "\n%d result(s) found.\n", count)
 		return nil
 	},
 }
 
+// resultHeaderTemplate renders the fixed fields of one search result, so each
+// result costs a single format pass instead of one per line.
+const resultHeaderTemplate = "\n--- %d. %s ---\n" +
+	"  Collection: %s\n" +
+	"  Type:       %s\n" +
+	"  Score:      %.4f\n" +
+	"  Source:     %s\n"
+
+// contentSnippet returns content flattened onto one line and cut to at most
+// maxBytes (plus an ellipsis). It truncates before replacing newlines, so
+// only the visible prefix of a large chunk is copied, and never splits a
+// UTF-8 sequence.
+func contentSnippet(content string, maxBytes int) string {
+	truncated := len(content) > maxBytes
+	if truncated {
+		cut := maxBytes
+		for cut > 0 && !utf8.RuneStart(content[cut]) {
+			cut--
+		}
+		content = content[:cut]
+	}
+	snippet := strings.ReplaceAll(content, "\n", " ")
+	if truncated {
+		snippet += "..."
+	}
+	return snippet
+}
+
 func init() {
 	searchCmd.Flags().StringVarP(&searchCollection, "collection", "c", "", "Search within a specific collection")
 	searchCmd.Flags().StringVar(&searchType, "type", "", "Filter by source type")
@@ -11,6 +11,14 @@ import (
 	"github.com/sebastianhutter/local-rag-go/internal/db"
 )
 
+// statusSQL gathers every figure shown by the status command in one statement.
+const statusSQL = `
+	SELECT (SELECT COUNT(*) FROM collections),
+	       (SELECT COUNT(*) FROM sources),
+	       (SELECT COUNT(*) FROM documents),
+	       (SELECT MAX(last_indexed_at) FROM sources)
+`
+
 var statusCmd = &cobra.Command{
 	Use:   "status",
 	Short: "Show overall database stats",
@@ -34,12 +42,8 @@ var statusCmd = &cobra.Command{
 		defer conn.Close()
 
 		var collectionCount, sourceCount, docCount int
-		conn.QueryRow("SELECT COUNT(*) FROM collections").Scan(&collectionCount)
-		conn.QueryRow("SELECT COUNT(*) FROM sources").Scan(&sourceCount)
-		conn.QueryRow("SELECT COUNT(*) FROM documents").Scan(&docCount)
-
 		var lastIndexed sql.NullString
-		conn.QueryRow("SELECT MAX(last_indexed_at) FROM sources").Scan(&lastIndexed)
+		conn.QueryRow(statusSQL).Scan(&collectionCount, &sourceCount, &docCount, &lastIndexed)
 
 		sizeMB := float64(info.Size()) / (1024 * 1024)
 
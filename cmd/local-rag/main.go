@@ -4,6 +4,7 @@ import (
 	"fmt"
 	"log/slog"
 	"os"
+	"os/signal"
 
 	"github.com/spf13/cobra"
 
@@ -35,9 +36,30 @@ func init() {
 	rootCmd.PersistentFlags().BoolVarP(&verbose, "verbose", "v", false, "Enable debug logging")
 }
 
+// handleInterrupt exits with the conventional 130 status on Ctrl-C after
+// moving off any in-place progress line. Only the index commands install it
+// (from indexCmd's PersistentPreRun): gui and serve shut down through their
+// own paths, which an os.Exit from here would skip.
+func handleInterrupt() {
+	sigCh := make(chan os.Signal, 1)
+	signal.Notify(sigCh, os.Interrupt)
+	go func() {
+		<-sigCh
+		fmt.Fprintln(os.Stderr, "\nInterrupted. Shutting down...")
+		os.Exit(130)
+	}()
+}
+
 func main() {
+	// Answer --version before letting cobra build and validate the whole
+	// command tree.
+	if len(os.Args) == 2 && os.Args[1] == "--version" {
+		fmt.Printf("local-rag version %s\n", version)
+		return
+	}
 	if err := rootCmd.Execute(); err != nil {
 		fmt.Fprintf(os.Stderr, "Error: %v\n", err)
+		gui.FlushLogs()
 		os.Exit(1)
 	}
 }
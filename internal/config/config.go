@@ -2,12 +2,16 @@
 package config
 
 import (
+	"bytes"
 	"encoding/json"
 	"fmt"
 	"log/slog"
 	"os"
 	"path/filepath"
+	"sort"
 	"strings"
+	"sync"
+	"time"
 )
 
 var (
@@ -65,29 +69,78 @@ type Config struct {
 	OCR                       OCRConfig           `json:"ocr"`
 	GUI                       GUIConfig           `json:"gui"`
 
-	// disabledSet is a cached lookup set built from DisabledCollections.
+	// disabledSet is a lookup set built from DisabledCollections by Load.
+	// It is never written after Load returns, so a shared Config can be
+	// queried from several goroutines.
 	disabledSet map[string]struct{}
 }
 
 // IsCollectionEnabled returns true if the named collection is not disabled.
 func (c *Config) IsCollectionEnabled(name string) bool {
 	if c.disabledSet == nil {
-		c.disabledSet = make(map[string]struct{}, len(c.DisabledCollections))
+		// Config not produced by Load (e.g. built in a test): scan the
+		// list rather than lazily caching, which would race.
 		for _, n := range c.DisabledCollections {
-			c.disabledSet[n] = struct{}{}
+			if n == name {
+				return false
+			}
 		}
+		return true
 	}
 	_, disabled := c.disabledSet[name]
 	return !disabled
 }
 
+// EnabledKeys returns the keys of m (e.g. Repositories or Projects) that
+// are not disabled, in sorted order so callers process collections
+// deterministically.
+func (c *Config) EnabledKeys(m map[string][]string) []string {
+	keys := make([]string, 0, len(m))
+	for k := range m {
+		if c.IsCollectionEnabled(k) {
+			keys = append(keys, k)
+		}
+	}
+	sort.Strings(keys)
+	return keys
+}
+
+// buildDisabledSet precomputes the lookup set used by IsCollectionEnabled.
+func (c *Config) buildDisabledSet() {
+	c.disabledSet = make(map[string]struct{}, len(c.DisabledCollections))
+	for _, n := range c.DisabledCollections {
+		c.disabledSet[n] = struct{}{}
+	}
+}
+
 // ExpandedDBPath returns the db_path with ~ expanded.
 func (c *Config) ExpandedDBPath() string {
-	return expandPath(c.DBPath)
+	return ExpandPath(c.DBPath)
 }
 
+// loadCacheKey identifies one on-disk version of a config file.
+type loadCacheKey struct {
+	path    string
+	modTime time.Time
+	size    int64
+}
+
+// loadCache memoizes parsed configs so repeated Load calls in one process
+// (CLI pre-run hooks, MCP tool calls, GUI timers) only stat the file.
+var loadCache struct {
+	mu      sync.Mutex
+	entries map[loadCacheKey]*Config
+}
+
+// maxLoadCacheEntries bounds loadCache; in practice only one or two config
+// paths are ever loaded per process.
+const maxLoadCacheEntries = 4
+
 // Load reads configuration from the given path (or the default) and returns
 // a Config with defaults applied for any missing fields.
+//
+// Parsed configs are cached per (path, mtime, size). Every call returns a
+// fresh copy, so callers may mutate the result freely.
 func Load(path string) (*Config, error) {
 	if path == "" {
 		path = DefaultConfigPath
@@ -98,6 +151,52 @@ func Load(path string) (*Config, error) {
 		return nil, fmt.Errorf("create config dir: %w", err)
 	}
 
+	info, err := os.Stat(path)
+	if err != nil {
+		if os.IsNotExist(err) {
+			slog.Info("no config file found, using defaults", "path", path)
+			cfg := defaults()
+			cfg.buildDisabledSet()
+			return cfg, nil
+		}
+		return nil, fmt.Errorf("read config: %w", err)
+	}
+	key := loadCacheKey{path: path, modTime: info.ModTime(), size: info.Size()}
+
+	loadCache.mu.Lock()
+	cached, ok := loadCache.entries[key]
+	loadCache.mu.Unlock()
+	if ok {
+		slog.Debug("loaded config from cache", "path", path)
+		return cached.clone(), nil
+	}
+
+	cfg, err := parse(path)
+	if err != nil {
+		return nil, err
+	}
+	cfg.buildDisabledSet()
+
+	loadCache.mu.Lock()
+	if loadCache.entries == nil || len(loadCache.entries) >= maxLoadCacheEntries {
+		loadCache.entries = make(map[loadCacheKey]*Config, maxLoadCacheEntries)
+	}
+	loadCache.entries[key] = cfg.clone()
+	loadCache.mu.Unlock()
+
+	return cfg, nil
+}
+
+// resetLoadCache drops all memoized configs.
+func resetLoadCache() {
+	loadCache.mu.Lock()
+	loadCache.entries = nil
+	loadCache.mu.Unlock()
+}
+
+// parse reads and decodes the config file at path, applying defaults,
+// path expansion and backward-compat migrations.
+func parse(path string) (*Config, error) {
 	cfg := defaults()
 
 	data, err := os.ReadFile(path)
@@ -109,62 +208,39 @@ func Load(path string) (*Config, error) {
 		return nil, fmt.Errorf("read config: %w", err)
 	}
 
-	// Parse into a raw map so we can merge selectively.
-	var raw map[string]json.RawMessage
-	if err := json.Unmarshal(data, &raw); err != nil {
-		slog.Error("failed to parse config, using defaults", "path", path, "err", err)
-		return cfg, nil
-	}
-
-	// Re-unmarshal into the struct (fills present fields, leaves defaults for absent).
-	if err := json.Unmarshal(data, cfg); err != nil {
+	// Decode in a single pass: fills present fields, leaves defaults for
+	// absent ones, and records the legacy gui keys migrated below.
+	doc := configDoc{Config: cfg, GUI: guiDoc{cfg: &cfg.GUI}}
+	if err := json.Unmarshal(data, &doc); err != nil {
 		slog.Error("failed to decode config, using defaults", "path", path, "err", err)
 		return cfg, nil
 	}
 
 	// Expand all paths.
-	cfg.DBPath = expandPath(cfg.DBPath)
-	cfg.EmclientDBPath = expandPath(cfg.EmclientDBPath)
-	cfg.NetnewswireDBPath = expandPath(cfg.NetnewswireDBPath)
-	for i, v := range cfg.ObsidianVaults {
-		cfg.ObsidianVaults[i] = expandPath(v)
-	}
-	for i, v := range cfg.CalibreLibraries {
-		cfg.CalibreLibraries[i] = expandPath(v)
-	}
-	for name, paths := range cfg.Repositories {
-		expanded := make([]string, len(paths))
-		for i, p := range paths {
-			expanded[i] = expandPath(p)
-		}
-		cfg.Repositories[name] = expanded
+	cfg.DBPath = ExpandPath(cfg.DBPath)
+	cfg.EmclientDBPath = ExpandPath(cfg.EmclientDBPath)
+	cfg.NetnewswireDBPath = ExpandPath(cfg.NetnewswireDBPath)
+	expandPaths(cfg.ObsidianVaults)
+	expandPaths(cfg.CalibreLibraries)
+	for _, paths := range cfg.Repositories {
+		expandPaths(paths)
 	}
-	for name, paths := range cfg.Projects {
-		expanded := make([]string, len(paths))
-		for i, p := range paths {
-			expanded[i] = expandPath(p)
-		}
-		cfg.Projects[name] = expanded
+	for _, paths := range cfg.Projects {
+		expandPaths(paths)
 	}
 
 	// Handle backward compat for auto_reindex.
-	if _, ok := raw["gui"]; ok {
-		var guiRaw map[string]json.RawMessage
-		if err := json.Unmarshal(raw["gui"], &guiRaw); err == nil {
-			// Migrate old hours field to minutes.
-			if hoursRaw, hasHours := guiRaw["auto_reindex_interval_hours"]; hasHours {
-				var hours int
-				if json.Unmarshal(hoursRaw, &hours) == nil && hours > 0 {
-					cfg.GUI.AutoReindexIntervalMinutes = hours * 60
-				}
-			}
-			if _, hasAutoReindex := guiRaw["auto_reindex"]; !hasAutoReindex {
-				// auto_reindex absent: derive from interval
-				if cfg.GUI.AutoReindexIntervalMinutes != 60 && cfg.GUI.AutoReindexIntervalMinutes > 0 {
-					cfg.GUI.AutoReindex = true
-				} else {
-					cfg.GUI.AutoReindex = false
-				}
+	if doc.GUI.present {
+		// Migrate old hours field to minutes.
+		if doc.GUI.intervalHours > 0 {
+			cfg.GUI.AutoReindexIntervalMinutes = doc.GUI.intervalHours * 60
+		}
+		if !doc.GUI.hasAutoReindex {
+			// auto_reindex absent: derive from interval
+			if cfg.GUI.AutoReindexIntervalMinutes != 60 && cfg.GUI.AutoReindexIntervalMinutes > 0 {
+				cfg.GUI.AutoReindex = true
+			} else {
+				cfg.GUI.AutoReindex = false
 			}
 		}
 	}
@@ -173,8 +249,47 @@ func Load(path string) (*Config, error) {
 	return cfg, nil
 }
 
+// configDoc is the decode target for config.json. Its GUI field shadows
+// Config.GUI so the legacy gui keys are seen in the same pass.
+type configDoc struct {
+	*Config
+	GUI guiDoc `json:"gui"`
+}
+
+// guiDoc decodes the "gui" object into cfg and notes which legacy keys were
+// present, for the backward-compat migration in parse.
+type guiDoc struct {
+	cfg            *GUIConfig
+	present        bool
+	hasAutoReindex bool
+	intervalHours  int
+}
+
+func (g *guiDoc) UnmarshalJSON(data []byte) error {
+	var legacy struct {
+		*GUIConfig
+		AutoReindex              *bool           `json:"auto_reindex"`
+		AutoReindexIntervalHours json.RawMessage `json:"auto_reindex_interval_hours"`
+	}
+	legacy.GUIConfig = g.cfg
+	if err := json.Unmarshal(data, &legacy); err != nil {
+		return err
+	}
+	g.present = true
+	if legacy.AutoReindex != nil {
+		g.cfg.AutoReindex = *legacy.AutoReindex
+		g.hasAutoReindex = true
+	}
+	if legacy.AutoReindexIntervalHours != nil {
+		// A malformed legacy value is ignored rather than failing the load.
+		_ = json.Unmarshal(legacy.AutoReindexIntervalHours, &g.intervalHours)
+	}
+	return nil
+}
+
 // Save writes the current configuration to the given path (or the default),
-// preserving any unknown keys from the existing file.
+// preserving any unknown keys from the existing file. The file is replaced
+// atomically, and left untouched if its contents would not change.
 func Save(cfg *Config, path string) error {
 	if path == "" {
 		path = DefaultConfigPath
@@ -182,8 +297,9 @@ func Save(cfg *Config, path string) error {
 
 	// Read existing data to preserve unknown keys.
 	existing := make(map[string]any)
-	if data, err := os.ReadFile(path); err == nil {
-		_ = json.Unmarshal(data, &existing)
+	current, err := os.ReadFile(path)
+	if err == nil {
+		_ = json.Unmarshal(current, &existing)
 	}
 
 	// Overlay current config values.
@@ -218,14 +334,104 @@ func Save(cfg *Config, path string) error {
 	}
 	out = append(out, '\n')
 
-	if err := os.WriteFile(path, out, 0o644); err != nil {
+	if bytes.Equal(out, current) {
+		slog.Debug("config unchanged, not saving", "path", path)
+		return nil
+	}
+
+	if err := writeFileAtomic(path, out, 0o644); err != nil {
 		return fmt.Errorf("write config: %w", err)
 	}
+	// A rewrite within the filesystem's mtime granularity could keep the
+	// same (mtime, size) key, so never trust cached entries after a save.
+	resetLoadCache()
 
 	slog.Info("saved config", "path", path)
 	return nil
 }
 
+// writeFileAtomic writes data to a temporary file next to path, syncs it and
+// renames it into place, so readers (and a crash mid-write) never see a
+// truncated config. A symlinked path is resolved first, so the link's target
+// is replaced rather than the link itself, and an existing file keeps its
+// permissions; perm applies only when the file is new.
+func writeFileAtomic(path string, data []byte, perm os.FileMode) error {
+	if resolved, err := filepath.EvalSymlinks(path); err == nil {
+		path = resolved
+	} else if !os.IsNotExist(err) {
+		return err
+	}
+	if info, err := os.Stat(path); err == nil {
+		perm = info.Mode().Perm()
+	}
+
+	f, err := os.CreateTemp(filepath.Dir(path), "."+filepath.Base(path)+".tmp*")
+	if err != nil {
+		return err
+	}
+	tmp := f.Name()
+	if _, err := f.Write(data); err != nil {
+		f.Close()
+		os.Remove(tmp)
+		return err
+	}
+	if err := f.Sync(); err != nil {
+		f.Close()
+		os.Remove(tmp)
+		return err
+	}
+	if err := f.Close(); err != nil {
+		os.Remove(tmp)
+		return err
+	}
+	if err := os.Chmod(tmp, perm); err != nil {
+		os.Remove(tmp)
+		return err
+	}
+	if err := os.Rename(tmp, path); err != nil {
+		os.Remove(tmp)
+		return err
+	}
+	return nil
+}
+
+// clone returns a deep copy of c so cached configs are never shared with
+// callers that mutate slices or maps.
+func (c *Config) clone() *Config {
+	out := *c
+	out.EmbeddingHosts = cloneStrings(c.EmbeddingHosts)
+	out.ObsidianVaults = cloneStrings(c.ObsidianVaults)
+	out.ObsidianExcludeFolders = cloneStrings(c.ObsidianExcludeFolders)
+	out.CalibreLibraries = cloneStrings(c.CalibreLibraries)
+	out.Repositories = cloneStringMap(c.Repositories)
+	out.Projects = cloneStringMap(c.Projects)
+	out.DisabledCollections = cloneStrings(c.DisabledCollections)
+	out.GitCommitSubjectBlacklist = cloneStrings(c.GitCommitSubjectBlacklist)
+	out.OCR.Languages = cloneStrings(c.OCR.Languages)
+	if c.disabledSet != nil {
+		out.buildDisabledSet()
+	}
+	return &out
+}
+
+func cloneStrings(s []string) []string {
+	if s == nil {
+		return nil
+	}
+	return append([]string{}, s...)
+}
+
+func cloneStringMap(m map[string][]string) map[string][]string {
+	if m == nil {
+		return nil
+	}
+	out := make(map[string][]string, len(m))
+	for k, v := range m {
+		out[k] = cloneStrings(v)
+	}
+	return out
+}
+
 // defaults returns a Config with all default values applied.
 func defaults() *Config {
 	home := homeDir()
@@ -271,15 +477,19 @@ func defaults() *Config {
 	}
 }
 
-func homeDir() string {
+// homeDir returns the user's home directory, falling back to /tmp. It is
+// resolved once per process: every default path and every "~" expansion in
+// Load and Save goes through it.
+var homeDir = sync.OnceValue(func() string {
 	home, err := os.UserHomeDir()
 	if err != nil {
 		return "/tmp"
 	}
 	return home
-}
+})
 
-func expandPath(p string) string {
+// ExpandPath replaces a leading "~" with the user's home directory.
+func ExpandPath(p string) string {
 	if strings.HasPrefix(p, "~/") {
 		return filepath.Join(homeDir(), p[2:])
 	}
@@ -289,9 +499,20 @@ func expandPath(p string) string {
 	return p
 }
 
+// expandPaths applies ExpandPath to each element of paths in place. The
+// slices it is used on are freshly decoded and owned by the Config.
+func expandPaths(paths []string) {
+	for i, p := range paths {
+		paths[i] = ExpandPath(p)
+	}
+}
+
 // UnexpandPath converts an absolute path back to ~/… form if under the home directory.
 func UnexpandPath(p string) string {
 	home := homeDir()
+	if !strings.HasPrefix(p, home) {
+		return p
+	}
 	rel, err := filepath.Rel(home, p)
 	if err != nil || strings.HasPrefix(rel, "..") {
 		return p
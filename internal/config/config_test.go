@@ -5,6 +5,7 @@ import (
 	"os"
 	"path/filepath"
 	"testing"
+	"time"
 )
 
 func TestDefaults(t *testing.T) {
@@ -141,9 +142,9 @@ func TestExpandPath(t *testing.T) {
 		{"relative/path", "relative/path"},
 	}
 	for _, tt := range tests {
-		got := expandPath(tt.input)
+		got := ExpandPath(tt.input)
 		if got != tt.want {
-			t.Errorf("expandPath(%q) = %q, want %q", tt.input, got, tt.want)
+			t.Errorf("ExpandPath(%q) = %q, want %q", tt.input, got, tt.want)
 		}
 	}
 }
@@ -162,3 +163,182 @@ func TestIsCollectionEnabled(t *testing.T) {
 		t.Error("email should be disabled")
 	}
 }
+
+func TestLoadCacheReturnsIndependentCopies(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "config.json")
+
+	data := []byte(`{"embedding_model": "cached-model", "repositories": {"grp": ["/tmp/a"]}}`)
+	if err := os.WriteFile(path, data, 0o644); err != nil {
+		t.Fatal(err)
+	}
+
+	first, err := Load(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+	first.EmbeddingModel = "mutated"
+	first.Repositories["grp"][0] = "/tmp/mutated"
+
+	second, err := Load(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if second.EmbeddingModel != "cached-model" {
+		t.Errorf("EmbeddingModel = %q, want cached-model", second.EmbeddingModel)
+	}
+	if got := second.Repositories["grp"][0]; got != "/tmp/a" {
+		t.Errorf("Repositories[grp][0] = %q, want /tmp/a", got)
+	}
+
+	// A changed file must invalidate the cached entry.
+	data = []byte(`{"embedding_model": "changed-model-name"}`)
+	if err := os.WriteFile(path, data, 0o644); err != nil {
+		t.Fatal(err)
+	}
+	third, err := Load(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if third.EmbeddingModel != "changed-model-name" {
+		t.Errorf("EmbeddingModel = %q, want changed-model-name", third.EmbeddingModel)
+	}
+}
+
+func TestEnabledKeys(t *testing.T) {
+	cfg := defaults()
+	cfg.DisabledCollections = []string{"beta"}
+	groups := map[string][]string{"gamma": nil, "beta": nil, "alpha": nil}
+
+	got := cfg.EnabledKeys(groups)
+	if len(got) != 2 || got[0] != "alpha" || got[1] != "gamma" {
+		t.Errorf("EnabledKeys = %v, want [alpha gamma]", got)
+	}
+}
+
+func TestLoadMigratesLegacyGUIKeys(t *testing.T) {
+	tests := []struct {
+		name         string
+		json         string
+		wantReindex  bool
+		wantInterval int
+		wantMCPPort  int
+	}{
+		{"no gui section", `{}`, false, 60, 31123},
+		{"hours migrated and reindex derived", `{"gui": {"auto_reindex_interval_hours": 2}}`, true, 120, 31123},
+		{"explicit auto_reindex wins", `{"gui": {"auto_reindex": false, "auto_reindex_interval_minutes": 30}}`, false, 30, 31123},
+		{"other gui fields decoded", `{"gui": {"auto_reindex": true, "mcp_port": 9000}}`, true, 60, 9000},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			path := filepath.Join(t.TempDir(), "config.json")
+			if err := os.WriteFile(path, []byte(tt.json), 0o644); err != nil {
+				t.Fatal(err)
+			}
+			cfg, err := Load(path)
+			if err != nil {
+				t.Fatal(err)
+			}
+			if cfg.GUI.AutoReindex != tt.wantReindex {
+				t.Errorf("AutoReindex = %v, want %v", cfg.GUI.AutoReindex, tt.wantReindex)
+			}
+			if cfg.GUI.AutoReindexIntervalMinutes != tt.wantInterval {
+				t.Errorf("AutoReindexIntervalMinutes = %d, want %d", cfg.GUI.AutoReindexIntervalMinutes, tt.wantInterval)
+			}
+			if cfg.GUI.MCPPort != tt.wantMCPPort {
+				t.Errorf("MCPPort = %d, want %d", cfg.GUI.MCPPort, tt.wantMCPPort)
+			}
+		})
+	}
+}
+
+func TestSaveSkipsUnchangedConfig(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "config.json")
+
+	cfg := defaults()
+	if err := Save(cfg, path); err != nil {
+		t.Fatal(err)
+	}
+
+	// Backdate the file so a rewrite would be visible in its mtime.
+	old := time.Now().Add(-time.Hour).Truncate(time.Second)
+	if err := os.Chtimes(path, old, old); err != nil {
+		t.Fatal(err)
+	}
+
+	if err := Save(cfg, path); err != nil {
+		t.Fatal(err)
+	}
+	info, err := os.Stat(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if !info.ModTime().Equal(old) {
+		t.Error("unchanged config was rewritten")
+	}
+
+	cfg.EmbeddingModel = "new-model"
+	if err := Save(cfg, path); err != nil {
+		t.Fatal(err)
+	}
+	loaded, err := Load(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if loaded.EmbeddingModel != "new-model" {
+		t.Errorf("EmbeddingModel = %q, want new-model", loaded.EmbeddingModel)
+	}
+
+	// The atomic write must not leave temporary files behind.
+	entries, err := os.ReadDir(dir)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(entries) != 1 {
+		t.Errorf("expected only config.json in %s, found %d entries", dir, len(entries))
+	}
+}
+
+func TestSaveKeepsSymlinkAndMode(t *testing.T) {
+	dir := t.TempDir()
+	target := filepath.Join(dir, "dotfiles", "config.json")
+	if err := os.MkdirAll(filepath.Dir(target), 0o755); err != nil {
+		t.Fatal(err)
+	}
+	if err := os.WriteFile(target, []byte("{}\n"), 0o600); err != nil {
+		t.Fatal(err)
+	}
+	link := filepath.Join(dir, "config.json")
+	if err := os.Symlink(target, link); err != nil {
+		t.Fatal(err)
+	}
+
+	cfg := defaults()
+	cfg.EmbeddingModel = "new-model"
+	if err := Save(cfg, link); err != nil {
+		t.Fatal(err)
+	}
+
+	linfo, err := os.Lstat(link)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if linfo.Mode()&os.ModeSymlink == 0 {
+		t.Error("config symlink was replaced by a regular file")
+	}
+	info, err := os.Stat(target)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if info.Mode().Perm() != 0o600 {
+		t.Errorf("mode = %v, want 0600", info.Mode().Perm())
+	}
+	loaded, err := Load(link)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if loaded.EmbeddingModel != "new-model" {
+		t.Errorf("EmbeddingModel = %q, want new-model", loaded.EmbeddingModel)
+	}
+}
@@ -9,21 +9,67 @@ import (
 	"path/filepath"
 
 	sqlite_vec "github.com/asg017/sqlite-vec-go-bindings/cgo"
-	_ "github.com/mattn/go-sqlite3"
+	"github.com/mattn/go-sqlite3"
 )
 
+// driverName is the database/sql driver used for the local-rag database. It
+// is go-sqlite3 with a connect hook for pragmas the DSN cannot express.
+const driverName = "sqlite3_local_rag"
+
+// dsnOptions are applied to every connection. Indexing is write-heavy, so:
+// synchronous=NORMAL drops the fsync per commit (still durable across
+// application crashes in WAL mode), a 64 MiB page cache (negative
+// cache_size is in KiB) keeps hot B-tree pages resident, and busy_timeout
+// waits out a concurrent writer (e.g. the GUI's auto-reindex) instead of
+// failing with SQLITE_BUSY. Every transaction here writes, so txlock=immediate
+// takes the write lock at BEGIN, where the busy timeout applies: a deferred
+// transaction that reads first and then writes fails at once with
+// SQLITE_BUSY_SNAPSHOT if another writer committed in between.
+const dsnOptions = "?_journal_mode=WAL&_foreign_keys=ON&_synchronous=NORMAL&_busy_timeout=5000&_cache_size=-65536&_txlock=immediate"
+
+// connectPragmas run on each new connection: temp B-trees (sorts, GROUP
+// BY) stay in memory, and reads are served from a 256 MiB memory map
+// rather than read() syscalls.
+const connectPragmas = "PRAGMA temp_store = MEMORY; PRAGMA mmap_size = 268435456;"
+
 func init() {
 	sqlite_vec.Auto()
+	sql.Register(driverName, &sqlite3.SQLiteDriver{
+		ConnectHook: func(conn *sqlite3.SQLiteConn) error {
+			_, err := conn.Exec(connectPragmas, nil)
+			return err
+		},
+	})
 }
 
-// Open creates a new SQLite connection with WAL mode, foreign keys, and sqlite-vec loaded.
+// Querier is the query interface shared by *sql.DB and *sql.Tx, so write
+// helpers can run either standalone or inside a caller's transaction.
+type Querier interface {
+	Exec(query string, args ...any) (sql.Result, error)
+	Query(query string, args ...any) (*sql.Rows, error)
+	QueryRow(query string, args ...any) *sql.Row
+}
+
+// Open creates a new SQLite connection with WAL mode, foreign keys, the
+// write-oriented pragmas above, and sqlite-vec loaded.
 func Open(dbPath string) (*sql.DB, error) {
+	return open(dbPath, dsnOptions)
+}
+
+// OpenReadOnly is like Open but every connection runs with query_only, so
+// the handle can be shared by status readers without risk of writes. In
+// WAL mode its readers do not block, and are not blocked by, a writer.
+func OpenReadOnly(dbPath string) (*sql.DB, error) {
+	return open(dbPath, dsnOptions+"&_query_only=1")
+}
+
+func open(dbPath, dsn string) (*sql.DB, error) {
 	dir := filepath.Dir(dbPath)
 	if err := os.MkdirAll(dir, 0o755); err != nil {
 		return nil, fmt.Errorf("create db directory: %w", err)
 	}
 
-	db, err := sql.Open("sqlite3", dbPath+"?_journal_mode=WAL&_foreign_keys=ON")
+	db, err := sql.Open(driverName, dbPath+dsn)
 	if err != nil {
 		return nil, fmt.Errorf("open database: %w", err)
 	}
@@ -38,3 +84,14 @@ func Open(dbPath string) (*sql.DB, error) {
 
 	return db, nil
 }
+
+// Optimize runs PRAGMA optimize, which refreshes the planner statistics
+// (ANALYZE) for tables whose row counts have changed enough to matter. It
+// is cheap when nothing changed, so it is meant to run after each indexing
+// pass rather than on a schedule.
+func Optimize(conn *sql.DB) error {
+	if _, err := conn.Exec("PRAGMA optimize"); err != nil {
+		return fmt.Errorf("optimize: %w", err)
+	}
+	return nil
+}
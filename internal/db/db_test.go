@@ -4,6 +4,7 @@ import (
 	"database/sql"
 	"os"
 	"path/filepath"
+	"strconv"
 	"testing"
 )
 
@@ -50,6 +51,67 @@ func TestOpenCreatesDirectory(t *testing.T) {
 	}
 }
 
+func TestOpenReadOnly(t *testing.T) {
+	dbPath := filepath.Join(t.TempDir(), "test.db")
+	rw, err := Open(dbPath)
+	if err != nil {
+		t.Fatalf("Open: %v", err)
+	}
+	defer rw.Close()
+	if err := InitSchema(rw, 4); err != nil {
+		t.Fatal(err)
+	}
+
+	ro, err := OpenReadOnly(dbPath)
+	if err != nil {
+		t.Fatalf("OpenReadOnly: %v", err)
+	}
+	defer ro.Close()
+
+	var n int
+	if err := ro.QueryRow("SELECT COUNT(*) FROM collections").Scan(&n); err != nil {
+		t.Fatalf("read: %v", err)
+	}
+	if _, err := ro.Exec("INSERT INTO collections (name, collection_type) VALUES ('x', 'project')"); err == nil {
+		t.Error("expected write on read-only handle to fail")
+	}
+}
+
+func TestShared(t *testing.T) {
+	dir := t.TempDir()
+	a, err := Shared(filepath.Join(dir, "a.db"), 4)
+	if err != nil {
+		t.Fatalf("Shared: %v", err)
+	}
+	again, err := Shared(filepath.Join(dir, "a.db"), 4)
+	if err != nil {
+		t.Fatalf("Shared: %v", err)
+	}
+	if again != a {
+		t.Error("expected the same handle for the same path and dimensions")
+	}
+
+	// Switching databases must leave the old handle usable for callers
+	// still holding it.
+	if _, err := Shared(filepath.Join(dir, "b.db"), 4); err != nil {
+		t.Fatalf("Shared: %v", err)
+	}
+	var n int
+	if err := a.QueryRow("SELECT COUNT(*) FROM collections").Scan(&n); err != nil {
+		t.Errorf("old handle after switch: %v", err)
+	}
+}
+
+func TestOptimize(t *testing.T) {
+	db := testDB(t)
+	if err := InitSchema(db, 4); err != nil {
+		t.Fatal(err)
+	}
+	if err := Optimize(db); err != nil {
+		t.Fatalf("Optimize: %v", err)
+	}
+}
+
 func TestInitSchema(t *testing.T) {
 	db := testDB(t)
 
@@ -74,8 +136,8 @@ func TestInitSchema(t *testing.T) {
 	if err := db.QueryRow("SELECT value FROM meta WHERE key='schema_version'").Scan(&version); err != nil {
 		t.Fatalf("schema_version: %v", err)
 	}
-	if version != "4" {
-		t.Errorf("schema_version = %q, want 4", version)
+	if version != "6" {
+		t.Errorf("schema_version = %q, want 6", version)
 	}
 }
 
@@ -89,6 +151,95 @@ func TestInitSchemaIdempotent(t *testing.T) {
 	if err := InitSchema(db, 1024); err != nil {
 		t.Fatalf("second InitSchema: %v", err)
 	}
+
+	// The fast path is keyed on user_version.
+	var userVersion int
+	if err := db.QueryRow("PRAGMA user_version").Scan(&userVersion); err != nil {
+		t.Fatal(err)
+	}
+	if userVersion != SchemaVersion {
+		t.Errorf("user_version = %d, want %d", userVersion, SchemaVersion)
+	}
+}
+
+func TestInitSchemaMigratesOldDatabase(t *testing.T) {
+	db := testDB(t)
+
+	// A v2 database: collections predates the paths column.
+	if _, err := db.Exec(`
+		CREATE TABLE collections (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			name TEXT NOT NULL UNIQUE,
+			collection_type TEXT NOT NULL DEFAULT 'project',
+			description TEXT,
+			created_at TEXT DEFAULT (datetime('now'))
+		);
+		CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+		INSERT INTO meta (key, value) VALUES ('schema_version', '2');
+	`); err != nil {
+		t.Fatal(err)
+	}
+
+	if err := InitSchema(db, 8); err != nil {
+		t.Fatalf("InitSchema: %v", err)
+	}
+
+	if _, err := GetOrCreateCollection(db, "p", "project", nil, []string{"/a"}); err != nil {
+		t.Fatalf("paths column missing after migration: %v", err)
+	}
+	var version string
+	if err := db.QueryRow("SELECT value FROM meta WHERE key='schema_version'").Scan(&version); err != nil {
+		t.Fatal(err)
+	}
+	if version != strconv.Itoa(SchemaVersion) {
+		t.Errorf("schema_version = %q, want %d", version, SchemaVersion)
+	}
+}
+
+// TestInitSchemaMigratesOrphanVectors rebuilds a pre-v6 vec_documents_bin
+// on a database holding vectors whose document no longer exists. Those are
+// skipped rather than failing the migration on a NULL collection_id.
+func TestInitSchemaMigratesOrphanVectors(t *testing.T) {
+	db := testDB(t)
+	if err := InitSchema(db, 8); err != nil {
+		t.Fatal(err)
+	}
+	vec := ser(make([]float32, 8))
+	if _, err := db.Exec(`
+		INSERT INTO collections (id, name, collection_type) VALUES (1, 'c', 'code');
+		INSERT INTO sources (id, collection_id, source_type, source_path) VALUES (1, 1, 'code', '/a');
+		INSERT INTO documents (id, source_id, collection_id, chunk_index, content) VALUES (1, 1, 1, 0, 'x');
+	`); err != nil {
+		t.Fatal(err)
+	}
+	if err := InsertEmbedding(db, 1, vec); err != nil {
+		t.Fatal(err)
+	}
+	if _, err := db.Exec("INSERT INTO vec_documents (embedding, document_id) VALUES (?, 99)", vec); err != nil {
+		t.Fatal(err)
+	}
+
+	// Back to the v5 layout: no collection_id on the binary table.
+	if _, err := db.Exec(`
+		DROP TABLE vec_documents_bin;
+		CREATE VIRTUAL TABLE vec_documents_bin USING vec0(embedding bit[8], document_id INTEGER);
+		UPDATE meta SET value = '5' WHERE key = 'schema_version';
+		PRAGMA user_version = 5;
+	`); err != nil {
+		t.Fatal(err)
+	}
+
+	if err := InitSchema(db, 8); err != nil {
+		t.Fatalf("InitSchema: %v", err)
+	}
+	var n int
+	var collID int64
+	if err := db.QueryRow("SELECT COUNT(*), MAX(collection_id) FROM vec_documents_bin").Scan(&n, &collID); err != nil {
+		t.Fatal(err)
+	}
+	if n != 1 || collID != 1 {
+		t.Errorf("binary vectors = %d in collection %d, want 1 in collection 1", n, collID)
+	}
 }
 
 func TestGetOrCreateCollection(t *testing.T) {
@@ -162,6 +313,21 @@ func TestGetOrCreateCollectionWithPaths(t *testing.T) {
 	if pathsJSON.String != `["/path/c"]` {
 		t.Errorf("paths not updated: %v", pathsJSON.String)
 	}
+
+	// A call without paths keeps the stored paths and the original type.
+	if _, err := GetOrCreateCollection(db, "project-x", "code", nil, nil); err != nil {
+		t.Fatal(err)
+	}
+	var collType string
+	if err := db.QueryRow("SELECT paths, collection_type FROM collections WHERE id = ?", id).Scan(&pathsJSON, &collType); err != nil {
+		t.Fatal(err)
+	}
+	if pathsJSON.String != `["/path/c"]` {
+		t.Errorf("paths = %v, want unchanged", pathsJSON.String)
+	}
+	if collType != "project" {
+		t.Errorf("collection_type = %q, want project", collType)
+	}
 }
 
 func TestGetCollectionPaths(t *testing.T) {
@@ -240,3 +406,199 @@ func TestSetCollectionPaths(t *testing.T) {
 		t.Errorf("expected nil paths after clear, got %v", paths)
 	}
 }
+
+func TestCollectionInfo(t *testing.T) {
+	db := testDB(t)
+	if err := InitSchema(db, 4); err != nil {
+		t.Fatal(err)
+	}
+	if _, err := db.Exec(`
+		INSERT INTO collections (id, name, collection_type) VALUES (1, 'c', 'code');
+		INSERT INTO sources (id, collection_id, source_type, source_path, last_indexed_at)
+		VALUES (1, 1, 'code', '/a', '2026-01-01T00:00:00Z');
+		INSERT INTO documents (source_id, collection_id, chunk_index, content) VALUES (1, 1, 0, 'x'), (1, 1, 1, 'y');
+	`); err != nil {
+		t.Fatal(err)
+	}
+
+	info, err := CollectionInfo(db, "c")
+	if err != nil {
+		t.Fatalf("CollectionInfo: %v", err)
+	}
+	if info.ID != 1 || info.Type != "code" || info.SourceCount != 1 || info.ChunkCount != 2 {
+		t.Errorf("info = %+v", info)
+	}
+	if info.LastIndexed.String != "2026-01-01T00:00:00Z" {
+		t.Errorf("LastIndexed = %v", info.LastIndexed)
+	}
+
+	if _, err := CollectionInfo(db, "missing"); err == nil {
+		t.Error("expected error for unknown collection")
+	}
+}
+
+func TestDeleteCollection(t *testing.T) {
+	conn := testDB(t)
+	if err := InitSchema(conn, 8); err != nil {
+		t.Fatal(err)
+	}
+
+	conn.Exec(`INSERT INTO collections (id, name, collection_type) VALUES (1, 'gone', 'project'), (2, 'kept', 'project')`)
+	conn.Exec(`INSERT INTO sources (id, collection_id, source_type, source_path) VALUES (1, 1, 'md', '/a'), (2, 2, 'md', '/b')`)
+	vec := ser(make([]float32, 8))
+	for docID, sourceID := range []int64{1, 1, 2} {
+		id := int64(docID + 1)
+		if _, err := conn.Exec(
+			`INSERT INTO documents (id, source_id, collection_id, chunk_index, content) VALUES (?, ?, ?, ?, 'x')`,
+			id, sourceID, sourceID, id,
+		); err != nil {
+			t.Fatal(err)
+		}
+		if err := InsertEmbedding(conn, id, vec); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	// Documents 1 and 2 ("gone") and 3 ("kept") all hold 'x', plus one
+	// chunk text only "gone" had.
+	if _, err := conn.Exec(`INSERT INTO documents (id, source_id, collection_id, chunk_index, content) VALUES (4, 1, 1, 4, 'only')`); err != nil {
+		t.Fatal(err)
+	}
+	key := func(text string) []byte { return []byte("k:" + text) }
+	if err := CacheEmbeddings(conn, [][]byte{key("x"), key("only")}, [][]byte{{1}, {2}}); err != nil {
+		t.Fatal(err)
+	}
+
+	if err := DeleteCollection(conn, "gone", key); err != nil {
+		t.Fatalf("DeleteCollection: %v", err)
+	}
+	if err := DeleteCollection(conn, "gone", key); err == nil {
+		t.Error("expected error deleting a missing collection")
+	}
+
+	cached, err := GetCachedEmbeddings(conn, [][]byte{key("x"), key("only")})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if cached[0] == nil || cached[1] != nil {
+		t.Errorf("cache after delete = %v, want only the shared entry", cached)
+	}
+
+	for table, want := range map[string]int{
+		"collections":       1,
+		"sources":           1,
+		"documents":         1,
+		"vec_documents":     1,
+		"vec_documents_bin": 1,
+	} {
+		var n int
+		conn.QueryRow("SELECT COUNT(*) FROM " + table).Scan(&n)
+		if n != want {
+			t.Errorf("%s = %d, want %d", table, n, want)
+		}
+	}
+}
+
+func TestDocumentWriter(t *testing.T) {
+	conn := testDB(t)
+	if err := InitSchema(conn, 8); err != nil {
+		t.Fatal(err)
+	}
+	conn.Exec(`INSERT INTO collections (id, name, collection_type) VALUES (3, 'c', 'project')`)
+	conn.Exec(`INSERT INTO sources (id, collection_id, source_type, source_path) VALUES (1, 3, 'md', '/a')`)
+
+	tx, err := conn.Begin()
+	if err != nil {
+		t.Fatal(err)
+	}
+	w, err := NewDocumentWriter(tx)
+	if err != nil {
+		t.Fatalf("NewDocumentWriter: %v", err)
+	}
+	for i := 0; i < 3; i++ {
+		if err := w.Insert(1, 3, i, "t", "body", "", ser(make([]float32, 8))); err != nil {
+			t.Fatalf("Insert %d: %v", i, err)
+		}
+	}
+	w.Close()
+	if err := tx.Commit(); err != nil {
+		t.Fatal(err)
+	}
+
+	for query, want := range map[string]int{
+		"SELECT COUNT(*) FROM documents":                                 3,
+		"SELECT COUNT(*) FROM vec_documents":                             3,
+		"SELECT COUNT(*) FROM vec_documents_bin WHERE collection_id = 3": 3,
+	} {
+		var n int
+		if err := conn.QueryRow(query).Scan(&n); err != nil {
+			t.Fatalf("%s: %v", query, err)
+		}
+		if n != want {
+			t.Errorf("%s = %d, want %d", query, n, want)
+		}
+	}
+}
+
+func TestEmbeddingCacheRoundTrip(t *testing.T) {
+	db := testDB(t)
+	if err := InitSchema(db, 4); err != nil {
+		t.Fatal(err)
+	}
+
+	keyA, keyB, keyMissing := []byte("a"), []byte("b"), []byte("missing")
+	if err := CacheEmbeddings(db, [][]byte{keyA, keyB}, [][]byte{{1}, {2}}); err != nil {
+		t.Fatalf("CacheEmbeddings: %v", err)
+	}
+	// Re-caching an existing key keeps the original value.
+	if err := CacheEmbeddings(db, [][]byte{keyA}, [][]byte{{9}}); err != nil {
+		t.Fatalf("CacheEmbeddings again: %v", err)
+	}
+
+	got, err := GetCachedEmbeddings(db, [][]byte{keyB, keyMissing, keyA, keyB})
+	if err != nil {
+		t.Fatalf("GetCachedEmbeddings: %v", err)
+	}
+	want := [][]byte{{2}, nil, {1}, {2}}
+	if len(got) != len(want) {
+		t.Fatalf("got %d results, want %d", len(got), len(want))
+	}
+	for i := range want {
+		if string(got[i]) != string(want[i]) || (got[i] == nil) != (want[i] == nil) {
+			t.Errorf("result %d = %v, want %v", i, got[i], want[i])
+		}
+	}
+}
+
+func TestPruneEmbeddingCache(t *testing.T) {
+	db := testDB(t)
+	if err := InitSchema(db, 4); err != nil {
+		t.Fatal(err)
+	}
+	if _, err := db.Exec(`
+		INSERT INTO collections (id, name, collection_type) VALUES (1, 'c', 'code');
+		INSERT INTO sources (id, collection_id, source_type, source_path) VALUES (1, 1, 'code', '/a');
+		INSERT INTO documents (source_id, collection_id, chunk_index, content) VALUES (1, 1, 0, 'kept');
+	`); err != nil {
+		t.Fatal(err)
+	}
+	key := func(text string) []byte { return []byte("k:" + text) }
+	if err := CacheEmbeddings(db, [][]byte{key("kept"), key("gone")}, [][]byte{{1}, {2}}); err != nil {
+		t.Fatal(err)
+	}
+
+	n, err := PruneEmbeddingCache(db, key)
+	if err != nil {
+		t.Fatalf("PruneEmbeddingCache: %v", err)
+	}
+	if n != 1 {
+		t.Errorf("pruned %d entries, want 1", n)
+	}
+	got, err := GetCachedEmbeddings(db, [][]byte{key("kept"), key("gone")})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if got[0] == nil || got[1] != nil {
+		t.Errorf("cache after prune = %v, want only the kept entry", got)
+	}
+}
@@ -50,6 +50,27 @@ func Migrate(db *sql.DB, embeddingDim int) error {
 		}
 	}
 
+	if current < 5 {
+		// v5: Add the embedding cache.
+		if _, err := db.Exec(
+			"CREATE TABLE IF NOT EXISTS embedding_cache (key BLOB PRIMARY KEY, embedding BLOB NOT NULL) WITHOUT ROWID",
+		); err != nil {
+			return fmt.Errorf("migration v5: %w", err)
+		}
+		slog.Info("migration v5: added embedding_cache table")
+	}
+
+	if current < 6 {
+		// v6: Partition the binary vectors by collection.
+		if err := addBinaryCollectionColumn(db, embeddingDim); err != nil {
+			return fmt.Errorf("migration v6: %w", err)
+		}
+		if err := backfillBinaryVectors(db); err != nil {
+			return fmt.Errorf("migration v6: %w", err)
+		}
+		slog.Info("migration v6: added collection_id to vec_documents_bin")
+	}
+
 	if _, err := db.Exec(
 		"UPDATE meta SET value = ? WHERE key = 'schema_version'",
 		fmt.Sprintf("%d", SchemaVersion),
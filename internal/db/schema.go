@@ -10,10 +10,23 @@ import (
 )
 
 // SchemaVersion is the current schema version. Bump this when adding migrations.
-const SchemaVersion = 4
+const SchemaVersion = 6
 
 // InitSchema creates all tables, virtual tables, and triggers if they don't exist.
+//
+// Once a database has been fully initialized, PRAGMA user_version is set to
+// SchemaVersion; later calls read that single header field and return
+// without replaying the DDL or the backfill checks.
 func InitSchema(db *sql.DB, embeddingDim int) error {
+	var userVersion int
+	if err := db.QueryRow("PRAGMA user_version").Scan(&userVersion); err != nil {
+		return fmt.Errorf("read user_version: %w", err)
+	}
+	if userVersion == SchemaVersion {
+		slog.Debug("database schema is current", "version", SchemaVersion)
+		return nil
+	}
+
 	schema := fmt.Sprintf(`
 		CREATE TABLE IF NOT EXISTS collections (
 			id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -47,18 +60,9 @@ func InitSchema(db *sql.DB, embeddingDim int) error {
 			UNIQUE(source_id, chunk_index)
 		);
 
-		CREATE VIRTUAL TABLE IF NOT EXISTS vec_documents USING vec0(
-			embedding float[%d],
-			document_id INTEGER
-		);
+		%s
 
-		-- Binary-quantized mirror of vec_documents for fast candidate retrieval.
-		-- Each row shares the rowid of its vec_documents counterpart, so exact
-		-- float vectors can be fetched by rowid for reranking. See search package.
-		CREATE VIRTUAL TABLE IF NOT EXISTS vec_documents_bin USING vec0(
-			embedding bit[%[1]d],
-			document_id INTEGER
-		);
+		%s
 
 		CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
 			title,
@@ -91,14 +95,28 @@ func InitSchema(db *sql.DB, embeddingDim int) error {
 
 		-- Speeds up per-collection COUNT/aggregation (collections list/info) and
 		-- collection-scoped deletes. Without it, those queries full-scan documents.
+		-- Lookups by sources.collection_id and documents.source_id need no index
+		-- of their own: they are the leading columns of the UNIQUE constraints
+		-- above, whose automatic indexes serve them.
 		CREATE INDEX IF NOT EXISTS idx_documents_collection_id ON documents(collection_id);
-	`, embeddingDim)
+
+		-- Embeddings keyed by SHA-256 of (model, chunk text), so re-indexing a
+		-- chunk whose text has not changed skips the Ollama call. Rows are not
+		-- tied to documents, so deletes leave them behind; PruneEmbeddingCache
+		-- removes the unused ones. The table can be emptied at any time.
+		CREATE TABLE IF NOT EXISTS embedding_cache (
+			key BLOB PRIMARY KEY,
+			embedding BLOB NOT NULL
+		) WITHOUT ROWID;
+	`, vecDocumentsDDL("vec_documents", embeddingDim), vecDocumentsBinDDL("vec_documents_bin", embeddingDim))
 
 	if _, err := db.Exec(schema); err != nil {
 		return fmt.Errorf("create schema: %w", err)
 	}
 
-	// Set schema version if not already set.
+	// Set schema version on a fresh database; bring an older one forward.
+	// CREATE ... IF NOT EXISTS leaves existing tables as they are, so
+	// column changes only reach an old database through Migrate.
 	var existing sql.NullString
 	err := db.QueryRow("SELECT value FROM meta WHERE key = 'schema_version'").Scan(&existing)
 	if err == sql.ErrNoRows {
@@ -110,16 +128,93 @@ func InitSchema(db *sql.DB, embeddingDim int) error {
 		}
 	} else if err != nil {
 		return fmt.Errorf("check schema version: %w", err)
+	} else if err := Migrate(db, embeddingDim); err != nil {
+		return fmt.Errorf("migrate: %w", err)
 	}
 
+	if err := addBinaryCollectionColumn(db, embeddingDim); err != nil {
+		return fmt.Errorf("add binary collection column: %w", err)
+	}
 	if err := backfillBinaryVectors(db); err != nil {
 		return fmt.Errorf("backfill binary vectors: %w", err)
 	}
 
+	// PRAGMA arguments cannot be bound; SchemaVersion is a constant int.
+	if _, err := db.Exec(fmt.Sprintf("PRAGMA user_version = %d", SchemaVersion)); err != nil {
+		return fmt.Errorf("set user_version: %w", err)
+	}
+
 	slog.Info("database schema initialized", "version", SchemaVersion, "embedding_dim", embeddingDim)
 	return nil
 }
 
+// vecDocumentsDDL declares the float vector table under the given name.
+//
+// vec0 tables cannot be ALTERed, so any change to their layout (a column,
+// a distance metric, or an ANN index once sqlite-vec has one) means
+// creating the new table and copying rows across. The DDL lives here so
+// InitSchema and such migrations declare the same layout.
+//
+// Query the vec0 tables only through the KNN form (WHERE embedding MATCH ?
+// AND k = ? ORDER BY distance), as search.vectorSearch does. Computing
+// vec_distance_*() in a SELECT or ORDER BY bypasses the KNN path and scans
+// every stored vector.
+func vecDocumentsDDL(table string, dim int) string {
+	return fmt.Sprintf(`CREATE VIRTUAL TABLE IF NOT EXISTS %s USING vec0(
+			embedding float[%d],
+			document_id INTEGER
+		);`, table, dim)
+}
+
+// vecDocumentsBinDDL declares the binary-quantized mirror of vec_documents
+// used for fast candidate retrieval. Each row shares the rowid of its
+// vec_documents counterpart, so exact float vectors can be fetched by rowid
+// for reranking. See search package.
+//
+// collection_id is a vec0 metadata column: a KNN query can constrain it
+// (AND collection_id = ?) and sqlite-vec filters before ranking, so a
+// collection-scoped search only considers that collection's vectors.
+func vecDocumentsBinDDL(table string, dim int) string {
+	return fmt.Sprintf(`CREATE VIRTUAL TABLE IF NOT EXISTS %s USING vec0(
+			embedding bit[%d],
+			document_id INTEGER,
+			collection_id INTEGER
+		);`, table, dim)
+}
+
+// addBinaryCollectionColumn recreates a vec_documents_bin created before it
+// carried collection_id and repopulates it from vec_documents. vec0 tables
+// cannot be ALTERed, and the binary rows are derived data, so dropping the
+// table is cheaper than copying it. The drop, rebuild and backfill flag
+// commit together: a failure leaves the old table in place for the next
+// open to retry.
+func addBinaryCollectionColumn(db *sql.DB, dim int) error {
+	if _, err := db.Exec("SELECT collection_id FROM vec_documents_bin LIMIT 0"); err == nil {
+		return nil
+	}
+	slog.Info("rebuilding binary-quantized vectors with collection_id (one-time)")
+
+	tx, err := db.Begin()
+	if err != nil {
+		return fmt.Errorf("begin rebuild tx: %w", err)
+	}
+	defer tx.Rollback()
+
+	if _, err := tx.Exec("DROP TABLE vec_documents_bin"); err != nil {
+		return fmt.Errorf("drop binary vectors: %w", err)
+	}
+	if _, err := tx.Exec(vecDocumentsBinDDL("vec_documents_bin", dim)); err != nil {
+		return fmt.Errorf("create binary vectors: %w", err)
+	}
+	if err := fillBinaryVectors(tx); err != nil {
+		return err
+	}
+	if err := setBinaryBackfillDone(tx); err != nil {
+		return err
+	}
+	return tx.Commit()
+}
+
 // binaryBackfillDoneKey marks that vec_documents_bin has been fully populated
 // from the existing vec_documents rows. Once set, InitSchema skips the check
 // on subsequent opens, keeping the search hot path cheap.
@@ -139,38 +234,65 @@ func backfillBinaryVectors(db *sql.DB) error {
 		return fmt.Errorf("check backfill flag: %w", err)
 	}
 
-	// Compare row counts (cheap — reads the rowid shadow tables, not vectors).
+	// Compare the rows that have a document on both sides. Vectors whose
+	// document is gone (left behind by older source deletes) are not
+	// copied, so they must not count against the binary table either.
 	var floatCount, binCount int
-	if err := db.QueryRow("SELECT COUNT(*) FROM vec_documents").Scan(&floatCount); err != nil {
+	if err := db.QueryRow(
+		"SELECT COUNT(*) FROM vec_documents v JOIN documents d ON d.id = v.document_id",
+	).Scan(&floatCount); err != nil {
 		return fmt.Errorf("count vectors: %w", err)
 	}
-	if err := db.QueryRow("SELECT COUNT(*) FROM vec_documents_bin").Scan(&binCount); err != nil {
+	if err := db.QueryRow(
+		"SELECT COUNT(*) FROM vec_documents_bin v JOIN documents d ON d.id = v.document_id",
+	).Scan(&binCount); err != nil {
 		return fmt.Errorf("count binary vectors: %w", err)
 	}
 
+	tx, err := db.Begin()
+	if err != nil {
+		return fmt.Errorf("begin backfill tx: %w", err)
+	}
+	defer tx.Rollback()
+
 	if binCount != floatCount {
 		// Rebuild from scratch. We clear any partial rows and re-insert everything
 		// rather than filtering with NOT IN: a WHERE subquery on the vec0 source
 		// makes sqlite-vec mishandle the vector column type during INSERT...SELECT.
-		if binCount > 0 {
-			if _, err := db.Exec("DELETE FROM vec_documents_bin"); err != nil {
-				return fmt.Errorf("clear partial binary vectors: %w", err)
-			}
+		if _, err := tx.Exec("DELETE FROM vec_documents_bin"); err != nil {
+			return fmt.Errorf("clear partial binary vectors: %w", err)
 		}
-		if floatCount > 0 {
-			slog.Info("backfilling binary-quantized vectors (one-time)", "count", floatCount)
-			if _, err := db.Exec(`
-				INSERT INTO vec_documents_bin(rowid, embedding, document_id)
-				SELECT rowid, vec_quantize_binary(embedding), document_id
-				FROM vec_documents
-			`); err != nil {
-				return fmt.Errorf("insert binary vectors: %w", err)
-			}
-			slog.Info("binary vector backfill complete", "count", floatCount)
+		if err := fillBinaryVectors(tx); err != nil {
+			return err
 		}
 	}
+	if err := setBinaryBackfillDone(tx); err != nil {
+		return err
+	}
+	return tx.Commit()
+}
 
-	if _, err := db.Exec(
+// fillBinaryVectors copies every vec_documents row that still has a document
+// into an empty vec_documents_bin. The join skips orphaned vectors: their
+// collection_id would be NULL, which a vec0 INTEGER metadata column rejects.
+func fillBinaryVectors(tx *sql.Tx) error {
+	res, err := tx.Exec(`
+		INSERT INTO vec_documents_bin(rowid, embedding, document_id, collection_id)
+		SELECT v.rowid, vec_quantize_binary(v.embedding), v.document_id, d.collection_id
+		FROM vec_documents v
+		JOIN documents d ON d.id = v.document_id
+	`)
+	if err != nil {
+		return fmt.Errorf("insert binary vectors: %w", err)
+	}
+	if n, err := res.RowsAffected(); err == nil && n > 0 {
+		slog.Info("binary vector backfill complete", "count", n)
+	}
+	return nil
+}
+
+func setBinaryBackfillDone(tx *sql.Tx) error {
+	if _, err := tx.Exec(
 		"INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')",
 		binaryBackfillDoneKey,
 	); err != nil {
@@ -182,8 +304,9 @@ func backfillBinaryVectors(db *sql.DB) error {
 // InsertEmbedding inserts an embedding for a document into both the float
 // vector table and its binary-quantized mirror, keeping their rowids aligned.
 // The binary mirror is used for fast candidate retrieval during search; the
-// float table holds the exact vectors used for reranking.
-func InsertEmbedding(conn *sql.DB, documentID int64, vecBytes []byte) error {
+// float table holds the exact vectors used for reranking. The document row
+// must already exist; its collection_id is copied into the binary mirror.
+func InsertEmbedding(conn Querier, documentID int64, vecBytes []byte) error {
 	res, err := conn.Exec(
 		"INSERT INTO vec_documents (embedding, document_id) VALUES (?, ?)",
 		vecBytes, documentID,
@@ -196,14 +319,81 @@ func InsertEmbedding(conn *sql.DB, documentID int64, vecBytes []byte) error {
 		return fmt.Errorf("vec rowid: %w", err)
 	}
 	if _, err := conn.Exec(
-		"INSERT INTO vec_documents_bin (rowid, embedding, document_id) VALUES (?, vec_quantize_binary(?), ?)",
-		rowid, vecBytes, documentID,
+		`INSERT INTO vec_documents_bin (rowid, embedding, document_id, collection_id)
+		 VALUES (?, vec_quantize_binary(?), ?, (SELECT collection_id FROM documents WHERE id = ?))`,
+		rowid, vecBytes, documentID, documentID,
 	); err != nil {
 		return fmt.Errorf("insert binary vec: %w", err)
 	}
 	return nil
 }
 
+// DocumentWriter inserts documents and their embeddings through statements
+// prepared once, for indexers that write many chunks in one transaction.
+// database/sql does not cache statements, so each Exec on a bare query
+// string would re-parse it for every chunk.
+type DocumentWriter struct {
+	doc, vec, bin *sql.Stmt
+}
+
+// NewDocumentWriter prepares the document and embedding inserts on tx. The
+// statements are released when tx ends, or earlier by Close.
+func NewDocumentWriter(tx *sql.Tx) (*DocumentWriter, error) {
+	w := &DocumentWriter{}
+	var err error
+	if w.doc, err = tx.Prepare(
+		"INSERT INTO documents (source_id, collection_id, chunk_index, title, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+	); err != nil {
+		return nil, fmt.Errorf("prepare document insert: %w", err)
+	}
+	if w.vec, err = tx.Prepare(
+		"INSERT INTO vec_documents (embedding, document_id) VALUES (?, ?)",
+	); err != nil {
+		w.Close()
+		return nil, fmt.Errorf("prepare vec insert: %w", err)
+	}
+	if w.bin, err = tx.Prepare(
+		"INSERT INTO vec_documents_bin (rowid, embedding, document_id, collection_id) VALUES (?, vec_quantize_binary(?), ?, ?)",
+	); err != nil {
+		w.Close()
+		return nil, fmt.Errorf("prepare binary vec insert: %w", err)
+	}
+	return w, nil
+}
+
+// Insert writes one document row and its embedding, as InsertEmbedding does.
+func (w *DocumentWriter) Insert(sourceID, collectionID int64, chunkIndex int, title, content, metadata string, vecBytes []byte) error {
+	res, err := w.doc.Exec(sourceID, collectionID, chunkIndex, title, content, metadata)
+	if err != nil {
+		return fmt.Errorf("insert document: %w", err)
+	}
+	docID, err := res.LastInsertId()
+	if err != nil {
+		return fmt.Errorf("document id: %w", err)
+	}
+	res, err = w.vec.Exec(vecBytes, docID)
+	if err != nil {
+		return fmt.Errorf("insert vec: %w", err)
+	}
+	rowid, err := res.LastInsertId()
+	if err != nil {
+		return fmt.Errorf("vec rowid: %w", err)
+	}
+	if _, err := w.bin.Exec(rowid, vecBytes, docID, collectionID); err != nil {
+		return fmt.Errorf("insert binary vec: %w", err)
+	}
+	return nil
+}
+
+// Close releases the prepared statements.
+func (w *DocumentWriter) Close() {
+	for _, stmt := range []*sql.Stmt{w.doc, w.vec, w.bin} {
+		if stmt != nil {
+			stmt.Close()
+		}
+	}
+}
+
 // PruneSources deletes the given sources together with all their documents and
 // embeddings (float + binary mirror) in a single transaction.
 //
@@ -242,6 +432,111 @@ func PruneSources(conn *sql.DB, sourceIDs []int64) error {
 	return tx.Commit()
 }
 
+// DeleteCollection removes a collection and everything indexed under it in a
+// single transaction. Sources and documents go via ON DELETE CASCADE; the
+// vec0 tables are not covered by foreign keys, so their rows are removed
+// first with one set-based DELETE each (a per-row trigger would rescan the
+// vector table for every document, see PruneSources). The collection row
+// itself is removed with DELETE … RETURNING, so no separate id lookup is
+// needed.
+//
+// The embedding_cache entries of the collection's chunks go too, except
+// those whose text another collection still holds. cacheKey maps a chunk's
+// text to its key (see embeddings.CacheKey); only this collection's chunks
+// are hashed.
+func DeleteCollection(conn *sql.DB, name string, cacheKey func(text string) []byte) error {
+	docSubquery := "SELECT d.id FROM documents d JOIN collections c ON c.id = d.collection_id WHERE c.name = ?"
+	contentSubquery := "SELECT d.content FROM documents d JOIN collections c ON c.id = d.collection_id WHERE c.name = ?"
+
+	tx, err := conn.Begin()
+	if err != nil {
+		return fmt.Errorf("begin delete tx: %w", err)
+	}
+	defer tx.Rollback()
+
+	keys, err := collectionCacheKeys(tx, name, contentSubquery, cacheKey)
+	if err != nil {
+		return err
+	}
+	if len(keys) > 0 {
+		stmt, err := tx.Prepare("DELETE FROM embedding_cache WHERE key = ?")
+		if err != nil {
+			return fmt.Errorf("prepare cache delete: %w", err)
+		}
+		defer stmt.Close()
+		for _, k := range keys {
+			if _, err := stmt.Exec(k); err != nil {
+				return fmt.Errorf("delete cached embedding: %w", err)
+			}
+		}
+	}
+
+	if _, err := tx.Exec("DELETE FROM vec_documents_bin WHERE document_id IN ("+docSubquery+")", name); err != nil {
+		return fmt.Errorf("delete binary vecs: %w", err)
+	}
+	if _, err := tx.Exec("DELETE FROM vec_documents WHERE document_id IN ("+docSubquery+")", name); err != nil {
+		return fmt.Errorf("delete vecs: %w", err)
+	}
+
+	var id int64
+	err = tx.QueryRow("DELETE FROM collections WHERE name = ? RETURNING id", name).Scan(&id)
+	if err == sql.ErrNoRows {
+		return fmt.Errorf("collection %q not found", name)
+	}
+	if err != nil {
+		return fmt.Errorf("delete collection: %w", err)
+	}
+	return tx.Commit()
+}
+
+// collectionCacheKeys returns the cache keys of the named collection's chunks
+// that no other collection's chunk shares. The shared texts are found with
+// an IN over the collection's own content, so SQLite builds its lookup from
+// the deleted side rather than from the whole documents table.
+func collectionCacheKeys(tx *sql.Tx, name, contentSubquery string, cacheKey func(text string) []byte) ([][]byte, error) {
+	shared := make(map[string]struct{})
+	rows, err := tx.Query(`
+		SELECT DISTINCT o.content FROM documents o
+		WHERE o.collection_id <> (SELECT id FROM collections WHERE name = ?)
+		  AND o.content IN (`+contentSubquery+`)`, name, name)
+	if err != nil {
+		return nil, fmt.Errorf("query shared chunks: %w", err)
+	}
+	for rows.Next() {
+		var content string
+		if err := rows.Scan(&content); err != nil {
+			rows.Close()
+			return nil, fmt.Errorf("scan shared chunk: %w", err)
+		}
+		shared[content] = struct{}{}
+	}
+	err = rows.Err()
+	rows.Close()
+	if err != nil {
+		return nil, fmt.Errorf("query shared chunks: %w", err)
+	}
+
+	var keys [][]byte
+	rows, err = tx.Query(contentSubquery, name)
+	if err != nil {
+		return nil, fmt.Errorf("query collection chunks: %w", err)
+	}
+	defer rows.Close()
+	for rows.Next() {
+		var content string
+		if err := rows.Scan(&content); err != nil {
+			return nil, fmt.Errorf("scan collection chunk: %w", err)
+		}
+		if _, ok := shared[content]; !ok {
+			keys = append(keys, cacheKey(content))
+		}
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("query collection chunks: %w", err)
+	}
+	return keys, nil
+}
+
 // intList renders int64 IDs as a comma-separated SQL literal list. The IDs are
 // internal primary keys, so inlining them is safe from injection.
 func intList(ids []int64) string {
@@ -254,7 +549,7 @@ func intList(ids []int64) string {
 
 // DeleteEmbeddings removes embeddings for the given document IDs from both the
 // float vector table and its binary-quantized mirror.
-func DeleteEmbeddings(conn *sql.DB, documentIDs []any) error {
+func DeleteEmbeddings(conn Querier, documentIDs []any) error {
 	if len(documentIDs) == 0 {
 		return nil
 	}
@@ -272,7 +567,164 @@ func DeleteEmbeddings(conn *sql.DB, documentIDs []any) error {
 	return nil
 }
 
+// cacheLookupBatch bounds the number of keys per embedding_cache lookup,
+// keeping each IN list well under SQLite's bound-parameter limit.
+const cacheLookupBatch = 500
+
+// GetCachedEmbeddings looks up serialized embeddings by cache key. The result
+// is indexed like keys; misses are nil.
+func GetCachedEmbeddings(conn *sql.DB, keys [][]byte) ([][]byte, error) {
+	out := make([][]byte, len(keys))
+	positions := make(map[string][]int, len(keys))
+	for i, k := range keys {
+		positions[string(k)] = append(positions[string(k)], i)
+	}
+
+	for start := 0; start < len(keys); start += cacheLookupBatch {
+		end := min(start+cacheLookupBatch, len(keys))
+		args := make([]any, end-start)
+		for i, k := range keys[start:end] {
+			args[i] = k
+		}
+		placeholders := strings.TrimSuffix(strings.Repeat("?,", len(args)), ",")
+
+		rows, err := conn.Query(
+			"SELECT key, embedding FROM embedding_cache WHERE key IN ("+placeholders+")", args...,
+		)
+		if err != nil {
+			return nil, fmt.Errorf("query embedding cache: %w", err)
+		}
+		for rows.Next() {
+			var key, blob []byte
+			if err := rows.Scan(&key, &blob); err != nil {
+				rows.Close()
+				return nil, fmt.Errorf("scan embedding cache: %w", err)
+			}
+			for _, i := range positions[string(key)] {
+				out[i] = blob
+			}
+		}
+		err = rows.Err()
+		rows.Close()
+		if err != nil {
+			return nil, fmt.Errorf("query embedding cache: %w", err)
+		}
+	}
+	return out, nil
+}
+
+// CacheEmbeddings stores serialized embeddings under their cache keys in one
+// transaction. Keys that are already cached are left untouched.
+func CacheEmbeddings(conn *sql.DB, keys, blobs [][]byte) error {
+	if len(keys) == 0 {
+		return nil
+	}
+	tx, err := conn.Begin()
+	if err != nil {
+		return fmt.Errorf("begin cache tx: %w", err)
+	}
+	defer tx.Rollback()
+
+	stmt, err := tx.Prepare("INSERT OR IGNORE INTO embedding_cache (key, embedding) VALUES (?, ?)")
+	if err != nil {
+		return fmt.Errorf("prepare cache insert: %w", err)
+	}
+	defer stmt.Close()
+
+	for i, k := range keys {
+		if _, err := stmt.Exec(k, blobs[i]); err != nil {
+			return fmt.Errorf("insert cached embedding: %w", err)
+		}
+	}
+	return tx.Commit()
+}
+
+// PruneEmbeddingCache deletes embedding_cache entries that no document uses,
+// returning how many were removed. key maps a chunk's text to its cache key
+// (see embeddings.CacheKey); entries cached under another model therefore
+// count as unused too.
+//
+// Apart from DeleteCollection, nothing else removes cache rows: pruning or
+// re-indexing a document leaves its entry behind, so without this the table
+// only grows. An entry cached by
+// an indexing run whose documents are not committed yet may be removed too,
+// which costs that chunk one embedding call later.
+func PruneEmbeddingCache(conn *sql.DB, key func(text string) []byte) (int64, error) {
+	live := make(map[string]struct{})
+	rows, err := conn.Query("SELECT content FROM documents")
+	if err != nil {
+		return 0, fmt.Errorf("query documents: %w", err)
+	}
+	for rows.Next() {
+		var content string
+		if err := rows.Scan(&content); err != nil {
+			rows.Close()
+			return 0, fmt.Errorf("scan document: %w", err)
+		}
+		live[string(key(content))] = struct{}{}
+	}
+	err = rows.Err()
+	rows.Close()
+	if err != nil {
+		return 0, fmt.Errorf("query documents: %w", err)
+	}
+
+	var stale [][]byte
+	rows, err = conn.Query("SELECT key FROM embedding_cache")
+	if err != nil {
+		return 0, fmt.Errorf("query embedding cache: %w", err)
+	}
+	for rows.Next() {
+		var k []byte
+		if err := rows.Scan(&k); err != nil {
+			rows.Close()
+			return 0, fmt.Errorf("scan embedding cache: %w", err)
+		}
+		if _, ok := live[string(k)]; !ok {
+			stale = append(stale, k)
+		}
+	}
+	err = rows.Err()
+	rows.Close()
+	if err != nil {
+		return 0, fmt.Errorf("query embedding cache: %w", err)
+	}
+	if len(stale) == 0 {
+		return 0, nil
+	}
+
+	tx, err := conn.Begin()
+	if err != nil {
+		return 0, fmt.Errorf("begin cache prune tx: %w", err)
+	}
+	defer tx.Rollback()
+
+	stmt, err := tx.Prepare("DELETE FROM embedding_cache WHERE key = ?")
+	if err != nil {
+		return 0, fmt.Errorf("prepare cache delete: %w", err)
+	}
+	defer stmt.Close()
+
+	for _, k := range stale {
+		if _, err := stmt.Exec(k); err != nil {
+			return 0, fmt.Errorf("delete cached embedding: %w", err)
+		}
+	}
+	if err := tx.Commit(); err != nil {
+		return 0, err
+	}
+	return int64(len(stale)), nil
+}
+
 // GetOrCreateCollection returns the ID of an existing collection or creates a new one.
+// When paths are given they replace the stored paths of an existing collection;
+// its type and description are left as they are.
+//
+// Indexing calls this for every run, and the collection almost always exists
+// with the same paths, so that case is answered by a read alone: the write
+// transaction (and its WAL frames) only happens when something changes.
+// Creation is an upsert, so a concurrent creator of the same name is not an
+// error.
 func GetOrCreateCollection(db *sql.DB, name, collectionType string, description *string, paths []string) (int64, error) {
 	var pathsJSON *string
 	if len(paths) > 0 {
@@ -285,10 +737,10 @@ func GetOrCreateCollection(db *sql.DB, name, collectionType string, description
 	}
 
 	var id int64
-	err := db.QueryRow("SELECT id FROM collections WHERE name = ?", name).Scan(&id)
+	var stored sql.NullString
+	err := db.QueryRow("SELECT id, paths FROM collections WHERE name = ?", name).Scan(&id, &stored)
 	if err == nil {
-		// Collection exists — update paths if provided.
-		if pathsJSON != nil {
+		if pathsJSON != nil && (!stored.Valid || stored.String != *pathsJSON) {
 			if _, err := db.Exec("UPDATE collections SET paths = ? WHERE id = ?", *pathsJSON, id); err != nil {
 				return 0, fmt.Errorf("update collection paths: %w", err)
 			}
@@ -296,20 +748,18 @@ func GetOrCreateCollection(db *sql.DB, name, collectionType string, description
 		return id, nil
 	}
 	if err != sql.ErrNoRows {
-		return 0, fmt.Errorf("query collection: %w", err)
+		return 0, fmt.Errorf("lookup collection: %w", err)
 	}
 
-	// Create new collection.
-	result, err := db.Exec(
-		"INSERT INTO collections (name, collection_type, description, paths) VALUES (?, ?, ?, ?)",
+	err = db.QueryRow(`
+		INSERT INTO collections (name, collection_type, description, paths)
+		VALUES (?, ?, ?, ?)
+		ON CONFLICT(name) DO UPDATE SET paths = COALESCE(excluded.paths, collections.paths)
+		RETURNING id`,
 		name, collectionType, description, pathsJSON,
-	)
-	if err != nil {
-		return 0, fmt.Errorf("insert collection: %w", err)
-	}
-	id, err = result.LastInsertId()
+	).Scan(&id)
 	if err != nil {
-		return 0, fmt.Errorf("get collection id: %w", err)
+		return 0, fmt.Errorf("upsert collection: %w", err)
 	}
 
 	slog.Info("created collection", "name", name, "type", collectionType, "id", id)
@@ -317,25 +767,83 @@ func GetOrCreateCollection(db *sql.DB, name, collectionType string, description
 }
 
 // GetCollectionPaths returns the stored paths for a collection.
+// The JSON array is unpacked by SQLite's json_each, so rows stream straight
+// into the result slice without an intermediate decode.
 func GetCollectionPaths(db *sql.DB, name string) ([]string, error) {
-	var pathsJSON sql.NullString
-	err := db.QueryRow("SELECT paths FROM collections WHERE name = ?", name).Scan(&pathsJSON)
-	if err == sql.ErrNoRows {
-		return nil, fmt.Errorf("collection %q not found", name)
-	}
+	rows, err := db.Query(`
+		SELECT je.value
+		FROM collections c
+		LEFT JOIN json_each(NULLIF(c.paths, '')) je
+		WHERE c.name = ?
+		ORDER BY je.key`, name)
 	if err != nil {
 		return nil, fmt.Errorf("query collection paths: %w", err)
 	}
-	if !pathsJSON.Valid || pathsJSON.String == "" {
-		return nil, nil
-	}
+	defer rows.Close()
+
+	found := false
 	var paths []string
-	if err := json.Unmarshal([]byte(pathsJSON.String), &paths); err != nil {
-		return nil, fmt.Errorf("unmarshal paths: %w", err)
+	for rows.Next() {
+		found = true
+		var p sql.NullString
+		if err := rows.Scan(&p); err != nil {
+			return nil, fmt.Errorf("scan collection path: %w", err)
+		}
+		if p.Valid {
+			paths = append(paths, p.String)
+		}
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("query collection paths: %w", err)
+	}
+	if !found {
+		return nil, fmt.Errorf("collection %q not found", name)
 	}
 	return paths, nil
 }
 
+// CollectionStats is a collection's row together with its source, chunk and
+// last-indexed stats, as returned by CollectionInfo.
+type CollectionStats struct {
+	ID          int64
+	Type        string
+	CreatedAt   string
+	Description sql.NullString
+	SourceCount int
+	ChunkCount  int
+	LastIndexed sql.NullString
+}
+
+// collectionInfoSQL fetches a collection's row together with its stats in
+// one round trip. The CTE yields no row for an unknown name, which surfaces
+// as sql.ErrNoRows.
+const collectionInfoSQL = `
+	WITH c AS (
+		SELECT id, collection_type, created_at, description
+		FROM collections WHERE name = ?
+	)
+	SELECT c.id, c.collection_type, c.created_at, c.description,
+	       (SELECT COUNT(*) FROM sources WHERE collection_id = c.id),
+	       (SELECT COUNT(*) FROM documents WHERE collection_id = c.id),
+	       (SELECT MAX(last_indexed_at) FROM sources WHERE collection_id = c.id)
+	FROM c`
+
+// CollectionInfo returns the named collection's row and stats.
+func CollectionInfo(db *sql.DB, name string) (*CollectionStats, error) {
+	var st CollectionStats
+	err := db.QueryRow(collectionInfoSQL, name).Scan(
+		&st.ID, &st.Type, &st.CreatedAt, &st.Description,
+		&st.SourceCount, &st.ChunkCount, &st.LastIndexed,
+	)
+	if err == sql.ErrNoRows {
+		return nil, fmt.Errorf("collection %q not found", name)
+	}
+	if err != nil {
+		return nil, fmt.Errorf("query collection info: %w", err)
+	}
+	return &st, nil
+}
+
 // SetCollectionPaths stores paths for an existing collection.
 func SetCollectionPaths(db *sql.DB, name string, paths []string) error {
 	var pathsJSON *string
@@ -0,0 +1,62 @@
+package db
+
+import (
+	"database/sql"
+	"fmt"
+	"sync"
+)
+
+// shared holds the process-wide handles returned by Shared and
+// SharedReadOnly, keyed by how they were opened.
+var shared struct {
+	mu      sync.Mutex
+	handles map[string]*sql.DB
+}
+
+// Shared returns a schema-initialized read-write handle for dbPath, opening
+// it on first use. Long-lived processes (the MCP server, the GUI) call it
+// per request instead of reopening the database and reloading sqlite-vec.
+//
+// Callers must not close the handle. Handles are never closed here either:
+// when the configured path or dimensions change, a caller may still be
+// querying the old one, so it stays open until the process exits.
+func Shared(dbPath string, embeddingDim int) (*sql.DB, error) {
+	key := fmt.Sprintf("rw|%s|%d", dbPath, embeddingDim)
+	return sharedHandle(key, func() (*sql.DB, error) {
+		conn, err := Open(dbPath)
+		if err != nil {
+			return nil, err
+		}
+		if err := InitSchema(conn, embeddingDim); err != nil {
+			conn.Close()
+			return nil, err
+		}
+		return conn, nil
+	})
+}
+
+// SharedReadOnly is like Shared for the query-only handle of OpenReadOnly.
+// It does not initialize the schema.
+func SharedReadOnly(dbPath string) (*sql.DB, error) {
+	return sharedHandle("ro|"+dbPath, func() (*sql.DB, error) {
+		return OpenReadOnly(dbPath)
+	})
+}
+
+func sharedHandle(key string, open func() (*sql.DB, error)) (*sql.DB, error) {
+	shared.mu.Lock()
+	defer shared.mu.Unlock()
+
+	if conn, ok := shared.handles[key]; ok {
+		return conn, nil
+	}
+	conn, err := open()
+	if err != nil {
+		return nil, err
+	}
+	if shared.handles == nil {
+		shared.handles = make(map[string]*sql.DB)
+	}
+	shared.handles[key] = conn
+	return conn, nil
+}
@@ -3,6 +3,7 @@ package embeddings
 
 import (
 	"context"
+	"crypto/sha256"
 	"encoding/binary"
 	"encoding/json"
 	"fmt"
@@ -11,7 +12,9 @@ import (
 	"net/http"
 	"os"
 	"strings"
+	"sync"
 	"time"
+	"unsafe"
 
 	"github.com/ollama/ollama/api"
 )
@@ -28,6 +31,12 @@ const DefaultBatchSize = 32
 // trigger model loading.
 const Timeout = 300 * time.Second
 
+// maxConcurrentBatches bounds how many sub-batch requests GetEmbeddings keeps
+// in flight. Overlapping requests hides per-request latency (and lets an
+// Ollama server with OLLAMA_NUM_PARALLEL > 1 work on several at once) without
+// flooding it.
+const maxConcurrentBatches = 4
+
 // batchSize is the maximum number of texts per Ollama API call. It is a package
 // variable so it can be tuned from config at startup (see SetBatchSize).
 var batchSize = DefaultBatchSize
@@ -90,6 +99,39 @@ func ResolveHost(hosts []string, model string) {
 	}
 }
 
+// deferredHost holds host candidates recorded by DeferResolveHost until the
+// first embedding request needs them.
+var deferredHost struct {
+	mu      sync.Mutex
+	pending bool
+	hosts   []string
+	model   string
+}
+
+// DeferResolveHost records the candidate hosts for ResolveHost without
+// probing them. Resolution runs on the first embedding request instead, so
+// commands that end up embedding nothing (e.g. an incremental index run
+// where every file is unchanged) never pay the network probes.
+func DeferResolveHost(hosts []string, model string) {
+	deferredHost.mu.Lock()
+	defer deferredHost.mu.Unlock()
+	deferredHost.pending = true
+	deferredHost.hosts = hosts
+	deferredHost.model = model
+}
+
+// resolveDeferredHost runs a pending DeferResolveHost, at most once. Callers
+// block until it completes so no client is built before OLLAMA_HOST is set.
+func resolveDeferredHost() {
+	deferredHost.mu.Lock()
+	defer deferredHost.mu.Unlock()
+	if !deferredHost.pending {
+		return
+	}
+	deferredHost.pending = false
+	ResolveHost(deferredHost.hosts, deferredHost.model)
+}
+
 // normalizeHost ensures a host string has an http(s) scheme.
 func normalizeHost(host string) string {
 	host = strings.TrimRight(strings.TrimSpace(host), "/")
@@ -135,11 +177,32 @@ func hostHasModel(base, model string) bool {
 	return false
 }
 
+// sharedClient is the Ollama client reused across embedding calls, keyed by
+// the OLLAMA_HOST it was built for.
+var sharedClient struct {
+	mu     sync.Mutex
+	host   string
+	client *api.Client
+}
+
+// newClient returns the shared client for the current OLLAMA_HOST, building
+// it on first use or after the host changes.
 func newClient() (*api.Client, error) {
+	resolveDeferredHost()
+	host := os.Getenv("OLLAMA_HOST")
+
+	sharedClient.mu.Lock()
+	defer sharedClient.mu.Unlock()
+	if sharedClient.client != nil && sharedClient.host == host {
+		return sharedClient.client, nil
+	}
+
 	client, err := api.ClientFromEnvironment()
 	if err != nil {
 		return nil, fmt.Errorf("create ollama client: %w", err)
 	}
+	sharedClient.host = host
+	sharedClient.client = client
 	return client, nil
 }
 
@@ -156,7 +219,9 @@ func GetEmbedding(ctx context.Context, text, model string) ([]float32, error) {
 }
 
 // GetEmbeddings returns embedding vectors for a batch of texts,
-// splitting into sub-batches of BatchSize to avoid timeouts.
+// splitting into sub-batches of BatchSize to avoid timeouts. Up to
+// maxConcurrentBatches sub-batches are in flight at once; results keep the
+// order of texts.
 func GetEmbeddings(ctx context.Context, texts []string, model string) ([][]float32, error) {
 	if len(texts) == 0 {
 		return nil, nil
@@ -167,47 +232,114 @@ func GetEmbeddings(ctx context.Context, texts []string, model string) ([][]float
 		return nil, err
 	}
 
-	all := make([][]float32, 0, len(texts))
+	if len(texts) <= batchSize {
+		return embedBatch(ctx, client, texts, model, 0)
+	}
+
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+
+	all := make([][]float32, len(texts))
+	sem := make(chan struct{}, maxConcurrentBatches)
+	var (
+		wg       sync.WaitGroup
+		errOnce  sync.Once
+		firstErr error
+	)
 
-	for start := 0; start < len(texts); start += batchSize {
+	for start := 0; start < len(texts) && ctx.Err() == nil; start += batchSize {
 		end := start + batchSize
 		if end > len(texts) {
 			end = len(texts)
 		}
-		batch := texts[start:end]
 
-		if len(texts) > batchSize {
+		sem <- struct{}{}
+		wg.Add(1)
+		go func(start, end int) {
+			defer wg.Done()
+			defer func() { <-sem }()
+
 			slog.Info("embedding batch",
 				"from", start+1,
 				"to", end,
 				"total", len(texts),
 			)
-		}
+			vecs, err := embedBatch(ctx, client, texts[start:end], model, start)
+			if err != nil {
+				// Cancel the remaining batches; only the first error is reported.
+				errOnce.Do(func() {
+					firstErr = err
+					cancel()
+				})
+				return
+			}
+			copy(all[start:end], vecs)
+		}(start, end)
+	}
+	wg.Wait()
 
-		reqCtx, cancel := context.WithTimeout(ctx, Timeout)
-		resp, err := client.Embed(reqCtx, &api.EmbedRequest{
-			Model: model,
-			Input: batch,
-		})
-		cancel()
+	if firstErr != nil {
+		return nil, firstErr
+	}
+	if err := ctx.Err(); err != nil {
+		return nil, err
+	}
+	return all, nil
+}
 
-		if err != nil {
-			if isConnectionError(err) {
-				return nil, &OllamaConnectionError{Err: err}
-			}
-			return nil, fmt.Errorf("embed batch [%d:%d]: %w", start, end, err)
-		}
+// embedBatch embeds one sub-batch. offset is the batch's position in the
+// caller's texts and is only used for error messages.
+func embedBatch(ctx context.Context, client *api.Client, batch []string, model string, offset int) ([][]float32, error) {
+	reqCtx, cancel := context.WithTimeout(ctx, Timeout)
+	defer cancel()
 
-		all = append(all, resp.Embeddings...)
+	resp, err := client.Embed(reqCtx, &api.EmbedRequest{
+		Model: model,
+		Input: batch,
+	})
+	if err != nil {
+		if isConnectionError(err) {
+			return nil, &OllamaConnectionError{Err: err}
+		}
+		return nil, fmt.Errorf("embed batch [%d:%d]: %w", offset, offset+len(batch), err)
+	}
+	if len(resp.Embeddings) != len(batch) {
+		return nil, fmt.Errorf("embed batch [%d:%d]: got %d embeddings, want %d",
+			offset, offset+len(batch), len(resp.Embeddings), len(batch))
 	}
+	return resp.Embeddings, nil
+}
 
-	return all, nil
+// CacheKey returns the embedding-cache key for text embedded with model: the
+// SHA-256 of the model name and text, NUL-separated.
+func CacheKey(model, text string) []byte {
+	h := sha256.New()
+	h.Write([]byte(model))
+	h.Write([]byte{0})
+	h.Write([]byte(text))
+	return h.Sum(nil)
 }
 
+// CacheKeyFunc returns CacheKey bound to model, for the db helpers that
+// derive cache keys from stored chunk text.
+func CacheKeyFunc(model string) func(text string) []byte {
+	return func(text string) []byte { return CacheKey(model, text) }
+}
+
+// nativeLittleEndian reports whether float32 slices are laid out in memory
+// exactly as sqlite-vec stores them (little-endian IEEE 754), which lets
+// (de)serialization copy bytes instead of converting element by element.
+var nativeLittleEndian = binary.NativeEndian.Uint16([]byte{1, 0}) == 1
+
 // SerializeFloat32 converts a float32 embedding vector to the packed binary
 // format expected by sqlite-vec.
 func SerializeFloat32(vec []float32) []byte {
 	buf := make([]byte, 4*len(vec))
+	if nativeLittleEndian && len(vec) > 0 {
+		// The in-memory layout already is the wire format: one memmove.
+		copy(buf, unsafe.Slice((*byte)(unsafe.Pointer(&vec[0])), len(buf)))
+		return buf
+	}
 	for i, v := range vec {
 		binary.LittleEndian.PutUint32(buf[i*4:], math.Float32bits(v))
 	}
@@ -218,6 +350,10 @@ func SerializeFloat32(vec []float32) []byte {
 // float32 vector. It is the inverse of SerializeFloat32.
 func DeserializeFloat32(buf []byte) []float32 {
 	vec := make([]float32, len(buf)/4)
+	if nativeLittleEndian && len(vec) > 0 {
+		copy(unsafe.Slice((*byte)(unsafe.Pointer(&vec[0])), 4*len(vec)), buf)
+		return vec
+	}
 	for i := range vec {
 		vec[i] = math.Float32frombits(binary.LittleEndian.Uint32(buf[i*4:]))
 	}
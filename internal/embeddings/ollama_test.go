@@ -1,9 +1,18 @@
 package embeddings
 
 import (
+	"context"
 	"encoding/binary"
+	"encoding/json"
+	"fmt"
 	"math"
+	"net/http"
+	"net/http/httptest"
+	"strconv"
+	"strings"
+	"sync/atomic"
 	"testing"
+	"time"
 )
 
 func TestSerializeFloat32(t *testing.T) {
@@ -24,6 +33,22 @@ func TestSerializeFloat32(t *testing.T) {
 	}
 }
 
+func TestDeserializeFloat32RoundTrip(t *testing.T) {
+	vec := []float32{1.0, 2.5, -3.14, 0.0, float32(math.Inf(-1))}
+	got := DeserializeFloat32(SerializeFloat32(vec))
+	if len(got) != len(vec) {
+		t.Fatalf("got %d values, want %d", len(got), len(vec))
+	}
+	for i := range vec {
+		if got[i] != vec[i] {
+			t.Errorf("got[%d] = %v, want %v", i, got[i], vec[i])
+		}
+	}
+	if got := DeserializeFloat32(nil); len(got) != 0 {
+		t.Errorf("DeserializeFloat32(nil) = %v, want empty", got)
+	}
+}
+
 func TestSerializeFloat32Empty(t *testing.T) {
 	buf := SerializeFloat32(nil)
 	if len(buf) != 0 {
@@ -52,3 +77,56 @@ func TestIsConnectionError(t *testing.T) {
 type errStr string
 
 func (e errStr) Error() string { return string(e) }
+
+func TestGetEmbeddingsConcurrentBatchesKeepOrder(t *testing.T) {
+	var inFlight, maxInFlight atomic.Int32
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		n := inFlight.Add(1)
+		defer inFlight.Add(-1)
+		for {
+			m := maxInFlight.Load()
+			if n <= m || maxInFlight.CompareAndSwap(m, n) {
+				break
+			}
+		}
+		time.Sleep(20 * time.Millisecond)
+
+		var req struct {
+			Input []string `json:"input"`
+		}
+		json.NewDecoder(r.Body).Decode(&req)
+		// Each text "t<i>" embeds to [i], so order is checkable.
+		vecs := make([][]float32, len(req.Input))
+		for i, text := range req.Input {
+			n, _ := strconv.Atoi(strings.TrimPrefix(text, "t"))
+			vecs[i] = []float32{float32(n)}
+		}
+		json.NewEncoder(w).Encode(map[string]any{"embeddings": vecs})
+	}))
+	defer srv.Close()
+	t.Setenv("OLLAMA_HOST", srv.URL)
+
+	prev := batchSize
+	SetBatchSize(2)
+	defer func() { batchSize = prev }()
+
+	texts := make([]string, 15)
+	for i := range texts {
+		texts[i] = fmt.Sprintf("t%d", i)
+	}
+	got, err := GetEmbeddings(context.Background(), texts, "bge-m3")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(got) != len(texts) {
+		t.Fatalf("got %d embeddings, want %d", len(got), len(texts))
+	}
+	for i, vec := range got {
+		if len(vec) != 1 || vec[0] != float32(i) {
+			t.Errorf("embedding %d = %v, want [%d]", i, vec, i)
+		}
+	}
+	if m := maxInFlight.Load(); m > maxConcurrentBatches {
+		t.Errorf("max in-flight requests = %d, want <= %d", m, maxConcurrentBatches)
+	}
+}
@@ -78,3 +78,27 @@ func TestNormalizeHost(t *testing.T) {
 		}
 	}
 }
+
+func TestDeferResolveHost_ProbesOnFirstUse(t *testing.T) {
+	probes := 0
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		probes++
+		w.Write([]byte(`{"models":[{"name":"bge-m3:latest"}]}`))
+	}))
+	defer srv.Close()
+
+	t.Setenv("OLLAMA_HOST", "")
+	DeferResolveHost([]string{srv.URL}, "bge-m3")
+	if probes != 0 {
+		t.Fatalf("DeferResolveHost probed %d time(s), want 0", probes)
+	}
+
+	resolveDeferredHost()
+	resolveDeferredHost() // second call is a no-op
+	if probes != 1 {
+		t.Errorf("probes = %d, want 1", probes)
+	}
+	if got := os.Getenv("OLLAMA_HOST"); got != srv.URL {
+		t.Errorf("OLLAMA_HOST = %q, want %q", got, srv.URL)
+	}
+}
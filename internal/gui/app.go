@@ -6,7 +6,9 @@ import (
 	"log/slog"
 	"os"
 	"path/filepath"
+	"sort"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"fyne.io/fyne/v2"
@@ -33,29 +35,41 @@ type App struct {
 	statusLabel string
 
 	// mcpStarting is true while the auto-start goroutine is in flight.
-	mcpStarting bool
+	mcpStarting atomic.Bool
 
 	// Window references (nil when not open).
 	settingsWin fyne.Window
 
 	// Log file path and handle for the file-based log.
 	logPath string
-	logFile *os.File
+	logFile *logFileWriter
 
 	// rebuildCh coalesces menu rebuild requests from any goroutine into a
 	// single goroutine that actually calls SetSystemTrayMenu. This avoids
 	// the concurrent-close panic inside fyne.io/systray.ResetMenu.
 	rebuildCh chan struct{}
 
+	// indexMenu is the Index submenu built for indexMenuCfg; see
+	// indexMenuItem. Only touched by doRebuildMenu.
+	indexMenu    *fyne.MenuItem
+	indexMenuCfg *config.Config
+
 	// lastReindex tracks the last time a full reindex completed so both the
 	// periodic timer and the wake handler respect the configured interval.
 	lastReindexMu sync.Mutex
 	lastReindex   time.Time
 
+	// configChanged wakes autoReindexTimer after a config reload so a new
+	// interval (or enabling auto-reindex) takes effect immediately.
+	configChanged chan struct{}
+
 	// Shutdown signal.
 	done chan struct{}
 }
 
+// initialStatusDelay postpones the first status refresh until after startup.
+const initialStatusDelay = 500 * time.Millisecond
+
 // Run is the main entry point for the GUI, called by the "gui" cobra command.
 func Run() error {
 	// Load config.
@@ -66,28 +80,38 @@ func Run() error {
 
 	// Prefer a configured remote embedding host when reachable (falls back to
 	// local). Sets OLLAMA_HOST for the whole GUI process — indexing and MCP.
-	embeddings.ResolveHost(cfg.EmbeddingHosts, cfg.EmbeddingModel)
+	// Probing an unreachable host can take seconds, so it runs on the first
+	// embedding request rather than before the tray icon appears.
+	embeddings.DeferResolveHost(cfg.EmbeddingHosts, cfg.EmbeddingModel)
 	embeddings.SetBatchSize(cfg.EmbeddingBatchSize)
 
 	// Set up log file — truncate on startup so each session starts fresh.
 	logPath := filepath.Join(config.DefaultConfigDir, "local-rag.log")
 	var logWriter io.Writer = os.Stderr
-	var logFile *os.File
+	var logFile *logFileWriter
 	if f, err := os.Create(logPath); err != nil {
 		fmt.Fprintf(os.Stderr, "warning: could not create log file %s: %v\n", logPath, err)
 	} else {
-		logFile = f
+		logFile = newLogFileWriter(f)
 		logWriter = io.MultiWriter(os.Stderr, logFile)
+		activeLogFile.Store(logFile)
+		// Also runs if the main goroutine panics.
+		defer logFile.Close()
 	}
-	slog.SetDefault(slog.New(slog.NewTextHandler(logWriter, &slog.HandlerOptions{Level: slog.LevelInfo})))
+	var handler slog.Handler = slog.NewTextHandler(logWriter, &slog.HandlerOptions{Level: logLevel()})
+	if logFile != nil {
+		handler = flushingHandler{handler, logFile}
+	}
+	slog.SetDefault(slog.New(handler))
 
 	a := &App{
-		cfg:         cfg,
-		logPath:     logPath,
-		logFile:     logFile,
-		statusLabel: "Loading...",
-		rebuildCh:   make(chan struct{}, 1),
-		done:        make(chan struct{}),
+		cfg:           cfg,
+		logPath:       logPath,
+		logFile:       logFile,
+		statusLabel:   "Loading...",
+		rebuildCh:     make(chan struct{}, 1),
+		configChanged: make(chan struct{}, 1),
+		done:          make(chan struct{}),
 	}
 
 	// Create Fyne app — this must be called on the main goroutine.
@@ -101,24 +125,31 @@ func Run() error {
 	// through requestRebuild → rebuildCh → this goroutine.
 	go a.menuRebuildLoop()
 
+	// Redraw the "Indexing: ..." status as runs start, progress and finish,
+	// and the MCP item if the server dies.
+	a.indexingService.OnChange = a.requestRebuild
+	a.mcpService.OnExit = a.requestRebuild
+
 	// Start background timers.
 	go a.statusTimer()
 	go a.autoReindexTimer()
 
 	// Auto-start MCP if configured.
 	if cfg.GUI.AutoStartMCP {
-		a.mcpStarting = true
+		a.mcpStarting.Store(true)
 		go func() {
 			if err := a.mcpService.Start(cfg.GUI.MCPPort); err != nil {
 				slog.Error("auto-start MCP failed", "err", err)
 			}
-			a.mcpStarting = false
+			a.mcpStarting.Store(false)
 			a.requestRebuild()
 		}()
 	}
 
-	// Initial status update.
-	go a.updateStatus()
+	// Initial status update, once the event loop is up: it opens the
+	// database and loads sqlite-vec, which would otherwise compete with
+	// the tray icon for the cold-start disk reads.
+	time.AfterFunc(initialStatusDelay, a.updateStatus)
 
 	slog.Info("local-rag GUI started")
 
@@ -130,9 +161,6 @@ func Run() error {
 	a.mcpService.Stop()
 	parser.ClosePDFPool()
 	slog.Info("local-rag GUI stopped")
-	if a.logFile != nil {
-		a.logFile.Close()
-	}
 
 	return nil
 }
@@ -186,70 +214,84 @@ func (a *App) doRebuildMenu() {
 		a.statusMenuItem(),
 	)
 
-	// Index submenu.
-	indexItems := []*fyne.MenuItem{
-		{Label: "All Collections", Action: func() { a.triggerIndex("") }},
+	menu.Items = append(menu.Items, a.indexMenuItem(cfg))
+	menu.Items = append(menu.Items,
+		&fyne.MenuItem{Label: "Settings...", Action: a.openSettings},
+		&fyne.MenuItem{Label: "View Logs...", Action: a.openLogs},
 		fyne.NewMenuItemSeparator(),
-	}
+		&fyne.MenuItem{Label: "Quit", Action: func() { a.fyneApp.Quit() }},
+	)
 
-	// System collections.
-	for _, name := range []string{"Obsidian", "Email", "Calibre", "RSS"} {
-		n := name
-		indexItems = append(indexItems, &fyne.MenuItem{
-			Label:  n,
-			Action: func() { a.triggerIndex(nameToCollectionKey(n)) },
-		})
+	if desk, ok := a.fyneApp.(desktop.App); ok {
+		desk.SetSystemTrayMenu(menu)
 	}
+}
 
-	// Dynamic repository collections from config.
-	if len(cfg.Repositories) > 0 {
-		indexItems = append(indexItems, fyne.NewMenuItemSeparator())
-		for repoName := range cfg.Repositories {
-			gn := repoName
+// indexMenuItem returns the Index submenu. Its items and their actions only
+// depend on the configured repositories, so they are built once per loaded
+// config and reused by every rebuild; only the disabled state is refreshed.
+func (a *App) indexMenuItem(cfg *config.Config) *fyne.MenuItem {
+	if a.indexMenu == nil || a.indexMenuCfg != cfg {
+		indexItems := []*fyne.MenuItem{
+			{Label: "All Collections", Action: func() { a.triggerIndex("") }},
+			fyne.NewMenuItemSeparator(),
+		}
+
+		// System collections.
+		for _, name := range []string{"Obsidian", "Email", "Calibre", "RSS"} {
+			key := nameToCollectionKey(name)
 			indexItems = append(indexItems, &fyne.MenuItem{
-				Label:  gn,
-				Action: func() { a.triggerIndex(gn) },
+				Label:  name,
+				Action: func() { a.triggerIndex(key) },
 			})
 		}
-	}
 
-	indexMenu := &fyne.MenuItem{
-		Label:     "Index",
-		ChildMenu: fyne.NewMenu("", indexItems...),
-	}
-
-	// Disable index menu while indexing.
-	if a.indexingService.IsRunning() {
-		indexMenu.Disabled = true
-	}
+		// Dynamic repository collections from config, in a stable order.
+		if len(cfg.Repositories) > 0 {
+			repoNames := make([]string, 0, len(cfg.Repositories))
+			for name := range cfg.Repositories {
+				repoNames = append(repoNames, name)
+			}
+			sort.Strings(repoNames)
 
-	menu.Items = append(menu.Items, indexMenu)
-	menu.Items = append(menu.Items,
-		&fyne.MenuItem{Label: "Settings...", Action: a.openSettings},
-		&fyne.MenuItem{Label: "View Logs...", Action: a.openLogs},
-		fyne.NewMenuItemSeparator(),
-		&fyne.MenuItem{Label: "Quit", Action: func() { a.fyneApp.Quit() }},
-	)
+			indexItems = append(indexItems, fyne.NewMenuItemSeparator())
+			for _, name := range repoNames {
+				indexItems = append(indexItems, &fyne.MenuItem{
+					Label:  name,
+					Action: func() { a.triggerIndex(name) },
+				})
+			}
+		}
 
-	if desk, ok := a.fyneApp.(desktop.App); ok {
-		desk.SetSystemTrayMenu(menu)
+		a.indexMenu = &fyne.MenuItem{
+			Label:     "Index",
+			ChildMenu: fyne.NewMenu("", indexItems...),
+		}
+		a.indexMenuCfg = cfg
 	}
+
+	// Disable index menu while indexing.
+	a.indexMenu.Disabled = a.indexingService.IsRunning()
+	return a.indexMenu
 }
 
 func (a *App) mcpMenuItem() *fyne.MenuItem {
+	starting := a.mcpStarting.Load()
 	var label string
-	switch {
-	case a.mcpService.IsRunning():
+	switch state := a.mcpService.State(); {
+	case state == MCPRunning:
 		label = fmt.Sprintf("MCP: Running (:%d)", a.mcpService.Port())
-	case a.mcpStarting:
+	case starting:
 		label = "MCP: Starting..."
+	case state == MCPFailed:
+		label = "MCP: Error"
 	default:
 		label = "MCP: Stopped"
 	}
 	return &fyne.MenuItem{
 		Label:    label,
 		Action:   func() { a.toggleMCP() },
-		Disabled: a.mcpStarting,
+		Disabled: starting,
 	}
 }
 
@@ -300,6 +342,7 @@ func (a *App) triggerIndex(collection string) {
 		fyne.Do(func() {
 			a.fyneApp.SendNotification(fyne.NewNotification("local-rag", msg))
 		})
+		a.statusService.Invalidate()
 		a.updateStatus()
 	}
 
@@ -308,11 +351,6 @@ func (a *App) triggerIndex(collection string) {
 	} else {
 		go a.indexingService.IndexCollection(collection, c, onComplete)
 	}
-	// Rebuild after a short delay to show "Indexing: ..." status.
-	go func() {
-		time.Sleep(200 * time.Millisecond)
-		a.requestRebuild()
-	}()
 }
 
 func (a *App) updateStatus() {
@@ -346,20 +384,51 @@ func (a *App) statusTimer() {
 	}
 }
 
+// autoReindexMinWait bounds how often autoReindexTimer wakes: it is the delay
+// before the first reindex after startup and the retry delay when a due
+// reindex was skipped because indexing was already running.
+const autoReindexMinWait = time.Minute
+
+// autoReindexMaxWait caps a single sleep. Go timers run on the monotonic
+// clock, which does not advance while a Mac is asleep, so one long timer
+// would fire late by however long the machine slept; re-checking the wall
+// clock at least this often bounds that.
+const autoReindexMaxWait = 15 * time.Minute
+
 func (a *App) autoReindexTimer() {
-	// Check every 60 seconds whether a reindex is due. This lets the timer
-	// pick up config changes (enable/disable, interval) without a restart.
-	ticker := time.NewTicker(60 * time.Second)
-	defer ticker.Stop()
+	// Sleep until the next reindex is due rather than polling. A config
+	// reload wakes the timer so it picks up enable/disable and interval
+	// changes without a restart.
+	timer := time.NewTimer(a.nextAutoReindex())
+	defer timer.Stop()
 
 	for {
 		select {
-		case <-ticker.C:
+		case <-timer.C:
 			a.tryAutoReindex("timer")
+		case <-a.configChanged:
 		case <-a.done:
 			return
 		}
+		timer.Reset(a.nextAutoReindex())
+	}
+}
+
+// nextAutoReindex returns how long until the next auto-reindex is due.
+func (a *App) nextAutoReindex() time.Duration {
+	a.cfgMu.RLock()
+	autoReindex := a.cfg.GUI.AutoReindex
+	minutes := a.cfg.GUI.AutoReindexIntervalMinutes
+	a.cfgMu.RUnlock()
+
+	if !autoReindex || minutes <= 0 {
+		return autoReindexMaxWait
 	}
+
+	a.lastReindexMu.Lock()
+	wait := time.Duration(minutes)*time.Minute - time.Since(a.lastReindex)
+	a.lastReindexMu.Unlock()
+	return min(max(wait, autoReindexMinWait), autoReindexMaxWait)
 }
 
 // tryAutoReindex triggers a full reindex only if auto-reindex is enabled, the
@@ -382,32 +451,55 @@ func (a *App) tryAutoReindex(reason string) {
 	interval := time.Duration(minutes) * time.Minute
 
 	a.lastReindexMu.Lock()
-	if time.Since(a.lastReindex) < interval {
-		a.lastReindexMu.Unlock()
+	due := time.Since(a.lastReindex) >= interval
+	a.lastReindexMu.Unlock()
+	if !due {
 		slog.Debug("skipping auto-reindex, interval not reached", "reason", reason)
 		return
 	}
+	if lowBattery() {
+		// lastReindex is left alone, so the timer retries shortly.
+		slog.Debug("postponing auto-reindex, battery low", "reason", reason)
+		return
+	}
+
+	a.lastReindexMu.Lock()
 	a.lastReindex = time.Now()
 	a.lastReindexMu.Unlock()
 
 	slog.Info("auto-reindex triggered", "reason", reason, "interval", interval)
-	go func() {
-		a.indexingService.IndexAll(c, func(err error) {
-			if err == nil {
-				fyne.Do(func() {
-					a.fyneApp.SendNotification(fyne.NewNotification("local-rag", "Re-index completed ("+reason+")"))
-				})
-			}
-			a.requestRebuild()
-		})
-		a.requestRebuild()
-	}()
+	go a.indexingService.IndexAll(c, func(err error) {
+		if err == nil {
+			fyne.Do(func() {
+				a.fyneApp.SendNotification(fyne.NewNotification("local-rag", "Re-index completed ("+reason+")"))
+			})
+		}
+		a.statusService.Invalidate()
+		a.updateStatus()
+	})
 }
 
 // ---------------------------------------------------------------------------
 // Helpers
 // ---------------------------------------------------------------------------
 
+// logLevelEnv overrides the GUI's log level: debug, info, warn or error.
+// warn keeps the per-item indexing lines out of the log entirely; records
+// below the level are dropped before they are formatted.
+const logLevelEnv = "LOCAL_RAG_LOG_LEVEL"
+
+// logLevel returns the level set in logLevelEnv, or INFO.
+func logLevel() slog.Level {
+	level := slog.LevelInfo
+	if v := os.Getenv(logLevelEnv); v != "" {
+		if err := level.UnmarshalText([]byte(v)); err != nil {
+			fmt.Fprintf(os.Stderr, "warning: ignoring %s=%q: %v\n", logLevelEnv, v, err)
+			level = slog.LevelInfo
+		}
+	}
+	return level
+}
+
 func nameToCollectionKey(display string) string {
 	switch display {
 	case "Obsidian":
@@ -433,5 +525,12 @@ func (a *App) ReloadConfig() {
 	a.cfgMu.Lock()
 	a.cfg = cfg
 	a.cfgMu.Unlock()
+
+	select {
+	case a.configChanged <- struct{}{}:
+	default:
+	}
 	a.requestRebuild()
+	a.statusService.Invalidate()
+	go a.updateStatus()
 }
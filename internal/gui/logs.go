@@ -1,12 +1,103 @@
 package gui
 
 import (
+	"bufio"
+	"context"
 	"log/slog"
 	"os"
 	"os/exec"
+	"sync"
+	"sync/atomic"
+	"time"
 )
 
+// logFlushDelay is how long log records are held before being written to
+// the log file, which is also how stale the file can be when opened.
+const logFlushDelay = 50 * time.Millisecond
+
+// logFileWriter buffers writes to the GUI log file and flushes them
+// logFlushDelay after the first write of a burst, so an indexing run that
+// logs a line per item costs one write syscall per burst rather than one
+// per record. Error records are flushed at once by flushingHandler.
+type logFileWriter struct {
+	mu      sync.Mutex
+	f       *os.File
+	buf     *bufio.Writer
+	pending bool
+}
+
+func newLogFileWriter(f *os.File) *logFileWriter {
+	return &logFileWriter{f: f, buf: bufio.NewWriterSize(f, 64*1024)}
+}
+
+// Write buffers p and schedules a flush if none is pending.
+func (w *logFileWriter) Write(p []byte) (int, error) {
+	w.mu.Lock()
+	defer w.mu.Unlock()
+	if !w.pending {
+		w.pending = true
+		time.AfterFunc(logFlushDelay, w.Flush)
+	}
+	return w.buf.Write(p)
+}
+
+// Flush writes any buffered records to the file.
+func (w *logFileWriter) Flush() {
+	w.mu.Lock()
+	defer w.mu.Unlock()
+	w.pending = false
+	w.buf.Flush()
+}
+
+// Close flushes buffered records and closes the file.
+func (w *logFileWriter) Close() error {
+	w.mu.Lock()
+	defer w.mu.Unlock()
+	w.buf.Flush()
+	return w.f.Close()
+}
+
+// activeLogFile is the running GUI's log file, for FlushLogs.
+var activeLogFile atomic.Pointer[logFileWriter]
+
+// FlushLogs writes any buffered GUI log records to the log file. os.Exit
+// skips the GUI's own cleanup, so call it first.
+func FlushLogs() {
+	if w := activeLogFile.Load(); w != nil {
+		w.Flush()
+	}
+}
+
+// flushingHandler flushes the log file after every record at
+// slog.LevelError or above, so the records that explain a crash are on
+// disk before the process can die.
+type flushingHandler struct {
+	slog.Handler
+	w *logFileWriter
+}
+
+func (h flushingHandler) Handle(ctx context.Context, r slog.Record) error {
+	err := h.Handler.Handle(ctx, r)
+	if r.Level >= slog.LevelError {
+		h.w.Flush()
+	}
+	return err
+}
+
+func (h flushingHandler) WithAttrs(attrs []slog.Attr) slog.Handler {
+	return flushingHandler{h.Handler.WithAttrs(attrs), h.w}
+}
+
+func (h flushingHandler) WithGroup(name string) slog.Handler {
+	return flushingHandler{h.Handler.WithGroup(name), h.w}
+}
+
 func (a *App) openLogs() {
+	// Show everything logged so far, not just what has been flushed.
+	if a.logFile != nil {
+		a.logFile.Flush()
+	}
+
 	// Ensure the log file exists (e.g. if someone deleted it manually).
 	if _, err := os.Stat(a.logPath); os.IsNotExist(err) {
 		if f, err := os.Create(a.logPath); err == nil {
@@ -0,0 +1,45 @@
+package gui
+
+import (
+	"os/exec"
+	"regexp"
+	"strconv"
+	"strings"
+)
+
+// autoReindexMinBattery is the battery charge (percent) below which scheduled
+// re-indexing waits for AC power. A full reindex keeps Ollama and the disk
+// busy for minutes, which is a poor use of the last of a laptop's battery.
+const autoReindexMinBattery = 20
+
+var batteryPercentRe = regexp.MustCompile(`(\d+)%`)
+
+// lowBattery reports whether the machine is running on battery with less
+// than autoReindexMinBattery percent charge. It asks pmset, so it is false
+// on desktops and wherever pmset is unavailable.
+func lowBattery() bool {
+	out, err := exec.Command("pmset", "-g", "batt").Output()
+	if err != nil {
+		return false
+	}
+	onBattery, percent, ok := parsePmsetBatt(string(out))
+	return ok && onBattery && percent < autoReindexMinBattery
+}
+
+// parsePmsetBatt extracts the power source and charge from `pmset -g batt`
+// output, e.g.:
+//
+//	Now drawing from 'Battery Power'
+//	 -InternalBattery-0 (id=4653155)	18%; discharging; 0:52 remaining present: true
+func parsePmsetBatt(out string) (onBattery bool, percent int, ok bool) {
+	onBattery = strings.Contains(out, "'Battery Power'")
+	m := batteryPercentRe.FindStringSubmatch(out)
+	if m == nil {
+		return onBattery, 0, false
+	}
+	percent, err := strconv.Atoi(m[1])
+	if err != nil {
+		return onBattery, 0, false
+	}
+	return onBattery, percent, true
+}
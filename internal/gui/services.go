@@ -3,6 +3,7 @@ package gui
 import (
 	"context"
 	"database/sql"
+	"errors"
 	"fmt"
 	"log/slog"
 	"net"
@@ -23,12 +24,28 @@ import (
 // MCPService — in-process SSE server
 // ---------------------------------------------------------------------------
 
+// MCPState is the lifecycle state of the MCP server.
+type MCPState int
+
+const (
+	// MCPStopped means the server is not running: never started, or stopped.
+	MCPStopped MCPState = iota
+	// MCPRunning means the server is serving SSE.
+	MCPRunning
+	// MCPFailed means the last start failed or the server exited on its own.
+	MCPFailed
+)
+
 // MCPService manages an in-process MCP SSE server.
 type MCPService struct {
 	mu        sync.Mutex
-	running   bool
+	state     MCPState
 	port      int
 	sseServer *server.SSEServer
+
+	// OnExit, when set, is called if the server stops on its own (not via
+	// Stop), so the UI learns of it without polling IsRunning.
+	OnExit func()
 }
 
 // Start creates the MCP server and starts SSE on the given port.
@@ -36,13 +53,14 @@ func (s *MCPService) Start(port int) error {
 	s.mu.Lock()
 	defer s.mu.Unlock()
 
-	if s.running {
+	if s.state == MCPRunning {
 		return fmt.Errorf("MCP server already running on port %d", s.port)
 	}
 
 	// Check port availability.
 	ln, err := net.Listen("tcp", fmt.Sprintf("127.0.0.1:%d", port))
 	if err != nil {
+		s.state = MCPFailed
 		return fmt.Errorf("port %d unavailable: %w", port, err)
 	}
 	ln.Close()
@@ -55,14 +73,26 @@ func (s *MCPService) Start(port int) error {
 
 	s.sseServer = sseServer
 	s.port = port
-	s.running = true
+	s.state = MCPRunning
 
 	go func() {
-		if err := sseServer.Start(addr); err != nil {
-			slog.Error("MCP SSE server stopped", "err", err)
-			s.mu.Lock()
-			s.running = false
-			s.mu.Unlock()
+		err := sseServer.Start(addr)
+		if errors.Is(err, http.ErrServerClosed) {
+			return // Stop shut it down.
+		}
+		slog.Error("MCP SSE server stopped", "err", err)
+
+		s.mu.Lock()
+		// A Stop/Start in the meantime replaced the server; leave the new
+		// one's state alone.
+		current := s.sseServer == sseServer
+		if current {
+			s.state = MCPFailed
+			s.sseServer = nil
+		}
+		s.mu.Unlock()
+		if current && s.OnExit != nil {
+			s.OnExit()
 		}
 	}()
 
@@ -74,7 +104,8 @@ func (s *MCPService) Stop() {
 	s.mu.Lock()
 	defer s.mu.Unlock()
 
-	if !s.running {
+	if s.state != MCPRunning {
+		s.state = MCPStopped
 		return
 	}
 
@@ -89,15 +120,20 @@ func (s *MCPService) Stop() {
 		s.sseServer = nil
 	}
 
-	s.running = false
+	s.state = MCPStopped
 	slog.Info("MCP server stopped")
 }
 
 // IsRunning returns whether the MCP server is running.
 func (s *MCPService) IsRunning() bool {
+	return s.State() == MCPRunning
+}
+
+// State returns the server's lifecycle state.
+func (s *MCPService) State() MCPState {
 	s.mu.Lock()
 	defer s.mu.Unlock()
-	return s.running
+	return s.state
 }
 
 // Port returns the port the MCP server is running on.
@@ -117,6 +153,11 @@ type IndexingService struct {
 	running        bool
 	currentLabel   string
 	lastCompletion time.Time
+
+	// OnChange, when set, is called after a run starts, moves on to another
+	// collection, or finishes, so the UI can redraw without polling. Set it
+	// before starting any run.
+	OnChange func()
 }
 
 // IsRunning returns whether an indexing operation is in progress.
@@ -142,21 +183,32 @@ func (s *IndexingService) LastCompletion() time.Time {
 
 func (s *IndexingService) setRunning(label string) bool {
 	s.mu.Lock()
-	defer s.mu.Unlock()
 	if s.running {
+		s.mu.Unlock()
 		return false
 	}
 	s.running = true
 	s.currentLabel = label
+	s.mu.Unlock()
+	s.changed()
 	return true
 }
 
 func (s *IndexingService) setDone() {
 	s.mu.Lock()
-	defer s.mu.Unlock()
 	s.running = false
 	s.currentLabel = ""
 	s.lastCompletion = time.Now()
+	s.mu.Unlock()
+	s.changed()
+}
+
+// changed notifies OnChange. It is called without s.mu held, so the
+// callback may read the service state.
+func (s *IndexingService) changed() {
+	if s.OnChange != nil {
+		s.OnChange()
+	}
 }
 
 // IndexAll runs all enabled indexers sequentially. Caller should run in a goroutine.
@@ -174,76 +226,72 @@ func (s *IndexingService) IndexAll(cfg *config.Config, onComplete func(error)) {
 		}
 	}()
 
-	conn, err := openDB(cfg)
+	conn, err := db.Shared(cfg.ExpandedDBPath(), cfg.EmbeddingDimensions)
 	if err != nil {
 		slog.Error("indexAll: open DB failed", "err", err)
 		return
 	}
-	defer conn.Close()
+	defer optimizeDB(conn)
+
+	// Resolve enablement once; the prune and index passes walk the same groups.
+	repoNames := cfg.EnabledKeys(cfg.Repositories)
+	projectNames := cfg.EnabledKeys(cfg.Projects)
 
 	// Auto-prune obsidian and code collections before indexing
 	s.setLabel("pruning")
 	indexer.PruneCollection(conn, cfg, "obsidian")
-	for groupName := range cfg.Repositories {
-		if cfg.IsCollectionEnabled(groupName) {
-			indexer.PruneCollection(conn, cfg, groupName)
-		}
+	for _, groupName := range repoNames {
+		indexer.PruneCollection(conn, cfg, groupName)
 	}
 
-	collections := []struct {
-		label string
-		run   func()
-	}{
-		{"obsidian", func() {
-			if cfg.IsCollectionEnabled("obsidian") && len(cfg.ObsidianVaults) > 0 {
-				s.setLabel("obsidian")
-				indexer.IndexObsidian(conn, cfg, false, nil)
-			}
-		}},
-		{"email", func() {
-			if cfg.IsCollectionEnabled("email") {
-				s.setLabel("email")
-				indexer.IndexEmails(conn, cfg, false, nil)
-			}
-		}},
-		{"calibre", func() {
-			if cfg.IsCollectionEnabled("calibre") && len(cfg.CalibreLibraries) > 0 {
-				s.setLabel("calibre")
-				indexer.IndexCalibre(conn, cfg, false, nil)
-			}
-		}},
-		{"rss", func() {
-			if cfg.IsCollectionEnabled("rss") {
-				s.setLabel("rss")
-				indexer.IndexRSS(conn, cfg, false, nil)
-			}
-		}},
+	// Totals are accumulated as each indexer returns, so the run summary
+	// needs no second pass over per-collection results.
+	total := &indexer.IndexResult{}
+	collections := 0
+	add := func(r *indexer.IndexResult) {
+		if r != nil {
+			total.Merge(r)
+			collections++
+		}
 	}
 
-	for _, c := range collections {
-		c.run()
+	if cfg.IsCollectionEnabled("obsidian") && len(cfg.ObsidianVaults) > 0 {
+		s.setLabel("obsidian")
+		add(indexer.IndexObsidian(conn, cfg, false, nil))
+	}
+	if cfg.IsCollectionEnabled("email") {
+		s.setLabel("email")
+		add(indexer.IndexEmails(conn, cfg, false, nil))
+	}
+	if cfg.IsCollectionEnabled("calibre") && len(cfg.CalibreLibraries) > 0 {
+		s.setLabel("calibre")
+		add(indexer.IndexCalibre(conn, cfg, false, nil))
+	}
+	if cfg.IsCollectionEnabled("rss") {
+		s.setLabel("rss")
+		add(indexer.IndexRSS(conn, cfg, false, nil))
 	}
 
 	// Code repositories.
-	for groupName, configPaths := range cfg.Repositories {
-		if !cfg.IsCollectionEnabled(groupName) {
-			continue
-		}
-		repos := indexer.ResolveRepoPaths(configPaths)
+	for _, groupName := range repoNames {
+		repos := indexer.ResolveRepoPaths(cfg.Repositories[groupName])
 		for _, repoPath := range repos {
 			s.setLabel(groupName)
-			indexer.IndexGitRepo(conn, cfg, repoPath, groupName, false, true, nil)
+			add(indexer.IndexGitRepo(conn, cfg, repoPath, groupName, false, true, nil))
 		}
 	}
 
 	// Project collections from config.
-	for projectName, paths := range cfg.Projects {
-		if !cfg.IsCollectionEnabled(projectName) {
-			continue
-		}
+	for _, projectName := range projectNames {
 		s.setLabel(projectName)
-		indexer.IndexProject(conn, cfg, projectName, paths, false, nil)
+		add(indexer.IndexProject(conn, cfg, projectName, cfg.Projects[projectName], false, nil))
 	}
+
+	s.setLabel("pruning")
+	indexer.PruneEmbeddingCache(conn, cfg)
+
+	slog.Info("indexAll complete", "collections", collections,
+		"indexed", total.Indexed, "skipped", total.Skipped, "errors", total.Errors)
 }
 
 // IndexCollection runs a single collection's indexer. Caller should run in a goroutine.
@@ -261,12 +309,12 @@ func (s *IndexingService) IndexCollection(name string, cfg *config.Config, onCom
 		}
 	}()
 
-	conn, err := openDB(cfg)
+	conn, err := db.Shared(cfg.ExpandedDBPath(), cfg.EmbeddingDimensions)
 	if err != nil {
 		slog.Error("indexCollection: open DB failed", "err", err)
 		return
 	}
-	defer conn.Close()
+	defer optimizeDB(conn)
 
 	// Auto-prune for obsidian, code, and project collections
 	if name == "obsidian" {
@@ -303,10 +351,18 @@ func (s *IndexingService) IndexCollection(name string, cfg *config.Config, onCom
 	}
 }
 
+// optimizeDB refreshes planner statistics after an indexing run.
+func optimizeDB(conn *sql.DB) {
+	if err := db.Optimize(conn); err != nil {
+		slog.Warn("optimize database", "err", err)
+	}
+}
+
 func (s *IndexingService) setLabel(label string) {
 	s.mu.Lock()
-	defer s.mu.Unlock()
 	s.currentLabel = label
+	s.mu.Unlock()
+	s.changed()
 }
 
 // ---------------------------------------------------------------------------
@@ -331,31 +387,66 @@ type CollectionInfo struct {
 	Enabled     bool
 }
 
+// overviewTTL is how long GetOverview reuses a computed Overview. Status
+// refreshes cluster (timer, indexing completion, dashboard refresh), and
+// each one would otherwise reopen the database and re-count documents.
+const overviewTTL = 5 * time.Second
+
 // StatusService queries DB stats.
-type StatusService struct{}
+type StatusService struct {
+	// mu also serializes GetOverview, so concurrent refreshes wait for the
+	// one in flight and reuse its result instead of querying again.
+	mu         sync.Mutex
+	overview   Overview
+	overviewAt time.Time
+	dbPath     string
+}
 
-// GetOverview returns summary statistics.
+// GetOverview returns summary statistics, reusing a result computed less
+// than overviewTTL ago for the same database.
 func (s *StatusService) GetOverview(cfg *config.Config) Overview {
-	ov := Overview{}
 	dbPath := cfg.ExpandedDBPath()
 
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	if s.dbPath == dbPath && !s.overviewAt.IsZero() && time.Since(s.overviewAt) < overviewTTL {
+		return s.overview
+	}
+
+	ov := queryOverview(dbPath)
+	s.overview, s.overviewAt, s.dbPath = ov, time.Now(), dbPath
+	return ov
+}
+
+// Invalidate drops the cached Overview, so the next GetOverview reflects
+// changes just written (an indexing run or a deleted collection).
+func (s *StatusService) Invalidate() {
+	s.mu.Lock()
+	s.overviewAt = time.Time{}
+	s.mu.Unlock()
+}
+
+// queryOverview computes an Overview for the database at dbPath.
+func queryOverview(dbPath string) Overview {
+	ov := Overview{}
+
 	info, err := os.Stat(dbPath)
 	if err != nil {
 		return ov
 	}
 	ov.DBSizeMB = float64(info.Size()) / (1024 * 1024)
 
-	conn, err := db.Open(dbPath)
+	conn, err := db.SharedReadOnly(dbPath)
 	if err != nil {
 		return ov
 	}
-	defer conn.Close()
-
-	conn.QueryRow("SELECT COUNT(*) FROM collections").Scan(&ov.CollectionCount)
-	conn.QueryRow("SELECT COUNT(*) FROM documents").Scan(&ov.ChunkCount)
 
 	var lastIndexed sql.NullString
-	conn.QueryRow("SELECT MAX(last_indexed_at) FROM sources").Scan(&lastIndexed)
+	conn.QueryRow(`
+		SELECT (SELECT COUNT(*) FROM collections),
+		       (SELECT COUNT(*) FROM documents),
+		       (SELECT MAX(last_indexed_at) FROM sources)
+	`).Scan(&ov.CollectionCount, &ov.ChunkCount, &lastIndexed)
 	if lastIndexed.Valid {
 		ov.LastIndexed = lastIndexed.String
 	}
@@ -365,11 +456,10 @@ func (s *StatusService) GetOverview(cfg *config.Config) Overview {
 
 // GetCollections returns per-collection stats.
 func (s *StatusService) GetCollections(cfg *config.Config) []CollectionInfo {
-	conn, err := db.Open(cfg.ExpandedDBPath())
+	conn, err := db.SharedReadOnly(cfg.ExpandedDBPath())
 	if err != nil {
 		return nil
 	}
-	defer conn.Close()
 
 	rows, err := conn.Query(`
 		SELECT c.name, c.collection_type,
@@ -402,19 +492,3 @@ func (s *StatusService) CheckOllama() bool {
 	resp.Body.Close()
 	return resp.StatusCode == http.StatusOK
 }
-
-// ---------------------------------------------------------------------------
-// Helpers
-// ---------------------------------------------------------------------------
-
-func openDB(cfg *config.Config) (*sql.DB, error) {
-	conn, err := db.Open(cfg.ExpandedDBPath())
-	if err != nil {
-		return nil, err
-	}
-	if err := db.InitSchema(conn, cfg.EmbeddingDimensions); err != nil {
-		conn.Close()
-		return nil, err
-	}
-	return conn, nil
-}
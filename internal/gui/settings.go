@@ -12,6 +12,8 @@ import (
 	"fyne.io/fyne/v2/widget"
 
 	"github.com/sebastianhutter/local-rag-go/internal/config"
+	"github.com/sebastianhutter/local-rag-go/internal/db"
+	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 )
 
 // minHeightLayout forces a minimum height on its single child.
@@ -58,26 +60,40 @@ func (a *App) openSettings() {
 	// Work on a copy of the config so cancel discards changes.
 	cfg := *a.cfg
 
-	// Build all 8 tabs.
-	generalTab := a.buildGeneralTab(&cfg, w)
-	sourcesTab := a.buildSourcesTab(&cfg, w)
-	repositoriesTab := a.buildRepositoriesTab(&cfg, w)
-	projectsTab := a.buildProjectsTab(&cfg, w)
-	searchTab := a.buildSearchTab(&cfg)
-	ocrTab := a.buildOCRTab(&cfg)
-	mcpTab := a.buildMCPTab(&cfg, w)
-	collectionsTab := a.buildCollectionsTab(&cfg, w)
-
+	// Only the General tab is built up front; the others, including the
+	// Collections tab and its database query, are built the first time
+	// they are selected. Tabs edit cfg directly, so an unbuilt tab simply
+	// leaves its settings as loaded.
 	tabs := container.NewAppTabs(
-		container.NewTabItem("General", generalTab),
-		container.NewTabItem("Sources", sourcesTab),
-		container.NewTabItem("Repositories", repositoriesTab),
-		container.NewTabItem("Projects", projectsTab),
-		container.NewTabItem("Search", searchTab),
-		container.NewTabItem("OCR", ocrTab),
-		container.NewTabItem("MCP & Scheduling", mcpTab),
-		container.NewTabItem("Collections", collectionsTab),
+		container.NewTabItem("General", a.buildGeneralTab(&cfg, w)),
 	)
+	pending := map[*container.TabItem]func() fyne.CanvasObject{}
+	lazyTabs := []struct {
+		title string
+		build func() fyne.CanvasObject
+	}{
+		{"Sources", func() fyne.CanvasObject { return a.buildSourcesTab(&cfg, w) }},
+		{"Repositories", func() fyne.CanvasObject { return a.buildRepositoriesTab(&cfg, w) }},
+		{"Projects", func() fyne.CanvasObject { return a.buildProjectsTab(&cfg, w) }},
+		{"Search", func() fyne.CanvasObject { return a.buildSearchTab(&cfg) }},
+		{"OCR", func() fyne.CanvasObject { return a.buildOCRTab(&cfg) }},
+		{"MCP & Scheduling", func() fyne.CanvasObject { return a.buildMCPTab(&cfg, w) }},
+		{"Collections", func() fyne.CanvasObject { return a.buildCollectionsTab(&cfg, w) }},
+	}
+	for _, t := range lazyTabs {
+		item := container.NewTabItem(t.title, container.NewStack())
+		pending[item] = t.build
+		tabs.Append(item)
+	}
+	tabs.OnSelected = func(item *container.TabItem) {
+		build, ok := pending[item]
+		if !ok {
+			return
+		}
+		delete(pending, item)
+		item.Content = build()
+		tabs.Refresh()
+	}
 
 	saveBtn := widget.NewButton("Save", func() {
 		if err := config.Save(&cfg, ""); err != nil {
@@ -251,10 +267,11 @@ func (a *App) buildRepositoriesTab(cfg *config.Config, w fyne.Window) fyne.Canva
 
 	var rebuild func()
 	rebuild = func() {
-		reposBox.RemoveAll()
+		// Collect the rows and swap them in at once: each Box.Add lays
+		// out the whole box again.
+		var rows []fyne.CanvasObject
 		if len(cfg.Repositories) == 0 {
-			reposBox.Add(widget.NewLabel("No repositories configured."))
-			return
+			rows = append(rows, widget.NewLabel("No repositories configured."))
 		}
 		for repoName, repos := range cfg.Repositories {
 			rn := repoName
@@ -272,14 +289,16 @@ func (a *App) buildRepositoriesTab(cfg *config.Config, w fyne.Window) fyne.Canva
 					}, w)
 			})
 
-			reposBox.Add(container.NewHBox(header, removeBtn))
+			rows = append(rows, container.NewHBox(header, removeBtn))
 			for _, repo := range repos {
 				repoLabel := widget.NewLabel("    " + repo)
 				repoLabel.Wrapping = fyne.TextTruncate
-				reposBox.Add(repoLabel)
+				rows = append(rows, repoLabel)
 			}
-			reposBox.Add(widget.NewSeparator())
+			rows = append(rows, widget.NewSeparator())
 		}
+		reposBox.Objects = rows
+		reposBox.Refresh()
 	}
 	rebuild()
 
@@ -361,10 +380,11 @@ func (a *App) buildProjectsTab(cfg *config.Config, w fyne.Window) fyne.CanvasObj
 
 	var rebuild func()
 	rebuild = func() {
-		projectsBox.RemoveAll()
+		// Collect the rows and swap them in at once: each Box.Add lays
+		// out the whole box again.
+		var rows []fyne.CanvasObject
 		if len(cfg.Projects) == 0 {
-			projectsBox.Add(widget.NewLabel("No projects configured."))
-			return
+			rows = append(rows, widget.NewLabel("No projects configured."))
 		}
 		for projectName, paths := range cfg.Projects {
 			pn := projectName
@@ -382,14 +402,16 @@ func (a *App) buildProjectsTab(cfg *config.Config, w fyne.Window) fyne.CanvasObj
 					}, w)
 			})
 
-			projectsBox.Add(container.NewHBox(header, removeBtn))
+			rows = append(rows, container.NewHBox(header, removeBtn))
 			for _, p := range paths {
 				pathLabel := widget.NewLabel("    " + p)
 				pathLabel.Wrapping = fyne.TextTruncate
-				projectsBox.Add(pathLabel)
+				rows = append(rows, pathLabel)
 			}
-			projectsBox.Add(widget.NewSeparator())
+			rows = append(rows, widget.NewSeparator())
 		}
+		projectsBox.Objects = rows
+		projectsBox.Refresh()
 	}
 	rebuild()
 
@@ -649,10 +671,29 @@ func (a *App) buildCollectionsTab(cfg *config.Config, w fyne.Window) fyne.Canvas
 
 	headers := []string{"Enabled", "Name", "Type", "Chunks", "Last Indexed"}
 
+	// Cell text, formatted once per refresh rather than on every redraw
+	// of a cell.
+	var rows [][]string
+	setCollections := func(cols []CollectionInfo) {
+		collections = cols
+		rows = make([][]string, len(cols))
+		for i, ci := range cols {
+			enabled := "No"
+			if ci.Enabled {
+				enabled = "Yes"
+			}
+			lastIndexed := ci.LastIndexed
+			if lastIndexed == "" {
+				lastIndexed = "never"
+			}
+			rows[i] = []string{enabled, ci.Name, ci.Type, strconv.Itoa(ci.ChunkCount), lastIndexed}
+		}
+	}
+
 	table := widget.NewTable(
 		// length
 		func() (int, int) {
-			return len(collections) + 1, len(headers) // +1 for header row
+			return len(rows), len(headers)
 		},
 		// create
 		func() fyne.CanvasObject {
@@ -660,35 +701,22 @@ func (a *App) buildCollectionsTab(cfg *config.Config, w fyne.Window) fyne.Canvas
 		},
 		// update
 		func(id widget.TableCellID, o fyne.CanvasObject) {
-			label := o.(*widget.Label)
-			if id.Row == 0 {
-				label.SetText(headers[id.Col])
-				label.TextStyle.Bold = true
-				return
-			}
-			ci := collections[id.Row-1]
-			switch id.Col {
-			case 0:
-				if ci.Enabled {
-					label.SetText("Yes")
-				} else {
-					label.SetText("No")
-				}
-			case 1:
-				label.SetText(ci.Name)
-			case 2:
-				label.SetText(ci.Type)
-			case 3:
-				label.SetText(strconv.Itoa(ci.ChunkCount))
-			case 4:
-				if ci.LastIndexed != "" {
-					label.SetText(ci.LastIndexed)
-				} else {
-					label.SetText("never")
-				}
-			}
+			o.(*widget.Label).SetText(rows[id.Row][id.Col])
 		},
 	)
+	// The header row is drawn from its own cell pool, so bold header
+	// labels are never recycled into data cells.
+	table.ShowHeaderRow = true
+	table.CreateHeader = func() fyne.CanvasObject {
+		label := widget.NewLabel("template text here")
+		label.TextStyle.Bold = true
+		return label
+	}
+	table.UpdateHeader = func(id widget.TableCellID, o fyne.CanvasObject) {
+		if id.Col >= 0 {
+			o.(*widget.Label).SetText(headers[id.Col])
+		}
+	}
 
 	// Set column widths.
 	table.SetColumnWidth(0, 70)
@@ -709,7 +737,7 @@ func (a *App) buildCollectionsTab(cfg *config.Config, w fyne.Window) fyne.Canvas
 				ollamaStatus = "OK"
 			}
 			fyne.Do(func() {
-				collections = cols
+				setCollections(cols)
 				summaryLabel.SetText(fmt.Sprintf(
 					"DB: %.1f MB | %d collections | %d chunks | Ollama: %s",
 					ov.DBSizeMB, ov.CollectionCount, ov.ChunkCount, ollamaStatus,
@@ -745,13 +773,13 @@ func (a *App) buildCollectionsTab(cfg *config.Config, w fyne.Window) fyne.Canvas
 						if !yes {
 							return
 						}
-						a.deleteCollection(sel.Selected)
-						// Refresh.
-						collections = a.statusService.GetCollections(cfg)
-						if collections == nil {
-							collections = []CollectionInfo{}
-						}
-						table.Refresh()
+						// The delete hashes the collection's chunks, so it
+						// runs off the UI goroutine.
+						name := sel.Selected
+						go func() {
+							a.deleteCollection(name)
+							refreshData()
+						}()
 					}, w)
 			}, w)
 	})
@@ -767,24 +795,25 @@ func (a *App) buildCollectionsTab(cfg *config.Config, w fyne.Window) fyne.Canvas
 	)
 }
 
+// deleteCollection deletes the named collection and refreshes the tray
+// status. It blocks on the database, so call it off the UI goroutine.
 func (a *App) deleteCollection(name string) {
-	conn, err := openDB(a.cfg)
+	a.cfgMu.RLock()
+	cfg := a.cfg
+	a.cfgMu.RUnlock()
+
+	conn, err := db.Shared(cfg.ExpandedDBPath(), cfg.EmbeddingDimensions)
 	if err != nil {
 		slog.Error("delete collection: open DB failed", "err", err)
 		return
 	}
-	defer conn.Close()
 
-	var id int64
-	err = conn.QueryRow("SELECT id FROM collections WHERE name = ?", name).Scan(&id)
-	if err != nil {
-		slog.Error("delete collection: not found", "name", name)
+	if err := db.DeleteCollection(conn, name, embeddings.CacheKeyFunc(cfg.EmbeddingModel)); err != nil {
+		slog.Error("delete collection failed", "name", name, "err", err)
 		return
 	}
-
-	conn.Exec("DELETE FROM vec_documents_bin WHERE document_id IN (SELECT id FROM documents WHERE collection_id = ?)", id)
-	conn.Exec("DELETE FROM vec_documents WHERE document_id IN (SELECT id FROM documents WHERE collection_id = ?)", id)
-	conn.Exec("DELETE FROM collections WHERE id = ?", id)
+	a.statusService.Invalidate()
+	a.updateStatus()
 	slog.Info("deleted collection", "name", name)
 }
 
@@ -7,12 +7,10 @@ import (
 	"fmt"
 	"log/slog"
 	"os"
-	"time"
 
 	"github.com/sebastianhutter/local-rag-go/internal/chunker"
 	"github.com/sebastianhutter/local-rag-go/internal/config"
 	"github.com/sebastianhutter/local-rag-go/internal/db"
-	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 	"github.com/sebastianhutter/local-rag-go/internal/parser"
 )
 
@@ -29,7 +27,7 @@ func IndexCalibre(conn *sql.DB, cfg *config.Config, force bool, progress Progres
 
 	var allBooks []bookEntry
 	for _, lib := range cfg.CalibreLibraries {
-		lib = expandPath(lib)
+		lib = config.ExpandPath(lib)
 		info, err := os.Stat(lib)
 		if err != nil || !info.IsDir() {
 			slog.Warn("calibre library path does not exist", "path", lib)
@@ -147,32 +145,34 @@ func indexBook(conn *sql.DB, cfg *config.Config, collectionID int64, libraryPath
 		texts[i] = c.Text
 	}
 
-	vecs, err := embed(texts, cfg)
+	vecs, err := embed(conn, texts, cfg)
 	if err != nil {
 		return "", fmt.Errorf("embeddings: %w", err)
 	}
 
-	now := time.Now().UTC().Format(time.RFC3339)
-	sourceID, err := upsertSource(conn, collectionID, sourcePath, sourceType, contentHash, book.LastModified)
-	if err != nil {
-		return "", err
-	}
-
-	for i, c := range chunks {
-		metaJSON, _ := json.Marshal(c.Metadata)
-		res, err := conn.Exec(
-			"INSERT INTO documents (source_id, collection_id, chunk_index, title, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-			sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, string(metaJSON),
-		)
+	err = inTx(conn, func(tx *sql.Tx) error {
+		sourceID, err := upsertSource(tx, collectionID, sourcePath, sourceType, contentHash, book.LastModified)
+		if err != nil {
+			return err
+		}
+		w, err := db.NewDocumentWriter(tx)
 		if err != nil {
-			return "", fmt.Errorf("insert document: %w", err)
+			return err
+		}
+		defer w.Close()
+
+		for i, c := range chunks {
+			metaJSON, _ := json.Marshal(c.Metadata)
+			if err := w.Insert(sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, string(metaJSON), vecs[i]); err != nil {
+				return err
+			}
 		}
-		docID, _ := res.LastInsertId()
-		vecBytes := embeddings.SerializeFloat32(vecs[i])
-		_ = db.InsertEmbedding(conn, docID, vecBytes)
+		return nil
+	})
+	if err != nil {
+		return "", err
 	}
 
-	_ = now // used by upsertSource internally
 	slog.Info("indexed book", "title", book.Title, "type", sourceType, "chunks", len(chunks))
 	return "indexed", nil
 }
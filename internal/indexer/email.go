@@ -13,7 +13,6 @@ import (
 	"github.com/sebastianhutter/local-rag-go/internal/chunker"
 	"github.com/sebastianhutter/local-rag-go/internal/config"
 	"github.com/sebastianhutter/local-rag-go/internal/db"
-	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 	"github.com/sebastianhutter/local-rag-go/internal/parser"
 )
 
@@ -26,7 +25,7 @@ const (
 func IndexEmails(conn *sql.DB, cfg *config.Config, force bool, progress ProgressCallback) *IndexResult {
 	result := &IndexResult{}
 
-	basePath := expandPath(cfg.EmclientDBPath)
+	basePath := config.ExpandPath(cfg.EmclientDBPath)
 
 	// Check if base path is itself an account dir
 	var accountDirs []string
@@ -161,7 +160,7 @@ func indexSingleEmail(conn *sql.DB, cfg *config.Config, collectionID int64, emai
 		texts[i] = c.Text
 	}
 
-	vecs, err := embed(texts, cfg)
+	vecs, err := embed(conn, texts, cfg)
 	if err != nil {
 		return 0, fmt.Errorf("embeddings: %w", err)
 	}
@@ -176,34 +175,39 @@ func indexSingleEmail(conn *sql.DB, cfg *config.Config, collectionID int64, emai
 
 	now := time.Now().UTC().Format(time.RFC3339)
 
-	// Delete existing source if re-indexing
-	conn.Exec("DELETE FROM sources WHERE collection_id = ? AND source_path = ?",
-		collectionID, email.MessageID)
+	err = inTx(conn, func(tx *sql.Tx) error {
+		// Delete existing source if re-indexing
+		tx.Exec("DELETE FROM sources WHERE collection_id = ? AND source_path = ?",
+			collectionID, email.MessageID)
 
-	res, err := conn.Exec(
-		"INSERT INTO sources (collection_id, source_type, source_path, last_indexed_at) VALUES (?, 'email', ?, ?)",
-		collectionID, email.MessageID, now,
-	)
-	if err != nil {
-		return 0, fmt.Errorf("insert source: %w", err)
-	}
-	sourceID, _ := res.LastInsertId()
-
-	for i, c := range chunks {
-		title := email.Subject
-		if title == "" {
-			title = "(no subject)"
-		}
-		docRes, err := conn.Exec(
-			"INSERT INTO documents (source_id, collection_id, chunk_index, title, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-			sourceID, collectionID, c.ChunkIndex, title, c.Text, string(metaJSON),
+		res, err := tx.Exec(
+			"INSERT INTO sources (collection_id, source_type, source_path, last_indexed_at) VALUES (?, 'email', ?, ?)",
+			collectionID, email.MessageID, now,
 		)
 		if err != nil {
-			return 0, fmt.Errorf("insert document: %w", err)
+			return fmt.Errorf("insert source: %w", err)
 		}
-		docID, _ := docRes.LastInsertId()
-		vecBytes := embeddings.SerializeFloat32(vecs[i])
-		_ = db.InsertEmbedding(conn, docID, vecBytes)
+		sourceID, _ := res.LastInsertId()
+
+		w, err := db.NewDocumentWriter(tx)
+		if err != nil {
+			return err
+		}
+		defer w.Close()
+
+		for i, c := range chunks {
+			title := email.Subject
+			if title == "" {
+				title = "(no subject)"
+			}
+			if err := w.Insert(sourceID, collectionID, c.ChunkIndex, title, c.Text, string(metaJSON), vecs[i]); err != nil {
+				return err
+			}
+		}
+		return nil
+	})
+	if err != nil {
+		return 0, err
 	}
 
 	return len(chunks), nil
@@ -1,21 +1,23 @@
 package indexer
 
 import (
+	"container/list"
 	"database/sql"
 	"encoding/json"
 	"fmt"
 	"log/slog"
+	"maps"
 	"os"
 	"os/exec"
 	"path/filepath"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/sebastianhutter/local-rag-go/internal/chunker"
 	"github.com/sebastianhutter/local-rag-go/internal/config"
 	"github.com/sebastianhutter/local-rag-go/internal/db"
-	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 	"github.com/sebastianhutter/local-rag-go/internal/parser"
 )
 
@@ -217,7 +219,7 @@ func indexCodeFile(conn *sql.DB, cfg *config.Config, repoPath, relPath string, c
 		texts[i] = c.Text
 	}
 
-	vecs, err := embed(texts, cfg)
+	vecs, err := embed(conn, texts, cfg)
 	if err != nil {
 		return false, fmt.Errorf("embeddings: %w", err)
 	}
@@ -228,23 +230,27 @@ func indexCodeFile(conn *sql.DB, cfg *config.Config, repoPath, relPath string, c
 		mtime = info.ModTime().UTC().Format(time.RFC3339)
 	}
 
-	sourceID, err := upsertSource(conn, collectionID, absPath, "code", fh, mtime)
-	if err != nil {
-		return false, err
-	}
-
-	for i, c := range chunks {
-		metaJSON, _ := json.Marshal(c.Metadata)
-		res, err := conn.Exec(
-			"INSERT INTO documents (source_id, collection_id, chunk_index, title, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-			sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, string(metaJSON),
-		)
+	err = inTx(conn, func(tx *sql.Tx) error {
+		sourceID, err := upsertSource(tx, collectionID, absPath, "code", fh, mtime)
 		if err != nil {
-			return false, fmt.Errorf("insert document: %w", err)
+			return err
 		}
-		docID, _ := res.LastInsertId()
-		vecBytes := embeddings.SerializeFloat32(vecs[i])
-		_ = db.InsertEmbedding(conn, docID, vecBytes)
+		w, err := db.NewDocumentWriter(tx)
+		if err != nil {
+			return err
+		}
+		defer w.Close()
+
+		for i, c := range chunks {
+			metaJSON, _ := json.Marshal(c.Metadata)
+			if err := w.Insert(sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, string(metaJSON), vecs[i]); err != nil {
+				return err
+			}
+		}
+		return nil
+	})
+	if err != nil {
+		return false, err
 	}
 
 	slog.Info("indexed code file", "path", relPath, "chunks", len(chunks))
@@ -366,7 +372,7 @@ func indexGitHistory(conn *sql.DB, cfg *config.Config, repoPath string, collecti
 			texts[j] = c.Text
 		}
 
-		vecs, err := embed(texts, cfg)
+		vecs, err := embed(conn, texts, cfg)
 		if err != nil {
 			slog.Error("error embedding commit", "sha", commit.SHA[:12], "err", err)
 			result.Errors++
@@ -374,30 +380,35 @@ func indexGitHistory(conn *sql.DB, cfg *config.Config, repoPath string, collecti
 		}
 
 		now := time.Now().UTC().Format(time.RFC3339)
-		res, err := conn.Exec(
-			"INSERT INTO sources (collection_id, source_type, source_path, file_hash, file_modified_at, last_indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
-			collectionID, "commit", sourcePath, commit.SHA, commit.AuthorDate, now,
-		)
+		err = inTx(conn, func(tx *sql.Tx) error {
+			res, err := tx.Exec(
+				"INSERT INTO sources (collection_id, source_type, source_path, file_hash, file_modified_at, last_indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+				collectionID, "commit", sourcePath, commit.SHA, commit.AuthorDate, now,
+			)
+			if err != nil {
+				return err
+			}
+			sourceID, _ := res.LastInsertId()
+
+			w, err := db.NewDocumentWriter(tx)
+			if err != nil {
+				return err
+			}
+			defer w.Close()
+
+			for j, c := range chunks {
+				metaJSON, _ := json.Marshal(c.Metadata)
+				if err := w.Insert(sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, string(metaJSON), vecs[j]); err != nil {
+					return err
+				}
+			}
+			return nil
+		})
 		if err != nil {
 			slog.Error("error inserting commit source", "sha", commit.SHA[:12], "err", err)
 			result.Errors++
 			continue
 		}
-		sourceID, _ := res.LastInsertId()
-
-		for j, c := range chunks {
-			metaJSON, _ := json.Marshal(c.Metadata)
-			docRes, err := conn.Exec(
-				"INSERT INTO documents (source_id, collection_id, chunk_index, title, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-				sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, string(metaJSON),
-			)
-			if err != nil {
-				continue
-			}
-			docID, _ := docRes.LastInsertId()
-			vecBytes := embeddings.SerializeFloat32(vecs[j])
-			_ = db.InsertEmbedding(conn, docID, vecBytes)
-		}
 
 		result.Indexed++
 		slog.Info("indexed commit",
@@ -643,10 +654,76 @@ func shouldExclude(relPath string) bool {
 	return false
 }
 
+// watermarkCache memoizes decoded watermark descriptions, keyed by the
+// description string itself. Every repo in a code group reads the group's
+// watermark JSON, and the next repo reads exactly what the previous one
+// wrote, so makeWatermarks seeds the cache with its own output. The cache
+// lives for the whole process, so the GUI and MCP server also hit it across
+// repeated index runs.
+var watermarkCache struct {
+	mu      sync.Mutex
+	entries map[string]*list.Element
+	lru     list.List // of *watermarkEntry, most recently used first
+}
+
+type watermarkEntry struct {
+	description string
+	watermarks  map[string]string
+}
+
+// maxWatermarkCacheEntries bounds watermarkCache; the least recently used
+// entry is evicted once it is exceeded.
+const maxWatermarkCacheEntries = 128
+
+func cacheWatermarks(description string, watermarks map[string]string) {
+	watermarkCache.mu.Lock()
+	defer watermarkCache.mu.Unlock()
+	if el, ok := watermarkCache.entries[description]; ok {
+		el.Value.(*watermarkEntry).watermarks = maps.Clone(watermarks)
+		watermarkCache.lru.MoveToFront(el)
+		return
+	}
+	if watermarkCache.entries == nil {
+		watermarkCache.entries = make(map[string]*list.Element)
+	}
+	watermarkCache.entries[description] = watermarkCache.lru.PushFront(&watermarkEntry{description, maps.Clone(watermarks)})
+	if watermarkCache.lru.Len() > maxWatermarkCacheEntries {
+		oldest := watermarkCache.lru.Back()
+		watermarkCache.lru.Remove(oldest)
+		delete(watermarkCache.entries, oldest.Value.(*watermarkEntry).description)
+	}
+}
+
+// cachedWatermarks returns a copy of the cached decoding of description and
+// marks it most recently used.
+func cachedWatermarks(description string) (map[string]string, bool) {
+	watermarkCache.mu.Lock()
+	defer watermarkCache.mu.Unlock()
+	el, ok := watermarkCache.entries[description]
+	if !ok {
+		return nil, false
+	}
+	watermarkCache.lru.MoveToFront(el)
+	return maps.Clone(el.Value.(*watermarkEntry).watermarks), true
+}
+
+// parseWatermarks decodes a collection description into a repo → SHA map.
+// The returned map is always a fresh copy that the caller may modify.
 func parseWatermarks(description string) map[string]string {
 	if description == "" {
 		return map[string]string{}
 	}
+
+	if cached, ok := cachedWatermarks(description); ok {
+		return cached
+	}
+
+	watermarks := decodeWatermarks(description)
+	cacheWatermarks(description, watermarks)
+	return watermarks
+}
+
+func decodeWatermarks(description string) map[string]string {
 	if strings.HasPrefix(description, "{") {
 		var data map[string]string
 		if err := json.Unmarshal([]byte(description), &data); err == nil {
@@ -664,7 +741,9 @@ func parseWatermarks(description string) map[string]string {
 
 func makeWatermarks(watermarks map[string]string) string {
 	b, _ := json.Marshal(watermarks)
-	return string(b)
+	description := string(b)
+	cacheWatermarks(description, watermarks)
+	return description
 }
 
 // DiscoverGitRepos returns all git repository root paths at or under root.
@@ -1,6 +1,7 @@
 package indexer
 
 import (
+	"fmt"
 	"os"
 	"os/exec"
 	"path/filepath"
@@ -78,6 +79,62 @@ func TestMakeWatermarks(t *testing.T) {
 	}
 }
 
+func TestParseWatermarksReturnsCopy(t *testing.T) {
+	desc := makeWatermarks(map[string]string{"/path/repo": "abc123"})
+
+	first := parseWatermarks(desc)
+	first["/path/repo"] = "changed"
+	first["/path/other"] = "def456"
+
+	second := parseWatermarks(desc)
+	if second["/path/repo"] != "abc123" {
+		t.Errorf("cached watermarks were mutated: got %q", second["/path/repo"])
+	}
+	if _, ok := second["/path/other"]; ok {
+		t.Error("cached watermarks gained a key from a previous caller")
+	}
+}
+
+func TestWatermarkCacheEvictsLeastRecentlyUsed(t *testing.T) {
+	hot := makeWatermarks(map[string]string{"/lru/hot": "sha"})
+	for i := 0; i < maxWatermarkCacheEntries; i++ {
+		// Reading the hot entry keeps it ahead of every newer one.
+		parseWatermarks(hot)
+		makeWatermarks(map[string]string{fmt.Sprintf("/lru/%d", i): "sha"})
+	}
+
+	watermarkCache.mu.Lock()
+	_, stillCached := watermarkCache.entries[hot]
+	watermarkCache.mu.Unlock()
+	if !stillCached {
+		t.Error("expected a recently read entry to survive eviction")
+	}
+}
+
+func TestWatermarkCacheEvictsOldest(t *testing.T) {
+	first := makeWatermarks(map[string]string{"/evict/0": "sha"})
+	for i := 1; i <= maxWatermarkCacheEntries; i++ {
+		makeWatermarks(map[string]string{fmt.Sprintf("/evict/%d", i): "sha"})
+	}
+
+	watermarkCache.mu.Lock()
+	_, stillCached := watermarkCache.entries[first]
+	size := len(watermarkCache.entries)
+	watermarkCache.mu.Unlock()
+
+	if stillCached {
+		t.Error("expected oldest entry to be evicted")
+	}
+	if size > maxWatermarkCacheEntries {
+		t.Errorf("cache holds %d entries, want at most %d", size, maxWatermarkCacheEntries)
+	}
+
+	// Evicted descriptions still decode correctly.
+	if wm := parseWatermarks(first); wm["/evict/0"] != "sha" {
+		t.Errorf("got %v after eviction", wm)
+	}
+}
+
 func TestShouldIndexFile(t *testing.T) {
 	tests := []struct {
 		path  string
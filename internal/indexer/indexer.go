@@ -34,9 +34,55 @@ func getOrCreate(conn *sql.DB, name, collType string) int64 {
 	return id
 }
 
-// embed wraps embeddings.GetEmbeddings for convenience.
-func embed(texts []string, cfg *config.Config) ([][]float32, error) {
-	return embeddings.GetEmbeddings(context.Background(), texts, cfg.EmbeddingModel)
+// embed returns serialized float32 embeddings for texts, serving unchanged
+// chunks from the embedding cache and sending only the misses to Ollama.
+// Cache failures are logged and fall back to embedding everything.
+//
+// The result is already in the vec0 wire format: cached blobs pass straight
+// through to InsertEmbedding, and fresh vectors are serialized once for both
+// the cache and the insert.
+func embed(conn *sql.DB, texts []string, cfg *config.Config) ([][]byte, error) {
+	model := cfg.EmbeddingModel
+	keys := make([][]byte, len(texts))
+	for i, t := range texts {
+		keys[i] = embeddings.CacheKey(model, t)
+	}
+
+	blobs, err := db.GetCachedEmbeddings(conn, keys)
+	if err != nil {
+		slog.Warn("embedding cache lookup failed", "err", err)
+		blobs = make([][]byte, len(texts))
+	}
+
+	var missIdx []int
+	var missTexts []string
+	for i, blob := range blobs {
+		if blob == nil {
+			missIdx = append(missIdx, i)
+			missTexts = append(missTexts, texts[i])
+		}
+	}
+	if len(missTexts) == 0 {
+		return blobs, nil
+	}
+	slog.Debug("embedding cache", "hits", len(texts)-len(missTexts), "misses", len(missTexts))
+
+	fresh, err := embeddings.GetEmbeddings(context.Background(), missTexts, model)
+	if err != nil {
+		return nil, err
+	}
+
+	missKeys := make([][]byte, len(missIdx))
+	missBlobs := make([][]byte, len(missIdx))
+	for j, i := range missIdx {
+		blobs[i] = embeddings.SerializeFloat32(fresh[j])
+		missKeys[j] = keys[i]
+		missBlobs[j] = blobs[i]
+	}
+	if err := db.CacheEmbeddings(conn, missKeys, missBlobs); err != nil {
+		slog.Warn("embedding cache store failed", "err", err)
+	}
+	return blobs, nil
 }
 
 // ProgressCallback is called per item with (current, total, itemName).
@@ -213,9 +259,28 @@ func parseAndChunk(path, sourceType string, cfg *config.Config) []chunker.Chunk
 	return nil
 }
 
+// inTx runs fn in a transaction, committing if it returns nil. Indexers write
+// a source row, its documents and their vectors through one transaction, so
+// each item is stored atomically and costs one commit instead of one per
+// statement (each of which also fires the FTS trigger).
+func inTx(conn *sql.DB, fn func(tx *sql.Tx) error) error {
+	tx, err := conn.Begin()
+	if err != nil {
+		return fmt.Errorf("begin tx: %w", err)
+	}
+	if err := fn(tx); err != nil {
+		_ = tx.Rollback()
+		return err
+	}
+	if err := tx.Commit(); err != nil {
+		return fmt.Errorf("commit tx: %w", err)
+	}
+	return nil
+}
+
 // upsertSource inserts or updates a source row and deletes old documents/vectors.
 // Returns the source ID.
-func upsertSource(conn *sql.DB, collectionID int64, sourcePath, sourceType, fileH, mtime string) (int64, error) {
+func upsertSource(conn db.Querier, collectionID int64, sourcePath, sourceType, fileH, mtime string) (int64, error) {
 	now := time.Now().UTC().Format(time.RFC3339)
 
 	var existingID sql.NullInt64
@@ -246,7 +311,7 @@ func upsertSource(conn *sql.DB, collectionID int64, sourcePath, sourceType, file
 }
 
 // deleteOldDocs removes documents and their vector entries for a source.
-func deleteOldDocs(conn *sql.DB, sourceID int64) {
+func deleteOldDocs(conn db.Querier, sourceID int64) {
 	rows, err := conn.Query("SELECT id FROM documents WHERE source_id = ?", sourceID)
 	if err != nil {
 		return
@@ -271,21 +336,14 @@ func deleteOldDocs(conn *sql.DB, sourceID int64) {
 	conn.Exec("DELETE FROM documents WHERE source_id = ?", sourceID)
 }
 
-// insertChunks embeds chunks and inserts them into documents + vec_documents.
-func insertChunks(conn *sql.DB, sourceID, collectionID int64, chunks []chunker.Chunk, cfg *config.Config) error {
-	if len(chunks) == 0 {
-		return nil
-	}
-
-	texts := make([]string, len(chunks))
-	for i, c := range chunks {
-		texts[i] = c.Text
-	}
-
-	vecs, err := embed(texts, cfg)
+// insertChunks inserts chunks and their serialized embeddings (vecs,
+// index-aligned, as returned by embed) into documents + vec_documents.
+func insertChunks(tx *sql.Tx, sourceID, collectionID int64, chunks []chunker.Chunk, vecs [][]byte) error {
+	w, err := db.NewDocumentWriter(tx)
 	if err != nil {
-		return fmt.Errorf("embeddings: %w", err)
+		return err
 	}
+	defer w.Close()
 
 	for i, c := range chunks {
 		metaJSON := ""
@@ -293,18 +351,7 @@ func insertChunks(conn *sql.DB, sourceID, collectionID int64, chunks []chunker.C
 			b, _ := json.Marshal(c.Metadata)
 			metaJSON = string(b)
 		}
-
-		res, err := conn.Exec(
-			"INSERT INTO documents (source_id, collection_id, chunk_index, title, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-			sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, metaJSON,
-		)
-		if err != nil {
-			return fmt.Errorf("insert document: %w", err)
-		}
-		docID, _ := res.LastInsertId()
-
-		vecBytes := embeddings.SerializeFloat32(vecs[i])
-		if err := db.InsertEmbedding(conn, docID, vecBytes); err != nil {
+		if err := w.Insert(sourceID, collectionID, c.ChunkIndex, c.Title, c.Text, metaJSON, vecs[i]); err != nil {
 			return err
 		}
 	}
@@ -352,21 +399,34 @@ func indexSingleFile(conn *sql.DB, cfg *config.Config, filePath string, collecti
 
 	slog.Debug("embedding chunks", "path", filepath.Base(filePath), "chunks", len(chunks))
 
+	// Embed before opening the write transaction: it is the slow part and
+	// must not hold the database's write lock.
+	texts := make([]string, len(chunks))
+	for i, c := range chunks {
+		texts[i] = c.Text
+	}
+	vecs, err := embed(conn, texts, cfg)
+	if err != nil {
+		return false, fmt.Errorf("embeddings: %w", err)
+	}
+
 	info, _ := os.Stat(filePath)
 	mtime := ""
 	if info != nil {
 		mtime = info.ModTime().UTC().Format(time.RFC3339)
 	}
 
-	sourceID, err := upsertSource(conn, collectionID, absPath, sourceType, fh, mtime)
+	err = inTx(conn, func(tx *sql.Tx) error {
+		sourceID, err := upsertSource(tx, collectionID, absPath, sourceType, fh, mtime)
+		if err != nil {
+			return err
+		}
+		return insertChunks(tx, sourceID, collectionID, chunks, vecs)
+	})
 	if err != nil {
 		return false, err
 	}
 
-	if err := insertChunks(conn, sourceID, collectionID, chunks, cfg); err != nil {
-		return false, err
-	}
-
 	slog.Info("indexed file", "path", filepath.Base(filePath), "type", sourceType, "chunks", len(chunks))
 	return true, nil
 }
@@ -2,6 +2,7 @@ package indexer
 
 import (
 	"database/sql"
+	"errors"
 	"os"
 	"path/filepath"
 	"testing"
@@ -146,6 +147,28 @@ func TestUpsertSource(t *testing.T) {
 	}
 }
 
+func TestInTxRollsBackOnError(t *testing.T) {
+	conn := setupTestDB(t)
+	collID := getOrCreate(conn, "test", "project")
+
+	errBoom := errors.New("boom")
+	err := inTx(conn, func(tx *sql.Tx) error {
+		if _, err := upsertSource(tx, collID, "/file.md", "markdown", "hash123", ""); err != nil {
+			return err
+		}
+		return errBoom
+	})
+	if !errors.Is(err, errBoom) {
+		t.Fatalf("inTx err = %v, want %v", err, errBoom)
+	}
+
+	var count int
+	conn.QueryRow("SELECT COUNT(*) FROM sources").Scan(&count)
+	if count != 0 {
+		t.Errorf("sources after rollback = %d, want 0", count)
+	}
+}
+
 func TestIsSourceUnchanged(t *testing.T) {
 	conn := setupTestDB(t)
 	collID := getOrCreate(conn, "test", "project")
@@ -236,26 +259,6 @@ func TestIndexResultMerge(t *testing.T) {
 	}
 }
 
-func TestExpandPath(t *testing.T) {
-	home, _ := os.UserHomeDir()
-
-	tests := []struct {
-		input    string
-		contains string
-	}{
-		{"~/Documents", filepath.Join(home, "Documents")},
-		{"/absolute/path", "/absolute/path"},
-		{"relative/path", "relative/path"},
-	}
-
-	for _, tt := range tests {
-		got := expandPath(tt.input)
-		if got != tt.contains {
-			t.Errorf("expandPath(%q) = %q, want %q", tt.input, got, tt.contains)
-		}
-	}
-}
-
 func TestTruncate(t *testing.T) {
 	if got := truncate("short", 10); got != "short" {
 		t.Errorf("expected 'short', got %q", got)
@@ -29,7 +29,7 @@ func IndexObsidian(conn *sql.DB, cfg *config.Config, force bool, progress Progre
 
 	var allFiles []string
 	for _, vault := range cfg.ObsidianVaults {
-		vault = expandPath(vault)
+		vault = config.ExpandPath(vault)
 		info, err := os.Stat(vault)
 		if err != nil || !info.IsDir() {
 			slog.Warn("vault path does not exist or is not a directory", "path", vault)
@@ -87,11 +87,3 @@ func walkVault(vaultPath string, excludeFolders map[string]bool) []string {
 	})
 	return results
 }
-
-func expandPath(p string) string {
-	if strings.HasPrefix(p, "~/") {
-		home, _ := os.UserHomeDir()
-		return filepath.Join(home, p[2:])
-	}
-	return p
-}
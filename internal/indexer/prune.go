@@ -9,6 +9,7 @@ import (
 
 	"github.com/sebastianhutter/local-rag-go/internal/config"
 	"github.com/sebastianhutter/local-rag-go/internal/db"
+	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 	"github.com/sebastianhutter/local-rag-go/internal/parser"
 )
 
@@ -60,12 +61,29 @@ func PruneAll(conn *sql.DB, cfg *config.Config) *PruneResult {
 		result.Merge(r)
 	}
 
+	PruneEmbeddingCache(conn, cfg)
+
 	if result.Pruned > 0 {
 		slog.Info("prune all complete", "result", result.String())
 	}
 	return result
 }
 
+// PruneEmbeddingCache drops embedding cache entries that no indexed chunk
+// uses under the configured model. Prunes and re-indexing leave entries
+// behind, so this runs after whole-database passes.
+// Failures are only logged: the cache is an optimization.
+func PruneEmbeddingCache(conn *sql.DB, cfg *config.Config) {
+	n, err := db.PruneEmbeddingCache(conn, embeddings.CacheKeyFunc(cfg.EmbeddingModel))
+	if err != nil {
+		slog.Warn("embedding cache prune failed", "err", err)
+		return
+	}
+	if n > 0 {
+		slog.Info("pruned embedding cache", "entries", n)
+	}
+}
+
 // PruneCollection prunes stale sources from a single named collection.
 func PruneCollection(conn *sql.DB, cfg *config.Config, collectionName string) *PruneResult {
 	var id int64
@@ -138,7 +156,7 @@ func pruneFileSources(conn *sql.DB, collectionID int64) *PruneResult {
 func pruneEmailSources(conn *sql.DB, cfg *config.Config, collectionID int64) *PruneResult {
 	result := &PruneResult{}
 
-	basePath := expandPath(cfg.EmclientDBPath)
+	basePath := config.ExpandPath(cfg.EmclientDBPath)
 
 	var accountDirs []string
 	if fileExists(filepath.Join(basePath, "mail_index.dat")) {
@@ -188,7 +206,7 @@ func pruneEmailSources(conn *sql.DB, cfg *config.Config, collectionID int64) *Pr
 func pruneRSSSources(conn *sql.DB, cfg *config.Config, collectionID int64) *PruneResult {
 	result := &PruneResult{}
 
-	basePath := expandPath(cfg.NetnewswireDBPath)
+	basePath := config.ExpandPath(cfg.NetnewswireDBPath)
 
 	var accountDirs []string
 	if fileExists(filepath.Join(basePath, "DB.sqlite3")) {
@@ -246,7 +264,7 @@ func pruneCalibreSources(conn *sql.DB, cfg *config.Config, collectionID int64) *
 	currentBooks := make(map[bookKey]bool)
 
 	for _, lib := range cfg.CalibreLibraries {
-		lib = expandPath(lib)
+		lib = config.ExpandPath(lib)
 		books, err := parser.ParseCalibreLibrary(lib)
 		if err != nil {
 			slog.Warn("prune calibre: cannot read Calibre library, skipping prune", "path", lib, "err", err)
@@ -274,7 +292,7 @@ func pruneCalibreSources(conn *sql.DB, cfg *config.Config, collectionID int64) *
 			// Find the book by checking all libraries
 			found := false
 			for _, lib := range cfg.CalibreLibraries {
-				lib = expandPath(lib)
+				lib = config.ExpandPath(lib)
 				if strings.HasPrefix(rest, lib+"/") {
 					relPath := rest[len(lib)+1:]
 					if currentBooks[bookKey{lib, relPath}] {
@@ -12,7 +12,6 @@ import (
 	"github.com/sebastianhutter/local-rag-go/internal/chunker"
 	"github.com/sebastianhutter/local-rag-go/internal/config"
 	"github.com/sebastianhutter/local-rag-go/internal/db"
-	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 	"github.com/sebastianhutter/local-rag-go/internal/parser"
 )
 
@@ -20,7 +19,7 @@ import (
 func IndexRSS(conn *sql.DB, cfg *config.Config, force bool, progress ProgressCallback) *IndexResult {
 	result := &IndexResult{}
 
-	basePath := expandPath(cfg.NetnewswireDBPath)
+	basePath := config.ExpandPath(cfg.NetnewswireDBPath)
 
 	var accountDirs []string
 	if fileExists(filepath.Join(basePath, "DB.sqlite3")) {
@@ -154,7 +153,7 @@ func indexSingleArticle(conn *sql.DB, cfg *config.Config, collectionID int64, ar
 		texts[i] = c.Text
 	}
 
-	vecs, err := embed(texts, cfg)
+	vecs, err := embed(conn, texts, cfg)
 	if err != nil {
 		return 0, fmt.Errorf("embeddings: %w", err)
 	}
@@ -174,33 +173,38 @@ func indexSingleArticle(conn *sql.DB, cfg *config.Config, collectionID int64, ar
 
 	now := time.Now().UTC().Format(time.RFC3339)
 
-	conn.Exec("DELETE FROM sources WHERE collection_id = ? AND source_path = ?",
-		collectionID, article.ArticleID)
+	err = inTx(conn, func(tx *sql.Tx) error {
+		tx.Exec("DELETE FROM sources WHERE collection_id = ? AND source_path = ?",
+			collectionID, article.ArticleID)
 
-	res, err := conn.Exec(
-		"INSERT INTO sources (collection_id, source_type, source_path, last_indexed_at) VALUES (?, 'rss', ?, ?)",
-		collectionID, article.ArticleID, now,
-	)
-	if err != nil {
-		return 0, fmt.Errorf("insert source: %w", err)
-	}
-	sourceID, _ := res.LastInsertId()
-
-	for i, c := range chunks {
-		title := article.Title
-		if title == "" {
-			title = "(no title)"
-		}
-		docRes, err := conn.Exec(
-			"INSERT INTO documents (source_id, collection_id, chunk_index, title, content, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-			sourceID, collectionID, c.ChunkIndex, title, c.Text, string(metaJSON),
+		res, err := tx.Exec(
+			"INSERT INTO sources (collection_id, source_type, source_path, last_indexed_at) VALUES (?, 'rss', ?, ?)",
+			collectionID, article.ArticleID, now,
 		)
 		if err != nil {
-			return 0, fmt.Errorf("insert document: %w", err)
+			return fmt.Errorf("insert source: %w", err)
+		}
+		sourceID, _ := res.LastInsertId()
+
+		w, err := db.NewDocumentWriter(tx)
+		if err != nil {
+			return err
 		}
-		docID, _ := docRes.LastInsertId()
-		vecBytes := embeddings.SerializeFloat32(vecs[i])
-		_ = db.InsertEmbedding(conn, docID, vecBytes)
+		defer w.Close()
+
+		for i, c := range chunks {
+			title := article.Title
+			if title == "" {
+				title = "(no title)"
+			}
+			if err := w.Insert(sourceID, collectionID, c.ChunkIndex, title, c.Text, string(metaJSON), vecs[i]); err != nil {
+				return err
+			}
+		}
+		return nil
+	})
+	if err != nil {
+		return 0, err
 	}
 
 	return len(chunks), nil
@@ -19,17 +19,17 @@ import (
 	"github.com/sebastianhutter/local-rag-go/internal/search"
 )
 
+// openDB loads the config and returns the shared database handle for it
+// (see db.Shared). The MCP server is long-lived, so opening the database
+// and re-running InitSchema per call would repeat the same work for every
+// request. Callers must not close the returned *sql.DB.
 func openDB() (*config.Config, *sql.DB, error) {
 	cfg, err := config.Load("")
 	if err != nil {
 		return nil, nil, fmt.Errorf("load config: %w", err)
 	}
-	conn, err := db.Open(cfg.ExpandedDBPath())
+	conn, err := db.Shared(cfg.ExpandedDBPath(), cfg.EmbeddingDimensions)
 	if err != nil {
-		return nil, nil, fmt.Errorf("open database: %w", err)
-	}
-	if err := db.InitSchema(conn, cfg.EmbeddingDimensions); err != nil {
-		conn.Close()
 		return nil, nil, err
 	}
 	return cfg, conn, nil
@@ -47,7 +47,6 @@ func handleRagSearch(ctx context.Context, request mcp.CallToolRequest) (*mcp.Cal
 	if err != nil {
 		return mcp.NewToolResultError(err.Error()), nil
 	}
-	defer conn.Close()
 
 	topK := request.GetInt("top_k", 10)
 
@@ -105,7 +104,6 @@ func handleRagListCollections(ctx context.Context, request mcp.CallToolRequest)
 	if err != nil {
 		return mcp.NewToolResultError(err.Error()), nil
 	}
-	defer conn.Close()
 
 	rows, err := conn.Query(`
 		SELECT c.name, c.collection_type, c.description, c.created_at,
@@ -158,7 +156,6 @@ func handleRagIndex(ctx context.Context, request mcp.CallToolRequest) (*mcp.Call
 	if err != nil {
 		return mcp.NewToolResultError(err.Error()), nil
 	}
-	defer conn.Close()
 
 	if !cfg.IsCollectionEnabled(collection) {
 		return mcp.NewToolResultError(fmt.Sprintf("collection %q is disabled in config", collection)), nil
@@ -209,7 +206,6 @@ func handleRagPrune(ctx context.Context, request mcp.CallToolRequest) (*mcp.Call
 	if err != nil {
 		return mcp.NewToolResultError(err.Error()), nil
 	}
-	defer conn.Close()
 
 	collection := request.GetString("collection", "")
 
@@ -250,27 +246,15 @@ func handleRagCollectionInfo(ctx context.Context, request mcp.CallToolRequest) (
 	if err != nil {
 		return mcp.NewToolResultError(err.Error()), nil
 	}
-	defer conn.Close()
 
-	var id int64
-	var collType, createdAt string
-	var description sql.NullString
-	err = conn.QueryRow("SELECT id, collection_type, created_at, description FROM collections WHERE name = ?", collection).
-		Scan(&id, &collType, &createdAt, &description)
+	info, err := db.CollectionInfo(conn, collection)
 	if err != nil {
-		return mcp.NewToolResultError(fmt.Sprintf("collection %q not found", collection)), nil
+		return mcp.NewToolResultError(err.Error()), nil
 	}
 
-	var sourceCount, chunkCount int
-	conn.QueryRow("SELECT COUNT(*) FROM sources WHERE collection_id = ?", id).Scan(&sourceCount)
-	conn.QueryRow("SELECT COUNT(*) FROM documents WHERE collection_id = ?", id).Scan(&chunkCount)
-
-	var lastIndexed sql.NullString
-	conn.QueryRow("SELECT MAX(last_indexed_at) FROM sources WHERE collection_id = ?", id).Scan(&lastIndexed)
-
 	// Source type breakdown
 	sourceTypes := map[string]int{}
-	typeRows, err := conn.Query("SELECT source_type, COUNT(*) FROM sources WHERE collection_id = ? GROUP BY source_type", id)
+	typeRows, err := conn.Query("SELECT source_type, COUNT(*) FROM sources WHERE collection_id = ? GROUP BY source_type", info.ID)
 	if err == nil {
 		defer typeRows.Close()
 		for typeRows.Next() {
@@ -283,7 +267,7 @@ func handleRagCollectionInfo(ctx context.Context, request mcp.CallToolRequest) (
 
 	// Sample titles
 	var sampleTitles []string
-	titleRows, err := conn.Query("SELECT DISTINCT title FROM documents WHERE collection_id = ? AND title IS NOT NULL LIMIT 10", id)
+	titleRows, err := conn.Query("SELECT DISTINCT title FROM documents WHERE collection_id = ? AND title IS NOT NULL LIMIT 10", info.ID)
 	if err == nil {
 		defer titleRows.Close()
 		for titleRows.Next() {
@@ -295,18 +279,18 @@ func handleRagCollectionInfo(ctx context.Context, request mcp.CallToolRequest) (
 
 	output := map[string]any{
 		"name":          collection,
-		"type":          collType,
-		"created_at":    createdAt,
-		"source_count":  sourceCount,
-		"chunk_count":   chunkCount,
+		"type":          info.Type,
+		"created_at":    info.CreatedAt,
+		"source_count":  info.SourceCount,
+		"chunk_count":   info.ChunkCount,
 		"source_types":  sourceTypes,
 		"sample_titles": sampleTitles,
 	}
-	if description.Valid {
-		output["description"] = description.String
+	if info.Description.Valid {
+		output["description"] = info.Description.String
 	}
-	if lastIndexed.Valid {
-		output["last_indexed"] = lastIndexed.String
+	if info.LastIndexed.Valid {
+		output["last_indexed"] = info.LastIndexed.String
 	}
 
 	data, _ := json.MarshalIndent(output, "", "  ")
@@ -6,6 +6,7 @@ import (
 	"os"
 	"path/filepath"
 	"strings"
+	"sync"
 
 	sitter "github.com/smacker/go-tree-sitter"
 	"github.com/smacker/go-tree-sitter/bash"
@@ -110,28 +111,47 @@ var splitNodeTypes = map[string]map[string]bool{
 	"bash":       {"function_definition": true},
 }
 
-// languageMap maps language names to tree-sitter Language objects.
-var languageMap = map[string]*sitter.Language{
-	"python":     python.GetLanguage(),
-	"go":         tsgo.GetLanguage(),
-	"hcl":        tshcl.GetLanguage(),
-	"typescript": tsts.GetLanguage(),
-	"tsx":        tsx.GetLanguage(),
-	"javascript": javascript.GetLanguage(),
-	"rust":       rust.GetLanguage(),
-	"java":       java.GetLanguage(),
-	"c":          c.GetLanguage(),
-	"cpp":        cpp.GetLanguage(),
-	"csharp":     csharp.GetLanguage(),
-	"ruby":       ruby.GetLanguage(),
-	"bash":       bash.GetLanguage(),
-	"yaml":       yaml.GetLanguage(),
-	"toml":       toml.GetLanguage(),
-	"sql":        sql.GetLanguage(),
-	"html":       tshtml.GetLanguage(),
-	"css":        css.GetLanguage(),
-	"dockerfile": dockerfile.GetLanguage(),
-	"markdown":   tsmarkdown.GetLanguage(),
+// languageLoaders maps language names to tree-sitter grammar constructors.
+// Grammars are only materialized on first use (see getLanguage), so commands
+// that never parse code do not pay for them.
+var languageLoaders = map[string]func() *sitter.Language{
+	"python":     python.GetLanguage,
+	"go":         tsgo.GetLanguage,
+	"hcl":        tshcl.GetLanguage,
+	"typescript": tsts.GetLanguage,
+	"tsx":        tsx.GetLanguage,
+	"javascript": javascript.GetLanguage,
+	"rust":       rust.GetLanguage,
+	"java":       java.GetLanguage,
+	"c":          c.GetLanguage,
+	"cpp":        cpp.GetLanguage,
+	"csharp":     csharp.GetLanguage,
+	"ruby":       ruby.GetLanguage,
+	"bash":       bash.GetLanguage,
+	"yaml":       yaml.GetLanguage,
+	"toml":       toml.GetLanguage,
+	"sql":        sql.GetLanguage,
+	"html":       tshtml.GetLanguage,
+	"css":        css.GetLanguage,
+	"dockerfile": dockerfile.GetLanguage,
+	"markdown":   tsmarkdown.GetLanguage,
+}
+
+// languageCache holds grammars already built by getLanguage.
+var languageCache sync.Map // map[string]*sitter.Language
+
+// getLanguage returns the tree-sitter grammar for language, building it on
+// first use.
+func getLanguage(language string) (*sitter.Language, bool) {
+	if lang, ok := languageCache.Load(language); ok {
+		return lang.(*sitter.Language), true
+	}
+	load, ok := languageLoaders[language]
+	if !ok {
+		return nil, false
+	}
+	lang, _ := languageCache.LoadOrStore(language, load())
+	return lang.(*sitter.Language), true
 }
 
 // GetSupportedCodeExtensions returns all file extensions supported by the code parser.
@@ -189,7 +209,7 @@ func ParseCodeFile(filePath, language, relativePath string, maxWords, overlap in
 		return plainTextDoc(sourceBytes, language, relativePath, maxWords, overlap)
 	}
 
-	lang, ok := languageMap[language]
+	lang, ok := getLanguage(language)
 	if !ok {
 		slog.Warn("unsupported tree-sitter language, treating as plaintext", "language", language)
 		return plainTextDoc(sourceBytes, language, relativePath, maxWords, overlap)
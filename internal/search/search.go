@@ -13,6 +13,7 @@ import (
 	"strings"
 
 	"github.com/sebastianhutter/local-rag-go/internal/config"
+	"github.com/sebastianhutter/local-rag-go/internal/db"
 	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 )
 
@@ -94,16 +95,34 @@ type binaryCandidate struct {
 // over every stored vector on each query.
 func vectorSearch(db *sql.DB, queryEmbedding []float32, topK int, filters *Filters) ([]rankedResult, error) {
 	queryBlob := embeddings.SerializeFloat32(queryEmbedding)
-	pool := vectorCandidatePool(topK, filters)
 
-	// Stage 1: Hamming-distance KNN over the binary mirror.
-	rows, err := db.Query(
-		`SELECT rowid, document_id
+	// Stage 1: Hamming-distance KNN over the binary mirror. A filter on a
+	// collection name is applied inside the KNN via the collection_id
+	// metadata column, so the rest of the pipeline only sees the remaining
+	// filters.
+	query := `SELECT rowid, document_id
 		 FROM vec_documents_bin
-		 WHERE embedding MATCH vec_quantize_binary(?) AND k = ?
-		 ORDER BY distance`,
-		queryBlob, pool,
-	)
+		 WHERE embedding MATCH vec_quantize_binary(?) AND k = ?`
+	var scopeArgs []any
+	if filters != nil && filters.Collection != "" && !collectionTypes[filters.Collection] {
+		var collectionID int64
+		err := db.QueryRow("SELECT id FROM collections WHERE name = ?", filters.Collection).Scan(&collectionID)
+		if err == sql.ErrNoRows {
+			return nil, nil
+		}
+		if err != nil {
+			return nil, fmt.Errorf("resolve collection: %w", err)
+		}
+		query += " AND collection_id = ?"
+		scopeArgs = append(scopeArgs, collectionID)
+
+		rest := *filters
+		rest.Collection = ""
+		filters = &rest
+	}
+	pool := vectorCandidatePool(topK, filters)
+
+	rows, err := db.Query(query+" ORDER BY distance", append([]any{queryBlob, pool}, scopeArgs...)...)
 	if err != nil {
 		return nil, fmt.Errorf("binary vector search: %w", err)
 	}
@@ -428,14 +447,30 @@ func fetchResult(db *sql.DB, docID int64, score float64) (*SearchResult, error)
 
 // Search runs hybrid search combining vector similarity and full-text search.
 func Search(db *sql.DB, queryEmbedding []float32, queryText string, topK int, filters *Filters, cfg *config.Config) ([]SearchResult, error) {
+	var results []SearchResult
+	err := SearchEach(db, queryEmbedding, queryText, topK, filters, cfg, func(r SearchResult) error {
+		results = append(results, r)
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	return results, nil
+}
+
+// SearchEach runs the same hybrid search as Search but hands each result to
+// fn as soon as it is fetched, in rank order, instead of collecting them.
+// Callers that only print results never hold more than one in memory. A
+// non-nil error from fn stops the iteration and is returned as is.
+func SearchEach(db *sql.DB, queryEmbedding []float32, queryText string, topK int, filters *Filters, cfg *config.Config, fn func(SearchResult) error) error {
 	vecResults, err := vectorSearch(db, queryEmbedding, topK, filters)
 	if err != nil {
-		return nil, fmt.Errorf("vector search: %w", err)
+		return fmt.Errorf("vector search: %w", err)
 	}
 
 	ftsResults, err := ftsSearch(db, queryText, topK, filters)
 	if err != nil {
-		return nil, fmt.Errorf("fts search: %w", err)
+		return fmt.Errorf("fts search: %w", err)
 	}
 
 	merged := RRFMerge(
@@ -446,7 +481,6 @@ func Search(db *sql.DB, queryEmbedding []float32, queryText string, topK int, fi
 		cfg.SearchDefaults.FTSWeight,
 	)
 
-	var results []SearchResult
 	limit := topK
 	if limit > len(merged) {
 		limit = len(merged)
@@ -458,10 +492,12 @@ func Search(db *sql.DB, queryEmbedding []float32, queryText string, topK int, fi
 			slog.Warn("failed to fetch result", "doc_id", r.docID, "err", err)
 			continue
 		}
-		results = append(results, *result)
+		if err := fn(*result); err != nil {
+			return err
+		}
 	}
 
-	return results, nil
+	return nil
 }
 
 // PerformSearch is a high-level convenience wrapper that handles the full
@@ -472,12 +508,18 @@ func PerformSearch(ctx context.Context, query string, filters *Filters, topK int
 		return nil, fmt.Errorf("load config: %w", err)
 	}
 
-	dbConn, err := openDB(cfg)
+	dbConn, err := db.Open(cfg.ExpandedDBPath())
 	if err != nil {
-		return nil, err
+		return nil, fmt.Errorf("open database: %w", err)
 	}
 	defer dbConn.Close()
 
+	// Brings an older database forward, so the collection-scoped binary
+	// search finds vec_documents_bin.collection_id.
+	if err := db.InitSchema(dbConn, cfg.EmbeddingDimensions); err != nil {
+		return nil, fmt.Errorf("init schema: %w", err)
+	}
+
 	queryEmbedding, err := embeddings.GetEmbedding(ctx, query, cfg.EmbeddingModel)
 	if err != nil {
 		return nil, fmt.Errorf("embed query: %w", err)
@@ -485,15 +527,3 @@ func PerformSearch(ctx context.Context, query string, filters *Filters, topK int
 
 	return Search(dbConn, queryEmbedding, query, topK, filters, cfg)
 }
-
-func openDB(cfg *config.Config) (*sql.DB, error) {
-	dbPath := cfg.ExpandedDBPath()
-
-	// Import db package for Open — but to avoid circular imports we inline the open logic.
-	// This is acceptable since PerformSearch is a convenience wrapper.
-	dbPkg, err := sql.Open("sqlite3", dbPath+"?_journal_mode=WAL&_foreign_keys=ON")
-	if err != nil {
-		return nil, fmt.Errorf("open database: %w", err)
-	}
-	return dbPkg, nil
-}
@@ -1,10 +1,12 @@
 package search
 
 import (
+	"errors"
 	"math"
 	"path/filepath"
 	"testing"
 
+	"github.com/sebastianhutter/local-rag-go/internal/config"
 	"github.com/sebastianhutter/local-rag-go/internal/db"
 	"github.com/sebastianhutter/local-rag-go/internal/embeddings"
 )
@@ -91,3 +93,128 @@ func TestVectorSearchRerank(t *testing.T) {
 		}
 	}
 }
+
+// TestVectorSearchScopedToCollection verifies a collection-name filter is
+// applied inside the KNN, so a nearer document in another collection does not
+// take a slot.
+func TestVectorSearchScopedToCollection(t *testing.T) {
+	dbPath := filepath.Join(t.TempDir(), "rag.db")
+	conn, err := db.Open(dbPath)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer conn.Close()
+	if err := db.InitSchema(conn, 8); err != nil {
+		t.Fatal(err)
+	}
+
+	if _, err := conn.Exec(
+		`INSERT INTO collections (id, name, collection_type) VALUES (1, 'a', 'project'), (2, 'b', 'project')`,
+	); err != nil {
+		t.Fatal(err)
+	}
+	if _, err := conn.Exec(
+		`INSERT INTO sources (id, collection_id, source_type, source_path) VALUES (1, 1, 'txt', '/a'), (2, 2, 'txt', '/b')`,
+	); err != nil {
+		t.Fatal(err)
+	}
+	for docID, collID := range map[int64]int64{1: 1, 2: 2} {
+		if _, err := conn.Exec(
+			`INSERT INTO documents (id, source_id, collection_id, chunk_index, content) VALUES (?, ?, ?, 0, 'c')`,
+			docID, collID, collID,
+		); err != nil {
+			t.Fatal(err)
+		}
+	}
+	if err := db.InsertEmbedding(conn, 1, embeddings.SerializeFloat32([]float32{1, 1, 0, 0, 0, 0, 0, 0})); err != nil {
+		t.Fatal(err)
+	}
+	if err := db.InsertEmbedding(conn, 2, embeddings.SerializeFloat32([]float32{0, 0, 0, 0, 1, 1, 1, 1})); err != nil {
+		t.Fatal(err)
+	}
+
+	query := []float32{1, 1, 0, 0, 0, 0, 0, 0}
+	results, err := vectorSearch(conn, query, 1, &Filters{Collection: "b"})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(results) != 1 || results[0].docID != 2 {
+		t.Errorf("results = %v, want only doc 2", results)
+	}
+
+	results, err = vectorSearch(conn, query, 1, &Filters{Collection: "missing"})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(results) != 0 {
+		t.Errorf("unknown collection returned %v", results)
+	}
+}
+
+// TestSearchEachStopsOnCallbackError verifies results arrive in rank order and
+// that an error from the callback ends the iteration early.
+func TestSearchEachStopsOnCallbackError(t *testing.T) {
+	dbPath := filepath.Join(t.TempDir(), "rag.db")
+	conn, err := db.Open(dbPath)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer conn.Close()
+	if err := db.InitSchema(conn, 8); err != nil {
+		t.Fatal(err)
+	}
+
+	if _, err := conn.Exec(
+		`INSERT INTO collections (id, name, collection_type) VALUES (1, 'test', 'project')`,
+	); err != nil {
+		t.Fatal(err)
+	}
+	if _, err := conn.Exec(
+		`INSERT INTO sources (id, collection_id, source_type, source_path) VALUES (1, 1, 'txt', '/x')`,
+	); err != nil {
+		t.Fatal(err)
+	}
+	for i, vec := range [][]float32{
+		{1, 1, 0, 0, 0, 0, 0, 0},
+		{0, 1, 1, 0, 0, 0, 0, 0},
+		{0, 0, 0, 0, 1, 1, 1, 1},
+	} {
+		docID := int64(i + 1)
+		if _, err := conn.Exec(
+			`INSERT INTO documents (id, source_id, collection_id, chunk_index, content) VALUES (?, 1, 1, ?, 'c')`,
+			docID, docID,
+		); err != nil {
+			t.Fatal(err)
+		}
+		if err := db.InsertEmbedding(conn, docID, embeddings.SerializeFloat32(vec)); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	cfg := &config.Config{SearchDefaults: config.SearchDefaults{RRFK: 60, VectorWeight: 0.7, FTSWeight: 0.3}}
+	query := []float32{1, 1, 0, 0, 0, 0, 0, 0}
+
+	all, err := Search(conn, query, "c", 3, &Filters{}, cfg)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(all) < 2 {
+		t.Fatalf("Search returned %d results, want at least 2", len(all))
+	}
+
+	errStop := errors.New("stop")
+	var seen []SearchResult
+	err = SearchEach(conn, query, "c", 3, &Filters{}, cfg, func(r SearchResult) error {
+		seen = append(seen, r)
+		return errStop
+	})
+	if !errors.Is(err, errStop) {
+		t.Fatalf("SearchEach err = %v, want %v", err, errStop)
+	}
+	if len(seen) != 1 {
+		t.Fatalf("callback ran %d times, want 1", len(seen))
+	}
+	if seen[0].Score != all[0].Score {
+		t.Errorf("first streamed score = %v, want %v", seen[0].Score, all[0].Score)
+	}
+}